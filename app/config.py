@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 import os
+from typing import Literal, Optional
 
 load_dotenv()
 
@@ -9,6 +10,29 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    WARNING_RULES_PATH: Optional[str] = None
+    LEARNING_RESULTS_WORKERS: int = 0
+    LEARNING_RESULTS_PARALLEL_MIN_ROWS: int = 50000
+    JOB_WORKERS: int = 2
+    JOB_CHUNK_ROWS: int = 5000
+    JOB_STALE_SECONDS: int = 300
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    DB_ASYNC: bool = False
+    CACHE_TTL_SECONDS: float = 300
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_BACKEND: Literal["memory", "redis"] = "memory"
+    REDIS_URL: Optional[str] = None
+    ASYNC_DATABASE_URL: Optional[str] = None
+    FAST_LIST_RESPONSES: bool = False
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE: int = 32
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60
 
     class Config:
         env_file = "app/.env"
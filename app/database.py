@@ -1,17 +1,113 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from functools import lru_cache
+from typing import Dict
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.config import settings
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+class PoolStatsMixin:
+    """Counts checkouts that had to wait for a free connection, and those that timed out."""
+
+    def __init__(self, *args, max_overflow: int = 10, **kwargs):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        # The pool keeps its own copy private; checkouts come from many threads, hence the lock.
+        self.max_overflow = max_overflow
+        self._stats_lock = threading.Lock()
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+
+    def _do_get(self):
+        exhausted = self.max_overflow > -1 and self.checkedin() == 0 and self.overflow() >= self.max_overflow
+        if not exhausted:
+            return super()._do_get()
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            with self._stats_lock:
+                self.waits += 1
+                self.timeouts += timed_out
+                self.wait_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            waits, timeouts, wait_seconds = self.waits, self.timeouts, self.wait_seconds
+        return {
+            "kich_thuoc": self.size(),
+            "dang_dung": self.checkedout(),
+            "ranh": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self.max_overflow,
+            "so_lan_cho": waits,
+            "so_lan_het_thoi_gian": timeouts,
+            "tong_thoi_gian_cho_giay": round(wait_seconds, 3),
+        }
+
+class InstrumentedQueuePool(PoolStatsMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(PoolStatsMixin, AsyncAdaptedQueuePool):
+    pass
+
+def engine_options(url: str) -> Dict:
+    backend = make_url(url).get_backend_name()
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if backend == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+        if make_url(url).get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    **engine_options(SQLALCHEMY_DATABASE_URL)
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+def async_database_url(url: str) -> str:
+    url = make_url(url)
+    return url.set(drivername=f"{url.get_backend_name()}+{ASYNC_DRIVERS[url.get_backend_name()]}").render_as_string(hide_password=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Created on first use so that asyncpg/aiosqlite are only needed with DB_ASYNC enabled.
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    url = settings.ASYNC_DATABASE_URL or async_database_url(SQLALCHEMY_DATABASE_URL)
+    return create_async_engine(url, poolclass=InstrumentedAsyncQueuePool, **engine_options(url))
+
+@lru_cache(maxsize=None)
+def get_async_sessionmaker() -> async_sessionmaker:
+    return async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
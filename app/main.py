@@ -9,10 +9,19 @@ from .routers import (
     nguoi_dung,
     sinh_vien,
     xac_thuc,
-    vien
-    
+    vien,
+    tra_cuu_async,
+    health,
+    thong_ke,
+    nhap_du_lieu
 )
-from .database import engine, Base
+from .config import settings
+from .database import engine, Base, get_async_engine
+from .services.service_learning_result import shutdown_process_pool
+from .services.service_cong_viec import CongViecService, shutdown_executor
+from .services.pagination import NEXT_CURSOR_HEADER
+from .services.cache import get_invalidation_bus
+from .services.auth_service import shutdown_password_executor
 from fastapi.staticfiles import StaticFiles
 import os
 
@@ -24,6 +33,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 Base.metadata.create_all(bind=engine)
@@ -31,8 +41,34 @@ Base.metadata.create_all(bind=engine)
 current_dir = os.path.dirname(os.path.abspath(__file__))
 static_dir = os.path.join(current_dir, "static")
 
+@app.on_event("startup")
+def resume_jobs():
+    CongViecService.resume_unfinished()
+
+@app.on_event("startup")
+def start_cache_invalidation():
+    bus = get_invalidation_bus()
+    if bus is not None:
+        bus.start()
+
+@app.on_event("shutdown")
+async def shutdown_workers():
+    shutdown_executor()
+    shutdown_process_pool()
+    shutdown_password_executor()
+    bus = get_invalidation_bus()
+    if bus is not None:
+        bus.stop()
+    if settings.DB_ASYNC:
+        await get_async_engine().dispose()
+
 app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
+if settings.DB_ASYNC:
+    # Registered first so they take over the GET routes they share with the sync routers.
+    for router in tra_cuu_async.routers:
+        app.include_router(router, include_in_schema=False)
+
 app.include_router(learning_result.router)
 app.include_router(diem.router)
 app.include_router(giang_vien.router)
@@ -41,4 +77,7 @@ app.include_router(lop_hoc.router)
 app.include_router(nguoi_dung.router)
 app.include_router(sinh_vien.router)
 app.include_router(xac_thuc.router)
-app.include_router(vien.router)
\ No newline at end of file
+app.include_router(vien.router)
+app.include_router(thong_ke.router)
+app.include_router(nhap_du_lieu.router)
+app.include_router(health.router)
\ No newline at end of file
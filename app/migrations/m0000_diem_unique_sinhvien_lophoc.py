@@ -0,0 +1,52 @@
+"""
+Adds the unique (sinhvien_id, lophoc_id) index that the ON CONFLICT upserts of diem
+rely on to databases created before it was in the models. Duplicate grades are
+removed first, keeping the newest of every pair.
+
+    python -m app.migrations.m0000_diem_unique_sinhvien_lophoc [upgrade|downgrade]
+"""
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+INDEX = "uq_diem_sinhvien_lophoc"
+
+DEDUPLICATE_DIEM = """
+DELETE FROM diem
+WHERE id NOT IN (SELECT MAX(id) FROM diem GROUP BY sinhvien_id, lophoc_id)
+"""
+
+# A CONCURRENTLY build that fails (a duplicate written meanwhile) leaves an invalid index
+# behind, which IF NOT EXISTS would keep and ON CONFLICT cannot use.
+INVALID_INDEX = """
+SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid
+WHERE pg_class.relname = :name AND NOT pg_index.indisvalid
+"""
+
+def _concurrently(engine: Engine) -> str:
+    # Postgres can build the index without locking out writes, but not inside a transaction.
+    return "CONCURRENTLY " if engine.dialect.name == "postgresql" else ""
+
+def upgrade(engine: Engine):
+    with engine.begin() as connection:
+        connection.execute(text(DEDUPLICATE_DIEM))
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        if engine.dialect.name == "postgresql" and connection.execute(text(INVALID_INDEX), {"name": INDEX}).first():
+            connection.execute(text(f"DROP INDEX CONCURRENTLY {INDEX}"))
+        connection.execute(text(
+            f"CREATE UNIQUE INDEX {_concurrently(engine)}IF NOT EXISTS {INDEX} ON diem (sinhvien_id, lophoc_id)"
+        ))
+
+def downgrade(engine: Engine):
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text(f"DROP INDEX {_concurrently(engine)}IF EXISTS {INDEX}"))
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    action = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+    {"upgrade": upgrade, "downgrade": downgrade}[action](engine)
+    print(f"{action}: xong")
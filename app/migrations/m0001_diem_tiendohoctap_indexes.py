@@ -0,0 +1,43 @@
+"""
+Adds the foreign-key indexes of diem, tiendohoctap and lophoc_sinhvien to databases
+created before they were in the models. Runs m0000 first, so databases that skipped it
+also get the unique (sinhvien_id, lophoc_id) index on diem.
+
+    python -m app.migrations.m0001_diem_tiendohoctap_indexes [upgrade|downgrade]
+"""
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.migrations import m0000_diem_unique_sinhvien_lophoc
+
+INDEXES = [
+    ("ix_diem_lophoc_id", "diem", "lophoc_id"),
+    ("ix_tiendohoctap_sinhvien_hocky_namhoc", "tiendohoctap", "sinhvien_id, hoc_ky, nam_hoc"),
+    ("ix_lophoc_sinhvien_sinhvien_id", "lophoc_sinhvien", "sinhvien_id"),
+]
+
+def _concurrently(engine: Engine) -> str:
+    # Postgres can build the indexes without locking out writes, but not inside a transaction.
+    return "CONCURRENTLY " if engine.dialect.name == "postgresql" else ""
+
+def upgrade(engine: Engine):
+    m0000_diem_unique_sinhvien_lophoc.upgrade(engine)
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for name, table, columns in INDEXES:
+            connection.execute(text(f"CREATE INDEX {_concurrently(engine)}IF NOT EXISTS {name} ON {table} ({columns})"))
+
+def downgrade(engine: Engine):
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for name, _, _ in reversed(INDEXES):
+            connection.execute(text(f"DROP INDEX {_concurrently(engine)}IF EXISTS {name}"))
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    action = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+    {"upgrade": upgrade, "downgrade": downgrade}[action](engine)
+    print(f"{action}: xong")
@@ -0,0 +1,42 @@
+"""
+Creates the tonghophoctap summary table and fills it for every existing student.
+Later writes to diem and tiendohoctap keep it up to date.
+
+    python -m app.migrations.m0002_tong_hop_hoc_tap [upgrade|downgrade]
+"""
+import sys
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+BATCH = 5000
+
+def upgrade(engine: Engine):
+    from app.models import models
+    from app.services.service import TongHopHocTapService
+
+    models.TongHopHocTap.__table__.create(engine, checkfirst=True)
+    with Session(engine) as db:
+        last_id = 0
+        while True:
+            ids = [row.id for row in db.query(models.SinhVien.id).filter(
+                models.SinhVien.id > last_id
+            ).order_by(models.SinhVien.id).limit(BATCH)]
+            if not ids:
+                break
+            TongHopHocTapService.refresh(db, ids)
+            db.commit()
+            last_id = ids[-1]
+
+def downgrade(engine: Engine):
+    from app.models import models
+
+    models.TongHopHocTap.__table__.drop(engine, checkfirst=True)
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    action = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+    {"upgrade": upgrade, "downgrade": downgrade}[action](engine)
+    print(f"{action}: xong")
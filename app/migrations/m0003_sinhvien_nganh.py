@@ -0,0 +1,32 @@
+"""
+Adds sinhvien.nganh (the student's major) and the (nganh, nam_nhap_truong) index
+used by the cohort analytics.
+
+    python -m app.migrations.m0003_sinhvien_nganh [upgrade|downgrade]
+"""
+import sys
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+def upgrade(engine: Engine):
+    columns = {column["name"] for column in inspect(engine).get_columns("sinhvien")}
+    with engine.begin() as connection:
+        if "nganh" not in columns:
+            connection.execute(text("ALTER TABLE sinhvien ADD COLUMN nganh VARCHAR"))
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_sinhvien_nganh_nam_nhap_truong ON sinhvien (nganh, nam_nhap_truong)"
+        ))
+
+def downgrade(engine: Engine):
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX IF EXISTS ix_sinhvien_nganh_nam_nhap_truong"))
+        connection.execute(text("ALTER TABLE sinhvien DROP COLUMN nganh"))
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    action = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+    {"upgrade": upgrade, "downgrade": downgrade}[action](engine)
+    print(f"{action}: xong")
@@ -1,11 +1,12 @@
 from enum import Enum
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float, Date, Table, Enum as SQLAlchemyEnum
+from datetime import datetime
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float, Date, DateTime, Table, JSON, Index, Enum as SQLAlchemyEnum
 from sqlalchemy.orm import relationship
 from ..database import Base
 
 lophoc_sinhvien = Table('lophoc_sinhvien', Base.metadata,
     Column('lophoc_id', Integer, ForeignKey('lophoc.id'), primary_key=True),
-    Column('sinhvien_id', Integer, ForeignKey('sinhvien.id'), primary_key=True)
+    Column('sinhvien_id', Integer, ForeignKey('sinhvien.id'), primary_key=True, index=True)
 )
 
 class Vien(Base):
@@ -37,6 +38,9 @@ class NguoiDung(Base):
 
 class SinhVien(Base):
     __tablename__ = "sinhvien"
+    __table_args__ = (
+        Index("ix_sinhvien_nganh_nam_nhap_truong", "nganh", "nam_nhap_truong"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     ma_sv = Column(String, unique=True, index=True)
@@ -47,6 +51,7 @@ class SinhVien(Base):
     so_dien_thoai = Column(String)
     email = Column(String, unique=True)
     nam_nhap_truong = Column(Integer)
+    nganh = Column(String)
     nguoidung_id = Column(Integer, ForeignKey("nguoidung.id"))
     
     nguoidung = relationship("NguoiDung", back_populates="sinhvien")
@@ -111,10 +116,14 @@ class LopHoc(Base):
 
 class Diem(Base):
     __tablename__ = "diem"
+    __table_args__ = (
+        # Also serves lookups by sinhvien_id alone.
+        Index("uq_diem_sinhvien_lophoc", "sinhvien_id", "lophoc_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     sinhvien_id = Column(Integer, ForeignKey("sinhvien.id"))
-    lophoc_id = Column(Integer, ForeignKey("lophoc.id"))
+    lophoc_id = Column(Integer, ForeignKey("lophoc.id"), index=True)
     diem_chuyen_can = Column(Float)
     diem_giua_ky = Column(Float)
     diem_cuoi_ky = Column(Float)
@@ -126,6 +135,9 @@ class Diem(Base):
 
 class TienDoHocTap(Base):
     __tablename__ = "tiendohoctap"
+    __table_args__ = (
+        Index("ix_tiendohoctap_sinhvien_hocky_namhoc", "sinhvien_id", "hoc_ky", "nam_hoc"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     sinhvien_id = Column(Integer, ForeignKey("sinhvien.id"))
@@ -137,4 +149,56 @@ class TienDoHocTap(Base):
     diem_trung_binh_tich_luy = Column(Float)  
     xu_ly_hoc_tap = Column(String) 
     
-    sinhvien = relationship("SinhVien", back_populates="tiendohoctap")
\ No newline at end of file
+    sinhvien = relationship("SinhVien", back_populates="tiendohoctap")
+
+
+class TongHopHocTap(Base):
+    __tablename__ = "tonghophoctap"
+
+    # Maintained by TongHopHocTapService.refresh from diem and tiendohoctap writes.
+    sinhvien_id = Column(Integer, ForeignKey("sinhvien.id"), primary_key=True)
+    so_hoc_ky = Column(Integer, default=0)
+    hoc_ky_gan_nhat = Column(String)
+    nam_hoc_gan_nhat = Column(String)
+    tong_tin_chi_tich_luy = Column(Integer)
+    diem_trung_binh_tich_luy = Column(Float)
+    xu_ly_hoc_tap = Column(String)  # warning of the latest semester
+    so_lop_co_diem = Column(Integer, default=0)
+    diem_tong_ket_trung_binh = Column(Float)
+    lich_su = Column(JSON)  # credits, GPA and warning per semester, oldest first
+    cap_nhat_luc = Column(DateTime, default=datetime.utcnow)
+
+
+class TrangThaiXuLyHocTap(Base):
+    __tablename__ = "trangthaixulyhoctap"
+
+    ma_sv = Column(String, primary_key=True, index=True)  # 'id' of the learning-result rows
+    hoc_ky_cuoi = Column(Integer, nullable=False)  # last processed semester
+    so_lan_canh_bao = Column(Integer, default=0)
+    xu_ly_hoc_tap = Column(String)
+    ban_ghi_cuoi = Column(JSON)  # last processed record, to detect a corrected re-post
+
+
+class CongViecXuLy(Base):
+    __tablename__ = "congviecxuly"
+
+    id = Column(String, primary_key=True, index=True)
+    trang_thai = Column(String, nullable=False, index=True)  # 'cho_xu_ly', 'dang_xu_ly', 'hoan_thanh', 'that_bai'
+    tong_so = Column(Integer, default=0)
+    da_xu_ly = Column(Integer, default=0)
+    loi = Column(String)
+    du_lieu = Column(JSON)  # submitted rows, cleared once the job has finished
+    tao_luc = Column(DateTime, default=datetime.utcnow)
+    cap_nhat_luc = Column(DateTime, default=datetime.utcnow)
+
+    ket_qua = relationship("KetQuaCongViec", back_populates="cong_viec", cascade="all, delete-orphan")
+
+
+class KetQuaCongViec(Base):
+    __tablename__ = "ketquacongviec"
+
+    cong_viec_id = Column(String, ForeignKey("congviecxuly.id"), primary_key=True)
+    thu_tu = Column(Integer, primary_key=True)
+    du_lieu = Column(JSON)
+
+    cong_viec = relationship("CongViecXuLy", back_populates="ket_qua")
@@ -4,7 +4,10 @@ from typing import List, Optional
 from ..models import models
 from ..schemas import schemas
 from ..services import service
+from ..services.pagination import Pagination
+from ..services.fast_list import fast_list
 from ..database import get_db
+from ..config import settings
 
 router = APIRouter(
     prefix="/api/diem",
@@ -13,27 +16,33 @@ router = APIRouter(
 
 @router.post("/", response_model=schemas.DiemInDB, status_code=status.HTTP_201_CREATED)
 def create_diem(diem: schemas.DiemCreate, db: Session = Depends(get_db)):
-    return services.DiemService.create(db, diem)
+    return service.DiemService.create(db, diem)
+
+@router.post("/bulk", response_model=schemas.DiemBulkResult)
+def bulk_upsert_diem(diems: List[schemas.DiemCreate], db: Session = Depends(get_db)):
+    return service.DiemService.bulk_upsert(db, diems)
 
 @router.get("/", response_model=List[schemas.DiemInDB])
-def read_diems(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return services.DiemService.get_all(db, skip, limit)
+def read_diems(pagination: Pagination = Depends(), db: Session = Depends(get_db)):
+    if settings.FAST_LIST_RESPONSES:
+        return fast_list(db, models.Diem, schemas.DiemInDB, pagination)
+    return pagination.page(service.DiemService.get_all(db, pagination.skip, pagination.fetch_limit, pagination.after))
 
 @router.get("/{diem_id}", response_model=schemas.DiemInDB)
 def read_diem(diem_id: int, db: Session = Depends(get_db)):
-    return services.DiemService.get_by_id(db, diem_id)
+    return service.DiemService.get_by_id(db, diem_id)
 
 @router.get("/detail/{diem_id}", response_model=schemas.DiemDetail)
 def read_diem_detail(diem_id: int, db: Session = Depends(get_db)):
-    return services.DiemService.get_detail_by_id(db, diem_id)
+    return service.DiemService.get_detail_by_id(db, diem_id)
 
 @router.get("/sinh-vien/{sinhvien_id}/lop-hoc/{lophoc_id}", response_model=schemas.DiemInDB)
 def read_diem_by_sinhvien_lophoc(sinhvien_id: int, lophoc_id: int, db: Session = Depends(get_db)):
-    return services.DiemService.get_by_sinhvien_lophoc(db, sinhvien_id, lophoc_id)
+    return service.DiemService.get_by_sinhvien_lophoc(db, sinhvien_id, lophoc_id)
 
 @router.put("/{diem_id}", response_model=schemas.DiemInDB)
 def update_diem(diem_id: int, diem_update: schemas.DiemUpdate, db: Session = Depends(get_db)):
-    return services.DiemService.update(db, diem_id, diem_update)
+    return service.DiemService.update(db, diem_id, diem_update)
 
 @router.put("/sinh-vien/{sinhvien_id}/lop-hoc/{lophoc_id}", response_model=schemas.DiemInDB)
 def update_diem_by_sinhvien_lophoc(
@@ -42,12 +51,12 @@ def update_diem_by_sinhvien_lophoc(
     diem_update: schemas.DiemUpdate, 
     db: Session = Depends(get_db)
 ):
-    return services.DiemService.update_by_sinhvien_lophoc(db, sinhvien_id, lophoc_id, diem_update)
+    return service.DiemService.update_by_sinhvien_lophoc(db, sinhvien_id, lophoc_id, diem_update)
 
 @router.delete("/{diem_id}")
 def delete_diem(diem_id: int, db: Session = Depends(get_db)):
-    return services.DiemService.delete(db, diem_id)
+    return service.DiemService.delete(db, diem_id)
 
 @router.delete("/sinh-vien/{sinhvien_id}/lop-hoc/{lophoc_id}")
 def delete_diem_by_sinhvien_lophoc(sinhvien_id: int, lophoc_id: int, db: Session = Depends(get_db)):
-    return services.DiemService.delete_by_sinhvien_lophoc(db, sinhvien_id, lophoc_id)
\ No newline at end of file
+    return service.DiemService.delete_by_sinhvien_lophoc(db, sinhvien_id, lophoc_id)
\ No newline at end of file
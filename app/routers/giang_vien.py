@@ -5,7 +5,10 @@ from typing import List, Optional
 from ..models import models
 from ..schemas import schemas
 from ..services import service
+from ..services.pagination import Pagination
+from ..services.fast_list import fast_list
 from ..database import get_db
+from ..config import settings
 
 router = APIRouter(
     prefix="/api/giang-vien",
@@ -17,8 +20,10 @@ def create_giang_vien(giang_vien: schemas.GiangVienCreate, db: Session = Depends
     return service.GiangVienService.create(db, giang_vien)
 
 @router.get("/", response_model=List[schemas.GiangVienInDB])
-def read_giang_viens(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return service.GiangVienService.get_all(db, skip, limit)
+def read_giang_viens(pagination: Pagination = Depends(), db: Session = Depends(get_db)):
+    if settings.FAST_LIST_RESPONSES:
+        return fast_list(db, models.GiangVien, schemas.GiangVienInDB, pagination)
+    return pagination.page(service.GiangVienService.get_all(db, pagination.skip, pagination.fetch_limit, pagination.after))
 
 @router.get("/{giang_vien_id}", response_model=schemas.GiangVienInDB)
 def read_giang_vien(giang_vien_id: int, db: Session = Depends(get_db)):
@@ -0,0 +1,42 @@
+import time
+from fastapi import APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..config import settings
+from ..database import engine, get_async_engine
+from ..services.cache import cache_stats
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+def ping_database() -> float:
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return (time.perf_counter() - started) * 1000
+
+@router.get("/db")
+async def read_db_health():
+    """Trạng thái kết nối cơ sở dữ liệu và thống kê pool của worker hiện tại."""
+    try:
+        latency_ms = await run_in_threadpool(ping_database)
+    except SQLAlchemyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Không kết nối được cơ sở dữ liệu: {e.__class__.__name__}"
+        )
+
+    health = {
+        "trang_thai": "ok",
+        "do_tre_ms": round(latency_ms, 2),
+        "pool": engine.pool.stats(),
+    }
+    if settings.DB_ASYNC:
+        health["pool_async"] = get_async_engine().pool.stats()
+    return health
+
+@router.get("/cache")
+def read_cache_health():
+    """Thống kê hit/miss của các cache trong worker hiện tại."""
+    return cache_stats()
@@ -5,7 +5,10 @@ from typing import List, Optional
 from ..models import models
 from ..schemas import schemas
 from ..services import service
+from ..services.pagination import Pagination
+from ..services.fast_list import fast_list
 from ..database import get_db
+from ..config import settings
 
 router = APIRouter(
     prefix="/api/hoc-phan",
@@ -17,8 +20,10 @@ def create_hoc_phan(hoc_phan: schemas.HocPhanCreate, db: Session = Depends(get_d
     return service.HocPhanService.create(db, hoc_phan)
 
 @router.get("/", response_model=List[schemas.HocPhanInDB])
-def read_hoc_phans(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return service.HocPhanService.get_all(db, skip, limit)
+def read_hoc_phans(pagination: Pagination = Depends(), db: Session = Depends(get_db)):
+    if settings.FAST_LIST_RESPONSES:
+        return fast_list(db, models.HocPhan, schemas.HocPhanInDB, pagination)
+    return pagination.page(service.HocPhanService.get_all(db, pagination.skip, pagination.fetch_limit, pagination.after))
 
 @router.get("/{hoc_phan_id}", response_model=schemas.HocPhanInDB)
 def read_hoc_phan(hoc_phan_id: int, db: Session = Depends(get_db)):
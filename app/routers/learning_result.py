@@ -1,14 +1,196 @@
-from fastapi import APIRouter
-from typing import List
-from ..services.service_learning_result import LearningResultsService
-from ..schemas.learning_result import LearningResultSchema
+import json
+import pyarrow as pa
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from typing import Dict, List, Literal, Optional, Union
+from ..services.service_learning_result import ARROW_MEDIA_TYPE, LearningResultsService
+from ..services.service_cong_viec import CongViecService
+from ..services.pagination import Pagination
+from ..schemas.learning_result import (
+    LEARNING_RESULT_ADAPTER,
+    LEARNING_RESULTS_ADAPTER,
+    LearningResultRecord,
+    LearningResultSchema,
+    CongViecXuLySchema
+)
+from ..database import get_db
 
 router = APIRouter(prefix="/api/plr", tags=["learning-results"])
 
-@router.post("/process-learning-results")
-def process_learning_results(students: List[LearningResultSchema]):
+class NDJSONStreamingResponse(StreamingResponse):
+    media_type = "application/x-ndjson"
 
-    processed_results = LearningResultsService.process_academic_performance(
-        [student.dict() for student in students]
+    async def __call__(self, scope, receive, send):
+        # The request body is still being read while the response streams, so the
+        # disconnect listener of StreamingResponse must not consume `receive`.
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+ENGINES = {
+    "python": LearningResultsService.process_academic_performance,
+    "vectorized": LearningResultsService.process_academic_performance_vectorized,
+    "parallel": LearningResultsService.process_academic_performance_parallel,
+}
+
+class JobResultsPagination(Pagination):
+    def __init__(
+        self,
+        response: Response,
+        cursor: Optional[str] = Query(None),
+        skip: int = Query(0, ge=0),
+        limit: int = Query(1000, ge=1, le=10000)
+    ):
+        super().__init__(response, cursor, skip, limit)
+
+REQUIRED_FIELDS = [name for name, field in LearningResultSchema.model_fields.items() if field.is_required()]
+RECORD_FIELDS = set(LearningResultRecord.__annotations__)
+
+LEARNING_RESULTS_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {"type": "array", "items": LearningResultSchema.model_json_schema()}
+            },
+            ARROW_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+        },
+    }
+}
+
+async def read_learning_results(request: Request) -> Union[List[Dict], pa.Table]:
+    body = await request.body()
+    if request.headers.get("content-type", "").startswith(ARROW_MEDIA_TYPE):
+        try:
+            table = LearningResultsService.read_arrow(body)
+        # A truncated stream surfaces as a plain OSError.
+        except (pa.ArrowInvalid, OSError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Dữ liệu Arrow không hợp lệ: {e}"
+            )
+        missing = [field for field in REQUIRED_FIELDS if field not in table.column_names]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Thiếu cột: {', '.join(missing)}"
+            )
+        return table
+
+    try:
+        return LEARNING_RESULTS_ADAPTER.validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+def arrow_records(table: pa.Table) -> List[Dict]:
+    """Rows of an Arrow body for the per-record engines, cast to strings and validated like a JSON body."""
+    schema = pa.schema([
+        pa.field(field.name, pa.string()) if field.name in RECORD_FIELDS else field for field in table.schema
+    ])
+    try:
+        table = table.cast(schema)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Dữ liệu Arrow không hợp lệ: {e}"
+        )
+    try:
+        return LEARNING_RESULTS_ADAPTER.validate_python(table.to_pylist())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+def learning_results_response(request: Request, results: Union[List[Dict], pa.Table]):
+    if ARROW_MEDIA_TYPE in request.headers.get("accept", ""):
+        table = results if isinstance(results, pa.Table) else pa.Table.from_pylist(results)
+        return Response(content=LearningResultsService.write_arrow(table), media_type=ARROW_MEDIA_TYPE)
+    return results.to_pylist() if isinstance(results, pa.Table) else results
+
+@router.post("/process-learning-results", openapi_extra=LEARNING_RESULTS_BODY)
+async def process_learning_results(
+    request: Request,
+    engine: Literal["python", "vectorized", "parallel"] = Query("python")
+):
+    """Nhận và trả về JSON hoặc Arrow IPC stream (application/vnd.apache.arrow.stream) theo Content-Type/Accept."""
+    students = await read_learning_results(request)
+
+    if isinstance(students, pa.Table):
+        if engine == "vectorized":
+            processed_results = await run_in_threadpool(
+                LearningResultsService.process_academic_performance_columnar, students
+            )
+            return learning_results_response(request, processed_results)
+        students = arrow_records(students)
+
+    processed_results = await run_in_threadpool(ENGINES[engine], students)
+    return learning_results_response(request, processed_results)
+
+@router.post("/process-learning-results/incremental", openapi_extra=LEARNING_RESULTS_BODY)
+async def process_learning_results_incremental(request: Request, db: Session = Depends(get_db)):
+    """Chỉ xử lý các học kỳ mới hơn học kỳ đã xử lý gần nhất của mỗi sinh viên, hoặc bản ghi đã sửa của chính học kỳ đó."""
+    students = await read_learning_results(request)
+    if isinstance(students, pa.Table):
+        students = arrow_records(students)
+
+    processed_results = await run_in_threadpool(
+        LearningResultsService.process_academic_performance_incremental, db, students
     )
-    return processed_results
\ No newline at end of file
+    return learning_results_response(request, processed_results)
+
+@router.post(
+    "/jobs",
+    response_model=CongViecXuLySchema,
+    status_code=status.HTTP_202_ACCEPTED,
+    openapi_extra=LEARNING_RESULTS_BODY
+)
+async def submit_learning_results_job(request: Request, db: Session = Depends(get_db)):
+    """Xử lý nền một lô lớn; theo dõi tiến độ qua /jobs/{job_id} và lấy kết quả theo trang."""
+    students = await read_learning_results(request)
+    if isinstance(students, pa.Table):
+        students = arrow_records(students)
+    return await run_in_threadpool(CongViecService.submit, db, students)
+
+@router.get("/jobs/{job_id}", response_model=CongViecXuLySchema)
+def read_learning_results_job(job_id: str, db: Session = Depends(get_db)):
+    return CongViecService.get_by_id(db, job_id)
+
+@router.get("/jobs/{job_id}/results")
+def read_learning_results_job_results(
+    job_id: str,
+    pagination: JobResultsPagination = Depends(),
+    db: Session = Depends(get_db)
+):
+    rows = CongViecService.get_results(db, job_id, pagination.skip, pagination.fetch_limit, pagination.after)
+    return [row.du_lieu for row in pagination.page(rows, key="thu_tu")]
+
+@router.post("/process-learning-results/stream")
+async def process_learning_results_stream(
+    request: Request,
+    engine: Literal["python", "vectorized"] = Query("python")
+):
+    """
+    Nhận NDJSON (mỗi dòng một bản ghi hoặc một mảng bản ghi), trả về NDJSON.
+    Các bản ghi của cùng một sinh viên phải nằm liền nhau; kết quả của mỗi sinh viên
+    được trả về ngay khi gặp sinh viên tiếp theo.
+    """
+    async def validated_records():
+        async for line_number, record in LearningResultsService.iter_ndjson_records(request.stream()):
+            try:
+                yield LEARNING_RESULT_ADAPTER.validate_python(record)
+            except ValidationError as e:
+                raise ValueError(f"Dòng {line_number}: {e}")
+
+    async def generate():
+        try:
+            async for run in LearningResultsService.iter_student_runs(validated_records()):
+                # CPU-bound; off the event loop so other requests keep being served.
+                for record in await run_in_threadpool(ENGINES[engine], run):
+                    yield json.dumps(record, ensure_ascii=False) + "\n"
+        except ValueError as e:
+            error = {"error": "Dữ liệu không hợp lệ", "detail": str(e)}
+            yield json.dumps(error, ensure_ascii=False) + "\n"
+
+    return NDJSONStreamingResponse(generate())
@@ -5,7 +5,10 @@ from typing import List, Optional
 from ..models import models
 from ..schemas import schemas
 from ..services import service
+from ..services.pagination import Pagination
+from ..services.fast_list import fast_list
 from ..database import get_db
+from ..config import settings
 
 router = APIRouter(
     prefix="/api/lop-hoc",
@@ -17,8 +20,10 @@ def create_lop_hoc(lop_hoc: schemas.LopHocCreate, db: Session = Depends(get_db))
     return service.LopHocService.create(db, lop_hoc)
 
 @router.get("/", response_model=List[schemas.LopHocInDB])
-def read_lop_hocs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return service.LopHocService.get_all(db, skip, limit)
+def read_lop_hocs(pagination: Pagination = Depends(), db: Session = Depends(get_db)):
+    if settings.FAST_LIST_RESPONSES:
+        return fast_list(db, models.LopHoc, schemas.LopHocInDB, pagination)
+    return pagination.page(service.LopHocService.get_all(db, pagination.skip, pagination.fetch_limit, pagination.after))
 
 @router.get("/{lop_hoc_id}", response_model=schemas.LopHocInDB)
 def read_lop_hoc(lop_hoc_id: int, db: Session = Depends(get_db)):
@@ -5,7 +5,10 @@ from typing import List, Optional
 from ..models import models
 from ..schemas import schemas
 from ..services import service
+from ..services.pagination import Pagination
+from ..services.fast_list import fast_list
 from ..database import get_db
+from ..config import settings
 
 router = APIRouter(
     prefix="/api/nguoi-dung",
@@ -17,8 +20,10 @@ def create_nguoi_dung(nguoi_dung: schemas.NguoiDungCreate, db: Session = Depends
     return service.NguoiDungService.create(db, nguoi_dung)
 
 @router.get("/", response_model=List[schemas.NguoiDungInDB])
-def read_nguoi_dungs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return service.NguoiDungService.get_all(db, skip, limit)
+def read_nguoi_dungs(pagination: Pagination = Depends(), db: Session = Depends(get_db)):
+    if settings.FAST_LIST_RESPONSES:
+        return fast_list(db, models.NguoiDung, schemas.NguoiDungInDB, pagination)
+    return pagination.page(service.NguoiDungService.get_all(db, pagination.skip, pagination.fetch_limit, pagination.after))
 
 @router.get("/{nguoi_dung_id}", response_model=schemas.NguoiDungInDB)
 def read_nguoi_dung(nguoi_dung_id: int, db: Session = Depends(get_db)):
@@ -0,0 +1,43 @@
+import os
+import shutil
+import tempfile
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from sqlalchemy.exc import DataError
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from ..models.models import NguoiDung
+from ..services.auth_service import check_user_role
+from ..services.service_excel_ingest import reader_engine
+from ..services.service_registrar_import import RegistrarImportService
+from ..database import get_db
+
+router = APIRouter(
+    prefix="/api/nhap-du-lieu",
+    tags=["NhapDuLieu"]
+)
+
+@router.post("/phong-dao-tao")
+def import_phong_dao_tao(
+    file: UploadFile = File(...),
+    nam_nhap_truong: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: NguoiDung = Depends(check_user_role(["admin"]))
+):
+    """Nạp file CSV (raw_data.csv) hoặc Excel của phòng đào tạo vào sinh viên và tiến độ học tập."""
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    if suffix not in (".csv", ".xlsx", ".xls"):
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Chỉ nhận file CSV hoặc Excel")
+    engine = reader_engine()
+    # openpyxl only reads .xlsx; the old binary format needs calamine.
+    if suffix == ".xls" and engine is None:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Máy chủ không đọc được file .xls, hãy lưu lại dưới dạng .xlsx")
+
+    with tempfile.NamedTemporaryFile(suffix=suffix) as upload:
+        shutil.copyfileobj(file.file, upload)
+        upload.flush()
+        try:
+            return RegistrarImportService.import_file(db, upload.name, nam_nhap_truong, engine=engine)
+        except (ValueError, DataError) as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Dữ liệu không hợp lệ: {e}")
@@ -5,7 +5,10 @@ from typing import List, Optional
 from ..models import models
 from ..schemas import schemas
 from ..services import service
+from ..services.pagination import Pagination
+from ..services.fast_list import fast_list
 from ..database import get_db
+from ..config import settings
 
 router = APIRouter(
     prefix="/api/sinh-vien",
@@ -16,15 +19,17 @@ router = APIRouter(
 def create_sinh_vien(sinh_vien: schemas.SinhVienCreate, db: Session = Depends(get_db)):
     return service.SinhVienService.create(db, sinh_vien)
 
-@router.get("/", response_model=List[schemas.SinhVienInDB])
-def read_sinh_viens(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return service.SinhVienService.get_all(db, skip, limit)
+@router.get("/", response_model=List[schemas.SinhVienResponse])
+def read_sinh_viens(pagination: Pagination = Depends(), db: Session = Depends(get_db)):
+    if settings.FAST_LIST_RESPONSES:
+        return fast_list(db, models.SinhVien, schemas.SinhVienInDB, pagination)
+    return pagination.page(service.SinhVienService.get_all(db, pagination.skip, pagination.fetch_limit, pagination.after))
 
-@router.get("/{sinh_vien_id}", response_model=schemas.SinhVienInDB)
+@router.get("/{sinh_vien_id}", response_model=schemas.SinhVienResponse)
 def read_sinh_vien(sinh_vien_id: int, db: Session = Depends(get_db)):
     return service.SinhVienService.get_by_id(db, sinh_vien_id)
 
-@router.get("/ma-sv/{ma_sv}", response_model=schemas.SinhVienInDB)
+@router.get("/ma-sv/{ma_sv}", response_model=schemas.SinhVienResponse)
 def read_sinh_vien_by_ma_sv(ma_sv: str, db: Session = Depends(get_db)):
     sinh_vien = service.SinhVienService.get_by_ma_sv(db, ma_sv)
     if not sinh_vien:
@@ -34,7 +39,7 @@ def read_sinh_vien_by_ma_sv(ma_sv: str, db: Session = Depends(get_db)):
         )
     return sinh_vien
 
-@router.put("/{sinh_vien_id}", response_model=schemas.SinhVienInDB)
+@router.put("/{sinh_vien_id}", response_model=schemas.SinhVienResponse)
 def update_sinh_vien(sinh_vien_id: int, sinh_vien_update: schemas.SinhVienUpdate, db: Session = Depends(get_db)):
     return service.SinhVienService.update(db, sinh_vien_id, sinh_vien_update)
 
@@ -45,5 +50,13 @@ def delete_sinh_vien(sinh_vien_id: int, db: Session = Depends(get_db)):
 @router.get("/diem/{sinh_vien_id}", response_model=List[schemas.DiemInDB])
 def read_diem_by_sinh_vien(sinh_vien_id: int, db: Session = Depends(get_db)):
 
-    services.SinhVienService.get_by_id(db, sinh_vien_id)
-    return service.DiemService.get_by_sinhvien(db, sinh_vien_id)
\ No newline at end of file
+    service.SinhVienService.get_by_id(db, sinh_vien_id)
+    return service.DiemService.get_by_sinhvien(db, sinh_vien_id)
+
+@router.get("/{sinh_vien_id}/tong-hop", response_model=schemas.TongHopHocTapInDB)
+def read_tong_hop_hoc_tap(sinh_vien_id: int, db: Session = Depends(get_db)):
+    """
+    Tổng hợp tín chỉ, điểm trung bình theo học kỳ và cảnh báo hiện tại của sinh viên.
+    Sinh viên chưa có bản tổng hợp sẽ được tính và lưu ở lần đọc đầu tiên.
+    """
+    return service.TongHopHocTapService.get_by_sinhvien(db, sinh_vien_id)
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from ..services.service_thong_ke import ThongKeService
+from ..database import get_db
+
+router = APIRouter(
+    prefix="/api/thong-ke",
+    tags=["ThongKe"]
+)
+
+@router.get("/canh-bao")
+def read_canh_bao_hien_tai(
+    nganh: Optional[str] = None,
+    nam_nhap_truong: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Sinh viên đang bị cảnh báo ở học kỳ gần nhất, lọc theo ngành và năm nhập trường."""
+    return ThongKeService.get_canh_bao_hien_tai(db, nganh, nam_nhap_truong)
+
+@router.get("/phan-bo-diem/lop-hoc")
+def read_phan_bo_diem_lop_hoc(
+    hoc_ky: Optional[str] = None,
+    nam_hoc: Optional[str] = None,
+    hocphan_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Phân bố điểm tổng kết theo lớp học (tứ phân vị chỉ có trên PostgreSQL)."""
+    return ThongKeService.get_phan_bo_diem_lop_hoc(db, hoc_ky, nam_hoc, hocphan_id)
+
+@router.get("/tien-do")
+def read_tien_do_theo_khoa(
+    nganh: Optional[str] = None,
+    nam_nhap_truong: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """Điểm trung bình học kỳ và số cảnh báo (kèm lũy kế) theo ngành, khóa và học kỳ."""
+    return ThongKeService.get_tien_do_theo_khoa(db, nganh, nam_nhap_truong)
@@ -0,0 +1,160 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from ..models import models
+from ..schemas import schemas
+from ..services import service_async
+from ..services.pagination import Pagination
+from ..services.fast_list import fast_list_async
+from ..database import get_async_db
+from ..config import settings
+
+# Async versions of the read endpoints. When DB_ASYNC is enabled these routers are
+# registered before the sync ones and take over the matching GET routes; writes keep
+# going through the sync routers.
+
+sinh_vien = APIRouter(prefix="/api/sinh-vien", tags=["SinhVien"])
+giang_vien = APIRouter(prefix="/api/giang-vien", tags=["GiangVien"])
+hoc_phan = APIRouter(prefix="/api/hoc-phan", tags=["HocPhan"])
+lop_hoc = APIRouter(prefix="/api/lop-hoc", tags=["LopHoc"])
+diem = APIRouter(prefix="/api/diem", tags=["Diem"])
+vien = APIRouter(prefix="/api/vien", tags=["Vien"])
+
+routers = [sinh_vien, giang_vien, hoc_phan, lop_hoc, diem, vien]
+
+@sinh_vien.get("/", response_model=List[schemas.SinhVienResponse])
+async def read_sinh_viens(pagination: Pagination = Depends(), db: AsyncSession = Depends(get_async_db)):
+    if settings.FAST_LIST_RESPONSES:
+        return await fast_list_async(db, models.SinhVien, schemas.SinhVienInDB, pagination)
+    return pagination.page(await service_async.SinhVienService.get_all(db, pagination.skip, pagination.fetch_limit, pagination.after))
+
+@sinh_vien.get("/{sinh_vien_id}", response_model=schemas.SinhVienResponse)
+async def read_sinh_vien(sinh_vien_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await service_async.SinhVienService.get_by_id(db, sinh_vien_id)
+
+@sinh_vien.get("/ma-sv/{ma_sv}", response_model=schemas.SinhVienResponse)
+async def read_sinh_vien_by_ma_sv(ma_sv: str, db: AsyncSession = Depends(get_async_db)):
+    sinh_vien = await service_async.SinhVienService.get_by_ma_sv(db, ma_sv)
+    if not sinh_vien:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Không tìm thấy sinh viên với mã: {ma_sv}"
+        )
+    return sinh_vien
+
+@sinh_vien.get("/diem/{sinh_vien_id}", response_model=List[schemas.DiemInDB])
+async def read_diem_by_sinh_vien(sinh_vien_id: int, db: AsyncSession = Depends(get_async_db)):
+    await service_async.SinhVienService.get_by_id(db, sinh_vien_id)
+    return await service_async.DiemService.get_by_sinhvien(db, sinh_vien_id)
+
+@giang_vien.get("/", response_model=List[schemas.GiangVienInDB])
+async def read_giang_viens(pagination: Pagination = Depends(), db: AsyncSession = Depends(get_async_db)):
+    if settings.FAST_LIST_RESPONSES:
+        return await fast_list_async(db, models.GiangVien, schemas.GiangVienInDB, pagination)
+    return pagination.page(await service_async.GiangVienService.get_all(db, pagination.skip, pagination.fetch_limit, pagination.after))
+
+@giang_vien.get("/{giang_vien_id}", response_model=schemas.GiangVienInDB)
+async def read_giang_vien(giang_vien_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await service_async.GiangVienService.get_by_id(db, giang_vien_id)
+
+@giang_vien.get("/ma-gv/{ma_gv}", response_model=schemas.GiangVienInDB)
+async def read_giang_vien_by_ma_gv(ma_gv: str, db: AsyncSession = Depends(get_async_db)):
+    giang_vien = await service_async.GiangVienService.get_by_ma_gv(db, ma_gv)
+    if not giang_vien:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Không tìm thấy giảng viên với mã: {ma_gv}"
+        )
+    return giang_vien
+
+@giang_vien.get("/lop-hoc/{giang_vien_id}", response_model=List[schemas.LopHocInDB])
+async def read_lop_hoc_by_giang_vien(giang_vien_id: int, db: AsyncSession = Depends(get_async_db)):
+    await service_async.GiangVienService.get_by_id(db, giang_vien_id)
+    return await service_async.LopHocService.get_by_giangvien(db, giang_vien_id)
+
+@hoc_phan.get("/", response_model=List[schemas.HocPhanInDB])
+async def read_hoc_phans(pagination: Pagination = Depends(), db: AsyncSession = Depends(get_async_db)):
+    if settings.FAST_LIST_RESPONSES:
+        return await fast_list_async(db, models.HocPhan, schemas.HocPhanInDB, pagination)
+    return pagination.page(await service_async.HocPhanService.get_all(db, pagination.skip, pagination.fetch_limit, pagination.after))
+
+@hoc_phan.get("/{hoc_phan_id}", response_model=schemas.HocPhanInDB)
+async def read_hoc_phan(hoc_phan_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await service_async.HocPhanService.get_by_id(db, hoc_phan_id)
+
+@hoc_phan.get("/ma-hp/{ma_hp}", response_model=schemas.HocPhanInDB)
+async def read_hoc_phan_by_ma_hp(ma_hp: str, db: AsyncSession = Depends(get_async_db)):
+    hoc_phan = await service_async.HocPhanService.get_by_ma_hp(db, ma_hp)
+    if not hoc_phan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Không tìm thấy học phần với mã: {ma_hp}"
+        )
+    return hoc_phan
+
+@hoc_phan.get("/lop-hoc/{hoc_phan_id}", response_model=List[schemas.LopHocInDB])
+async def read_lop_hoc_by_hoc_phan(hoc_phan_id: int, db: AsyncSession = Depends(get_async_db)):
+    await service_async.HocPhanService.get_by_id(db, hoc_phan_id)
+    return await service_async.LopHocService.get_by_hocphan(db, hoc_phan_id)
+
+@lop_hoc.get("/", response_model=List[schemas.LopHocInDB])
+async def read_lop_hocs(pagination: Pagination = Depends(), db: AsyncSession = Depends(get_async_db)):
+    if settings.FAST_LIST_RESPONSES:
+        return await fast_list_async(db, models.LopHoc, schemas.LopHocInDB, pagination)
+    return pagination.page(await service_async.LopHocService.get_all(db, pagination.skip, pagination.fetch_limit, pagination.after))
+
+@lop_hoc.get("/{lop_hoc_id}", response_model=schemas.LopHocInDB)
+async def read_lop_hoc(lop_hoc_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await service_async.LopHocService.get_by_id(db, lop_hoc_id)
+
+@lop_hoc.get("/detail/{lop_hoc_id}", response_model=schemas.LopHocDetail)
+async def read_lop_hoc_detail(lop_hoc_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await service_async.LopHocService.get_detail_by_id(db, lop_hoc_id)
+
+@lop_hoc.get("/ma-lop/{ma_lop}", response_model=schemas.LopHocInDB)
+async def read_lop_hoc_by_ma_lop(ma_lop: str, db: AsyncSession = Depends(get_async_db)):
+    lop_hoc = await service_async.LopHocService.get_by_ma_lop(db, ma_lop)
+    if not lop_hoc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Không tìm thấy lớp học với mã: {ma_lop}"
+        )
+    return lop_hoc
+
+@lop_hoc.get("/diem/{lop_hoc_id}", response_model=List[schemas.DiemInDB])
+async def read_diem_by_lop_hoc(lop_hoc_id: int, db: AsyncSession = Depends(get_async_db)):
+    await service_async.LopHocService.get_by_id(db, lop_hoc_id)
+    return await service_async.DiemService.get_by_lophoc(db, lop_hoc_id)
+
+@diem.get("/", response_model=List[schemas.DiemInDB])
+async def read_diems(pagination: Pagination = Depends(), db: AsyncSession = Depends(get_async_db)):
+    if settings.FAST_LIST_RESPONSES:
+        return await fast_list_async(db, models.Diem, schemas.DiemInDB, pagination)
+    return pagination.page(await service_async.DiemService.get_all(db, pagination.skip, pagination.fetch_limit, pagination.after))
+
+@diem.get("/{diem_id}", response_model=schemas.DiemInDB)
+async def read_diem(diem_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await service_async.DiemService.get_by_id(db, diem_id)
+
+@diem.get("/detail/{diem_id}", response_model=schemas.DiemDetail)
+async def read_diem_detail(diem_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await service_async.DiemService.get_detail_by_id(db, diem_id)
+
+@diem.get("/sinh-vien/{sinhvien_id}/lop-hoc/{lophoc_id}", response_model=schemas.DiemInDB)
+async def read_diem_by_sinhvien_lophoc(sinhvien_id: int, lophoc_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await service_async.DiemService.get_by_sinhvien_lophoc(db, sinhvien_id, lophoc_id)
+
+@vien.get("/", response_model=List[schemas.VienInDB])
+async def read_viens(pagination: Pagination = Depends(), db: AsyncSession = Depends(get_async_db)):
+    if settings.FAST_LIST_RESPONSES:
+        return await fast_list_async(db, models.Vien, schemas.VienInDB, pagination)
+    return pagination.page(await service_async.VienService.get_viens(db, pagination.skip, pagination.fetch_limit, pagination.after))
+
+@vien.get("/{vien_id}", response_model=schemas.VienDetail)
+async def read_vien(vien_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await service_async.VienService.get_vien_detail(db, vien_id)
+
+@vien.get("/ma-vien/{ma_vien}", response_model=schemas.VienInDB)
+async def read_vien_by_ma_vien(ma_vien: str, db: AsyncSession = Depends(get_async_db)):
+    return await service_async.VienService.get_vien_by_ma_vien(db, ma_vien)
@@ -5,7 +5,10 @@ from typing import List, Optional
 from ..models import models
 from ..schemas import schemas
 from ..services import service
+from ..services.pagination import Pagination
+from ..services.fast_list import fast_list
 from ..database import get_db
+from ..config import settings
 
 router = APIRouter(
     prefix="/api/vien",
@@ -17,12 +20,14 @@ def create_vien(vien: schemas.VienCreate, db: Session = Depends(get_db)):
     return service.VienService.create_vien(db, vien)
 
 @router.get("/", response_model=List[schemas.VienInDB])
-def read_viens(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return service.VienService.get_viens(db, skip, limit)
+def read_viens(pagination: Pagination = Depends(), db: Session = Depends(get_db)):
+    if settings.FAST_LIST_RESPONSES:
+        return fast_list(db, models.Vien, schemas.VienInDB, pagination)
+    return pagination.page(service.VienService.get_viens(db, pagination.skip, pagination.fetch_limit, pagination.after))
 
 @router.get("/{vien_id}", response_model=schemas.VienDetail)
 def read_vien(vien_id: int, db: Session = Depends(get_db)):
-    return service.VienService.get_vien_by_ma_vien(db, vien_id)
+    return service.VienService.get_vien_detail(db, vien_id)
 
 @router.get("/ma-vien/{ma_vien}", response_model=schemas.VienInDB)
 def read_vien_by_ma_vien(ma_vien: str, db: Session = Depends(get_db)):
@@ -1,5 +1,6 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
@@ -7,9 +8,11 @@ from ..database import get_db
 from ..models.models import NguoiDung, SinhVien, GiangVien
 from ..schemas.schemas import NguoiDungCreate, Token, UserLogin
 from ..services.auth_service import (
-    authenticate_user, 
+    authenticate_user_async,
     create_access_token, 
-    get_password_hash, 
+    get_password_hash_async,
+    close_session_before_hashing,
+    verify_password_async,
     get_current_user,
     check_user_role,
     ACCESS_TOKEN_EXPIRE_MINUTES
@@ -26,7 +29,7 @@ async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -49,7 +52,7 @@ async def login(
     user_data: UserLogin,
     db: Session = Depends(get_db)
 ):
-    user = authenticate_user(db, user_data.username, user_data.password)
+    user = await authenticate_user_async(db, user_data.username, user_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -66,12 +69,7 @@ async def login(
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
-@router.post("/register", status_code=status.HTTP_201_CREATED)
-async def register_user(
-    user_data: NguoiDungCreate,
-    db: Session = Depends(get_db)
-):
-
+def _ensure_new_user(db: Session, user_data: NguoiDungCreate):
     db_user = db.query(NguoiDung).filter(NguoiDung.ten_dang_nhap == user_data.ten_dang_nhap).first()
     if db_user:
         raise HTTPException(
@@ -85,8 +83,22 @@ async def register_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email đã được sử dụng"
         )
+    close_session_before_hashing(db)
+
+def _save_user(db: Session, new_user: NguoiDung):
+    db.add(new_user)
+    db.commit()
+    db.refresh(new_user)
+
+@router.post("/register", status_code=status.HTTP_201_CREATED)
+async def register_user(
+    user_data: NguoiDungCreate,
+    db: Session = Depends(get_db)
+):
+
+    await run_in_threadpool(_ensure_new_user, db, user_data)
     
-    hashed_password = get_password_hash(user_data.mat_khau)
+    hashed_password = await get_password_hash_async(user_data.mat_khau)
     new_user = NguoiDung(
         ten_dang_nhap=user_data.ten_dang_nhap,
         email=user_data.email,
@@ -96,9 +108,7 @@ async def register_user(
         trang_thai=True
     )
     
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await run_in_threadpool(_save_user, db, new_user)
     
     return {"message": "Đăng ký tài khoản thành công"}
 
@@ -151,13 +161,15 @@ async def change_password(
     db: Session = Depends(get_db)
 ):
 
-    if not verify_password(old_password, current_user.mat_khau):
+    # The password hash is not part of the cached principal, so it is loaded here.
+    mat_khau_hash = await run_in_threadpool(getattr, current_user, "mat_khau_hash")
+    if not await verify_password_async(old_password, mat_khau_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Mật khẩu cũ không chính xác"
         )
     
-    current_user.mat_khau = get_password_hash(new_password)
-    db.commit()
+    current_user.mat_khau_hash = await get_password_hash_async(new_password)
+    await run_in_threadpool(db.commit)
     
     return {"message": "Đổi mật khẩu thành công"}
\ No newline at end of file
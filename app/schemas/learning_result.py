@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import List, Optional
+from typing_extensions import NotRequired, TypedDict
+from datetime import datetime
 
 class LearningResultSchema(BaseModel):
     id: str
@@ -17,5 +19,39 @@ class LearningResultSchema(BaseModel):
     final_score: str
     academic_processing: Optional[str] = Field(default="")
 
+class LearningResultRecord(TypedDict):
+    """
+    Same fields as LearningResultSchema, validated straight into plain dicts for the
+    batch endpoints. A missing academic_processing stays missing; every engine sets it.
+    """
+    id: str
+    major: str
+    gender: str
+    target: str
+    region: str
+    admission_block: str
+    admission_score: str
+    semester: str
+    registered_credits: str
+    semester_average: str
+    accumulated_credits: str
+    cumulative_average: str
+    final_score: str
+    academic_processing: NotRequired[Optional[str]]
+
+LEARNING_RESULT_ADAPTER = TypeAdapter(LearningResultRecord)
+LEARNING_RESULTS_ADAPTER = TypeAdapter(List[LearningResultRecord])
+
 class LearningResultResponseSchema(LearningResultSchema):
-    pass
\ No newline at end of file
+    academic_processing_rule: Optional[str] = Field(default="")
+
+class CongViecXuLySchema(BaseModel):
+    id: str
+    trang_thai: str
+    tong_so: int
+    da_xu_ly: int
+    loi: Optional[str] = None
+    tao_luc: datetime
+    cap_nhat_luc: datetime
+
+    model_config = ConfigDict(from_attributes=True)
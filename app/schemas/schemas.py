@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr
-from typing import List, Optional
-from datetime import date
+from pydantic import BaseModel, ConfigDict, EmailStr
+from typing import List, Optional, Union
+from datetime import date, datetime
 
 class Token(BaseModel):
     access_token: str
@@ -36,8 +36,7 @@ class NguoiDungInDB(NguoiDungBase):
     id: int
     trang_thai: bool
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # SinhVien Schemas
 class SinhVienBase(BaseModel):
@@ -49,6 +48,7 @@ class SinhVienBase(BaseModel):
     so_dien_thoai: Optional[str] = None
     email: EmailStr
     nam_nhap_truong: int
+    nganh: Optional[str] = None
 
 class SinhVienCreate(SinhVienBase):
     nguoidung_id: Optional[int] = None
@@ -61,13 +61,32 @@ class SinhVienUpdate(BaseModel):
     so_dien_thoai: Optional[str] = None
     email: Optional[EmailStr] = None
     nam_nhap_truong: Optional[int] = None
+    nganh: Optional[str] = None
 
 class SinhVienInDB(SinhVienBase):
     id: int
     nguoidung_id: Optional[int] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class SinhVienNhapInDB(BaseModel):
+    """A student loaded from the registrar export whose profile has not been filled in yet."""
+    id: int
+    ma_sv: str
+    ho_ten: Optional[str] = None
+    ngay_sinh: Optional[date] = None
+    gioi_tinh: Optional[str] = None
+    dia_chi: Optional[str] = None
+    so_dien_thoai: Optional[str] = None
+    email: Optional[EmailStr] = None
+    nam_nhap_truong: Optional[int] = None
+    nganh: Optional[str] = None
+    nguoidung_id: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Responses that may include imported students; complete ones still match SinhVienInDB.
+SinhVienResponse = Union[SinhVienInDB, SinhVienNhapInDB]
 # GiangVien Schemas
 class GiangVienBase(BaseModel):
     ma_gv: str
@@ -89,8 +108,7 @@ class GiangVienInDB(GiangVienBase):
     id: int
     nguoidung_id: Optional[int] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # HocPhan Schemas
@@ -113,8 +131,7 @@ class HocPhanUpdate(BaseModel):
 class HocPhanInDB(HocPhanBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # LopHoc Schemas
 class LopHocBase(BaseModel):
@@ -140,15 +157,13 @@ class LopHocUpdate(BaseModel):
 class LopHocInDB(LopHocBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class LopHocDetail(LopHocInDB):
     hocphan: HocPhanInDB
     giangvien: GiangVienInDB
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # Diem Schemas
 class DiemBase(BaseModel):
@@ -171,15 +186,23 @@ class DiemUpdate(BaseModel):
 class DiemInDB(DiemBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class DiemDetail(DiemInDB):
-    sinhvien: SinhVienInDB
+    sinhvien: SinhVienResponse
     lophoc: LopHocInDB
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class DiemBulkError(BaseModel):
+    vi_tri: int
+    sinhvien_id: int
+    lophoc_id: int
+    chi_tiet: str
+
+class DiemBulkResult(BaseModel):
+    so_ban_ghi: int
+    loi: List[DiemBulkError] = []
 # Vien Schemas
 class VienBase(BaseModel):
     ma_vien: str
@@ -198,15 +221,13 @@ class VienUpdate(BaseModel):
 class VienInDB(VienBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class VienDetail(VienInDB):
     hocphan: List[HocPhanInDB] = []
     giangvien: List[GiangVienInDB] = []
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 # TienDoHocTap Schemas
 class TienDoHocTapBase(BaseModel):
@@ -234,11 +255,34 @@ class TienDoHocTapUpdate(BaseModel):
 class TienDoHocTapInDB(TienDoHocTapBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class TienDoHocTapDetail(TienDoHocTapInDB):
-    sinhvien: SinhVienInDB
+    sinhvien: SinhVienResponse
     
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# TongHopHocTap Schemas
+class HocKyTongHop(BaseModel):
+    hoc_ky: str
+    nam_hoc: str
+    tin_chi_dang_ky: Optional[int] = None
+    diem_trung_binh_hk: Optional[float] = None
+    tong_tin_chi_tich_luy: Optional[int] = None
+    diem_trung_binh_tich_luy: Optional[float] = None
+    xu_ly_hoc_tap: Optional[str] = None
+
+class TongHopHocTapInDB(BaseModel):
+    sinhvien_id: int
+    so_hoc_ky: int
+    hoc_ky_gan_nhat: Optional[str] = None
+    nam_hoc_gan_nhat: Optional[str] = None
+    tong_tin_chi_tich_luy: Optional[int] = None
+    diem_trung_binh_tich_luy: Optional[float] = None
+    xu_ly_hoc_tap: Optional[str] = None
+    so_lop_co_diem: int
+    diem_tong_ket_trung_binh: Optional[float] = None
+    lich_su: List[HocKyTongHop] = []
+    cap_nhat_luc: datetime
+
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
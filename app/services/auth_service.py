@@ -1,22 +1,40 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 
+from ..config import settings
 from ..database import get_db
 from ..models.models import NguoiDung
 from ..schemas import schemas
+from .cache import ReferenceCache
 
 SECRET_KEY = "NhomBonEmLaNhomMaiAnhNgoVaThanhGayLoVaChauImANg"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# The single hashing policy. Hashes made with another cost are replaced on the next
+# successful login; benchmarks/bench_password_hash.py measures each cost.
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+# Users behind valid tokens, by ten_dang_nhap. NguoiDungService revokes an entry as soon
+# as the user is updated or disabled; the password hash is never cached.
+PRINCIPAL_CACHE = ReferenceCache(
+    "nguoi_dung",
+    NguoiDung,
+    "ten_dang_nhap",
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    exclude=("mat_khau_hash",)
+)
+
 def verify_password(plain_password, hashed_password):
 
     return pwd_context.verify(plain_password, hashed_password)
@@ -25,16 +43,109 @@ def get_password_hash(password):
 
     return pwd_context.hash(password)
 
+def verify_and_update_password(plain_password, hashed_password):
+    """(valid, new_hash); new_hash is set when the stored hash predates the current policy."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def save_password_hash(db: Session, user_id: int, hashed_password: str):
+    db.query(NguoiDung).filter(NguoiDung.id == user_id).update({NguoiDung.mat_khau_hash: hashed_password})
+    db.commit()
+
+# bcrypt takes 100-300 ms of CPU per call. It runs on a small dedicated pool so logins
+# neither block the event loop nor take over the threadpool that serves the sync routes;
+# beyond PASSWORD_HASH_QUEUE waiting calls, requests are rejected right away with 503.
+_password_executor: Optional[ThreadPoolExecutor] = None
+_password_slots: Optional[threading.BoundedSemaphore] = None
+
+def get_password_executor() -> ThreadPoolExecutor:
+    global _password_executor, _password_slots
+    if _password_executor is None:
+        _password_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE)
+        _password_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="mat-khau")
+    return _password_executor
+
+def shutdown_password_executor():
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False, cancel_futures=True)
+        _password_executor = None
+
+async def run_password_task(function, *args):
+    executor = get_password_executor()
+    if not _password_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Hệ thống đang quá tải, vui lòng thử lại sau",
+            headers={"Retry-After": "1"},
+        )
+    slots = _password_slots
+    try:
+        future = executor.submit(function, *args)
+    except BaseException:
+        slots.release()
+        raise
+    # Released when the job itself ends, not when the caller stops waiting: a cancelled
+    # request (client disconnect) leaves its job queued or running, and it must keep counting.
+    future.add_done_callback(lambda _: slots.release())
+    return await asyncio.wrap_future(future)
+
+async def verify_password_async(plain_password, hashed_password):
+    return await run_password_task(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    return await run_password_task(get_password_hash, password)
+
+async def verify_and_update_password_async(plain_password, hashed_password):
+    return await run_password_task(verify_and_update_password, plain_password, hashed_password)
+
 def get_user_by_username(db: Session, username: str):
     return db.query(NguoiDung).filter(NguoiDung.ten_dang_nhap == username).first()
 
+def get_principal(db: Session, username: str):
+    """get_user_by_username through PRINCIPAL_CACHE, for the per-request token check."""
+    data = PRINCIPAL_CACHE.lookup_code(username)
+    if data is not None:
+        return PRINCIPAL_CACHE.attach(db, data)
+    user = get_user_by_username(db, username)
+    return PRINCIPAL_CACHE.store(user) if user is not None else None
+
 def authenticate_user(db: Session, username: str, password: str):
 
     user = get_user_by_username(db, username)
     if not user:
         return False
-    if not verify_password(password, user.mat_khau_hash):
+    valid, new_hash = verify_and_update_password(password, user.mat_khau_hash)
+    if not valid:
+        return False
+    if new_hash:
+        save_password_hash(db, user.id, new_hash)
+    if not user.trang_thai:
+        return False
+    return user
+
+def close_session_before_hashing(db: Session):
+    """
+    Closes the session so its connection goes back to the pool during a slow bcrypt call.
+    Loaded objects are detached: their loaded columns stay readable, but nothing lazy-loads.
+    The session opens a new transaction on its next query.
+    """
+    db.close()
+
+def _load_user(db: Session, username: str):
+    user = get_user_by_username(db, username)
+    close_session_before_hashing(db)
+    return user
+
+async def authenticate_user_async(db: Session, username: str, password: str):
+    """authenticate_user for async routes: the query runs in the threadpool and bcrypt on its own pool."""
+    user = await run_in_threadpool(_load_user, db, username)
+    if not user:
+        return False
+    valid, new_hash = await verify_and_update_password_async(password, user.mat_khau_hash)
+    if not valid:
         return False
+    if new_hash:
+        await run_in_threadpool(save_password_hash, db, user.id, new_hash)
     if not user.trang_thai:
         return False
     return user
@@ -69,7 +180,7 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
         )
     except JWTError:
         raise credentials_exception
-    user = get_user_by_username(db, username=token_data.username)
+    user = get_principal(db, token_data.username)
     if user is None:
         raise credentials_exception
     if not user.trang_thai:
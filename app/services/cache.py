@@ -0,0 +1,284 @@
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+MISSING = object()
+
+KEY_PREFIX = "alert_system:cache"
+INVALIDATION_CHANNEL = f"{KEY_PREFIX}:invalidate"
+
+class CacheBackend:
+    """Interface of the cache backends; `get` returns MISSING when the key is absent or expired."""
+
+    name: str
+
+    def get(self, key: Hashable) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: Hashable, value: Any):
+        raise NotImplementedError
+
+    def delete(self, *keys: Hashable):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self) -> Dict:
+        raise NotImplementedError
+
+class TTLCache(CacheBackend):
+    """Thread-safe LRU cache whose entries expire `ttl_seconds` after they were stored."""
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys: Hashable):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "so_muc": len(self._entries),
+                "toi_da": self.max_entries,
+                "ttl_giay": self.ttl_seconds,
+                "hit": self.hits,
+                "miss": self.misses,
+                "ti_le_hit": round(self.hits / total, 4) if total else None,
+                "bi_loai": self.evictions,
+            }
+
+class RedisCache(CacheBackend):
+    """
+    Cache shared by every worker through Redis. Values are pickled, so the Redis
+    instance must only be reachable by this application; size is bounded by the
+    server's maxmemory policy. Redis errors degrade to cache misses.
+    """
+
+    def __init__(self, name: str, client, ttl_seconds: float):
+        self.name = name
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key: Hashable) -> str:
+        return f"{KEY_PREFIX}:{self.name}:{key!r}"
+
+    def get(self, key: Hashable) -> Any:
+        try:
+            raw = self.client.get(self._key(key))
+        except Exception as e:
+            logger.warning("Không đọc được cache %s từ Redis: %s", self.name, e)
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return MISSING
+        self.hits += 1
+        return pickle.loads(raw)
+
+    def set(self, key: Hashable, value: Any):
+        try:
+            self.client.set(self._key(key), pickle.dumps(value), px=int(self.ttl_seconds * 1000))
+        except Exception as e:
+            logger.warning("Không ghi được cache %s vào Redis: %s", self.name, e)
+
+    def delete(self, *keys: Hashable):
+        if not keys:
+            return
+        try:
+            self.client.delete(*(self._key(key) for key in keys))
+        except Exception as e:
+            logger.warning("Không xóa được cache %s trong Redis: %s", self.name, e)
+
+    def clear(self):
+        try:
+            for key in self.client.scan_iter(match=f"{KEY_PREFIX}:{self.name}:*"):
+                self.client.delete(key)
+        except Exception as e:
+            logger.warning("Không xóa được cache %s trong Redis: %s", self.name, e)
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "backend": "redis",
+            "ttl_giay": self.ttl_seconds,
+            "hit": self.hits,
+            "miss": self.misses,
+            "ti_le_hit": round(self.hits / total, 4) if total else None,
+        }
+
+@lru_cache(maxsize=None)
+def get_redis():
+    import redis
+
+    return redis.Redis.from_url(settings.REDIS_URL)
+
+_caches: Dict[str, CacheBackend] = {}
+_caches_lock = threading.Lock()
+
+def get_cache(name: str, ttl_seconds: Optional[float] = None) -> CacheBackend:
+    ttl_seconds = settings.CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+    with _caches_lock:
+        if name not in _caches:
+            if settings.CACHE_BACKEND == "redis":
+                _caches[name] = RedisCache(name, get_redis(), ttl_seconds)
+            else:
+                _caches[name] = TTLCache(name, settings.CACHE_MAX_ENTRIES, ttl_seconds)
+        return _caches[name]
+
+def cache_stats() -> Dict[str, Dict]:
+    with _caches_lock:
+        caches = list(_caches.values())
+    return {cache.name: cache.stats() for cache in caches}
+
+class InvalidationBus:
+    """
+    Propagates invalidations to the other workers over Redis pub/sub, so their
+    in-process caches drop entries written elsewhere. Enabled when REDIS_URL is set.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.origin = f"{os.getpid()}:{uuid.uuid4().hex}"
+        self._thread = None
+
+    def publish(self, name: str, keys):
+        message = {"origin": self.origin, "cache": name, "keys": [list(key) for key in keys]}
+        try:
+            self.client.publish(INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            logger.warning("Không gửi được sự kiện vô hiệu hóa cache %s: %s", name, e)
+
+    def _handle(self, message):
+        event = json.loads(message["data"])
+        if event["origin"] == self.origin:
+            return
+        with _caches_lock:
+            cache = _caches.get(event["cache"])
+        if cache is not None:
+            cache.delete(*(tuple(key) for key in event["keys"]))
+
+    def start(self):
+        if self._thread is None:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{INVALIDATION_CHANNEL: self._handle})
+            self._thread = pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def stop(self):
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+@lru_cache(maxsize=None)
+def get_invalidation_bus() -> Optional[InvalidationBus]:
+    return InvalidationBus(get_redis()) if settings.REDIS_URL else None
+
+def invalidate(name: str, *keys: Hashable):
+    """Deletes `keys` from the named cache here and, through the bus, in every other worker."""
+    get_cache(name).delete(*keys)
+    bus = get_invalidation_bus()
+    if bus is not None:
+        bus.publish(name, keys)
+
+class ReferenceCache:
+    """
+    Read-through cache of rarely changing rows, keyed by primary key and by one
+    business code. Only column values are cached; lookups rebuild an instance attached
+    to the caller's session without a round-trip. Code lookups go through the id, so
+    invalidating the id is enough even when the code itself changes. Columns in
+    `exclude` are not cached and load from the database when accessed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model,
+        code: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+        exclude: Tuple[str, ...] = ()
+    ):
+        self.model = model
+        self.code = code
+        self.name = name
+        self.cache = get_cache(name, ttl_seconds)
+        self.columns = [attribute.key for attribute in inspect(model).column_attrs if attribute.key not in exclude]
+
+    def lookup_id(self, id: int) -> Optional[Dict]:
+        data = self.cache.get(("id", id))
+        return None if data is MISSING else data
+
+    def lookup_code(self, value) -> Optional[Dict]:
+        id = self.cache.get((self.code, value))
+        if id is MISSING:
+            return None
+        data = self.lookup_id(id)
+        return data if data is not None and data[self.code] == value else None
+
+    def store(self, instance):
+        data = {column: getattr(instance, column) for column in self.columns}
+        self.cache.set(("id", data["id"]), data)
+        if self.code is not None:
+            self.cache.set((self.code, data[self.code]), data["id"])
+        return instance
+
+    def invalidate(self, *ids: int):
+        if ids:
+            invalidate(self.name, *(("id", id) for id in ids))
+
+    def detached(self, data: Dict):
+        instance = self.model(**data)
+        make_transient_to_detached(instance)
+        return instance
+
+    def attach(self, db: Session, data: Dict):
+        return db.merge(self.detached(data), load=False)
@@ -0,0 +1,28 @@
+from typing import List
+
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .loading import schema_columns
+from .pagination import Pagination, keyset
+
+# List endpoints on the fast path (FAST_LIST_RESPONSES) select only the columns of the
+# response schema and encode the rows with orjson. The rows come straight from the
+# database, so they are not validated against the response_model again.
+
+def list_statement(model, schema, pagination: Pagination) -> Select:
+    return keyset(select(*schema_columns(model, schema)), model.id, pagination.skip, pagination.fetch_limit, pagination.after)
+
+def rows_response(rows: List[dict], pagination: Pagination) -> ORJSONResponse:
+    rows = pagination.page(rows)
+    return ORJSONResponse(rows, headers=dict(pagination.response.headers))
+
+def fast_list(db: Session, model, schema, pagination: Pagination) -> ORJSONResponse:
+    result = db.execute(list_statement(model, schema, pagination))
+    return rows_response([dict(row) for row in result.mappings()], pagination)
+
+async def fast_list_async(db: AsyncSession, model, schema, pagination: Pagination) -> ORJSONResponse:
+    result = await db.execute(list_statement(model, schema, pagination))
+    return rows_response([dict(row) for row in result.mappings()], pagination)
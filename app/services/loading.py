@@ -0,0 +1,48 @@
+import typing
+from functools import lru_cache
+from typing import Optional, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+
+def _nested_schema(annotation) -> Optional[Type[BaseModel]]:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for argument in typing.get_args(annotation):
+        nested = _nested_schema(argument)
+        if nested is not None:
+            return nested
+    return None
+
+@lru_cache(maxsize=None)
+def loader_options(model, schema: Type[BaseModel]) -> Tuple:
+    """
+    Loading plan for serializing `model` with `schema`: every schema field that is a
+    relationship of the model is loaded up front, many-to-one with a JOIN and
+    collections with one SELECT ... IN per relationship, recursively for nested schemas.
+    """
+    relationships = inspect(model).relationships
+    options = []
+    for name, field in schema.model_fields.items():
+        if name not in relationships:
+            continue
+        relationship = relationships[name]
+        attribute = getattr(model, name)
+        loader = selectinload(attribute) if relationship.uselist else joinedload(attribute)
+        nested = _nested_schema(field.annotation)
+        if nested is not None:
+            nested_options = loader_options(relationship.mapper.class_, nested)
+            if nested_options:
+                loader = loader.options(*nested_options)
+        options.append(loader)
+    return tuple(options)
+
+@lru_cache(maxsize=None)
+def schema_columns(model, schema: Type[BaseModel]) -> Tuple:
+    """Column attributes of `model` backing the fields of `schema`, in field order."""
+    columns = inspect(model).column_attrs
+    missing = [name for name in schema.model_fields if name not in columns]
+    if missing:
+        raise ValueError(f"{schema.__name__} has fields that are not columns of {model.__name__}: {missing}")
+    return tuple(getattr(model, name) for name in schema.model_fields)
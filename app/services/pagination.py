@@ -0,0 +1,70 @@
+import base64
+import binascii
+import json
+from typing import List, Mapping, Optional, Union
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import Select
+from sqlalchemy.orm import Query as OrmQuery
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, kind: type = int):
+    try:
+        value = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        value = None
+    if type(value) is not kind:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor không hợp lệ"
+        )
+    return value
+
+def keyset(query: Union[OrmQuery, Select], key, skip: int = 0, limit: int = 100, after=None):
+    """
+    Keyset pagination on `key`: with `after` the page starts right after that key value,
+    so deep pages cost the same as the first one. `skip` is only used without `after`.
+    """
+    query = query.order_by(key)
+    if after is not None:
+        query = query.filter(key > after)
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+def paginate(query: OrmQuery, key, skip: int = 0, limit: int = 100, after=None) -> List:
+    return keyset(query, key, skip, limit, after).all()
+
+class Pagination:
+    """
+    Query parameters of the list endpoints. The next page is requested with
+    `cursor` set to the X-Next-Cursor header of the current one; the header is
+    missing on the last page.
+    """
+
+    def __init__(
+        self,
+        response: Response,
+        cursor: Optional[str] = Query(None, description=f"Giá trị header {NEXT_CURSOR_HEADER} của trang trước"),
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1)
+    ):
+        self.response = response
+        self.after = decode_cursor(cursor) if cursor else None
+        self.skip = skip
+        self.limit = limit
+        # One row past the page tells whether there is a next one.
+        self.fetch_limit = limit + 1
+
+    def page(self, items: List, key: str = "id") -> List:
+        """Trims the rows fetched with `fetch_limit` to the page and sets the cursor if more follow."""
+        if len(items) > self.limit:
+            items = items[:self.limit]
+            last = items[-1]
+            value = last[key] if isinstance(last, Mapping) else getattr(last, key)
+            self.response.headers[NEXT_CURSOR_HEADER] = encode_cursor(value)
+        return items
@@ -1,24 +1,45 @@
+from collections import defaultdict
+from sqlalchemy import delete, func, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
-from typing import List, Optional
-from datetime import date
-import bcrypt
+from typing import Iterable, List, Optional
+from datetime import date, datetime
 
 from ..models import models
 from ..schemas import schemas
+from .auth_service import PRINCIPAL_CACHE, get_password_hash
+from .cache import ReferenceCache
+from .loading import loader_options
+from .pagination import paginate
+
+# Reference data changes a few times a term; write paths invalidate by id.
+VIEN_CACHE = ReferenceCache("vien", models.Vien, "ma_vien")
+HOCPHAN_CACHE = ReferenceCache("hocphan", models.HocPhan, "ma_hp")
+LOPHOC_CACHE = ReferenceCache("lophoc", models.LopHoc, "ma_lop")
+SINHVIEN_CACHE = ReferenceCache("sinhvien", models.SinhVien)
+
+DIEM_COLUMNS = ['diem_chuyen_can', 'diem_giua_ky', 'diem_cuoi_ky', 'diem_tong_ket']
+
+def dialect_insert(db: Session, model):
+    """INSERT construct of the session's dialect, for ON CONFLICT upserts."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
 
 class NguoiDungService:
     @staticmethod
     def create(db: Session, nguoi_dung: schemas.NguoiDungCreate):
-        hashed_password = bcrypt.hashpw(nguoi_dung.mat_khau.encode('utf-8'), bcrypt.gensalt())
+        hashed_password = get_password_hash(nguoi_dung.mat_khau)
         
         db_nguoi_dung = models.NguoiDung(
             ten_dang_nhap=nguoi_dung.ten_dang_nhap,
             email=nguoi_dung.email,
             ho_ten=nguoi_dung.ho_ten,
             vai_tro=nguoi_dung.vai_tro,
-            mat_khau_hash=hashed_password.decode('utf-8'),
+            mat_khau_hash=hashed_password,
             trang_thai=True
         )
         
@@ -35,8 +56,8 @@ class NguoiDungService:
             )
     
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100):
-        return db.query(models.NguoiDung).offset(skip).limit(limit).all()
+    def get_all(db: Session, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return paginate(db.query(models.NguoiDung), models.NguoiDung.id, skip, limit, after)
     
     @staticmethod
     def get_by_id(db: Session, nguoi_dung_id: int):
@@ -70,12 +91,13 @@ class NguoiDungService:
     def update(db: Session, nguoi_dung_id: int, nguoi_dung_update: schemas.NguoiDungUpdate):
         db_nguoi_dung = NguoiDungService.get_by_id(db, nguoi_dung_id)
         
-        update_data = nguoi_dung_update.dict(exclude_unset=True)
+        update_data = nguoi_dung_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_nguoi_dung, key, value)
             
         try:
             db.commit()
+            PRINCIPAL_CACHE.invalidate(nguoi_dung_id)
             db.refresh(db_nguoi_dung)
             return db_nguoi_dung
         except IntegrityError:
@@ -91,6 +113,7 @@ class NguoiDungService:
         
         db_nguoi_dung.trang_thai = False
         db.commit()
+        PRINCIPAL_CACHE.invalidate(nguoi_dung_id)
         
         return {"detail": f"Người dùng với ID {nguoi_dung_id} đã bị vô hiệu hóa"}
 
@@ -107,7 +130,8 @@ class SinhVienService:
             so_dien_thoai=sinh_vien.so_dien_thoai,
             email=sinh_vien.email,
             nguoidung_id=sinh_vien.nguoidung_id,
-            nam_nhap_truong=sinh_vien.nam_nhap_truong
+            nam_nhap_truong=sinh_vien.nam_nhap_truong,
+            nganh=sinh_vien.nganh
         )
         
         try:
@@ -123,8 +147,8 @@ class SinhVienService:
             )
     
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100):
-        return db.query(models.SinhVien).offset(skip).limit(limit).all()
+    def get_all(db: Session, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return paginate(db.query(models.SinhVien), models.SinhVien.id, skip, limit, after)
     
     @staticmethod
     def get_by_id(db: Session, sinh_vien_id: int):
@@ -136,6 +160,11 @@ class SinhVienService:
             )
         return db_sinh_vien
     
+    @staticmethod
+    def ensure_exists(db: Session, sinh_vien_id: int):
+        if SINHVIEN_CACHE.lookup_id(sinh_vien_id) is None:
+            SINHVIEN_CACHE.store(SinhVienService.get_by_id(db, sinh_vien_id))
+    
     @staticmethod
     def get_by_ma_sv(db: Session, ma_sv: str):
         return db.query(models.SinhVien).filter(models.SinhVien.ma_sv == ma_sv).first()
@@ -144,12 +173,13 @@ class SinhVienService:
     def update(db: Session, sinh_vien_id: int, sinh_vien_update: schemas.SinhVienUpdate):
         db_sinh_vien = SinhVienService.get_by_id(db, sinh_vien_id)
         
-        update_data = sinh_vien_update.dict(exclude_unset=True)
+        update_data = sinh_vien_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_sinh_vien, key, value)
             
         try:
             db.commit()
+            SINHVIEN_CACHE.invalidate(sinh_vien_id)
             db.refresh(db_sinh_vien)
             return db_sinh_vien
         except IntegrityError:
@@ -163,8 +193,10 @@ class SinhVienService:
     def delete(db: Session, sinh_vien_id: int):
         db_sinh_vien = SinhVienService.get_by_id(db, sinh_vien_id)
         
+        db.query(models.TongHopHocTap).filter(models.TongHopHocTap.sinhvien_id == sinh_vien_id).delete()
         db.delete(db_sinh_vien)
         db.commit()
+        SINHVIEN_CACHE.invalidate(sinh_vien_id)
         
         return {"detail": f"Sinh viên với ID {sinh_vien_id} đã bị xóa"}
 
@@ -193,8 +225,8 @@ class GiangVienService:
             )
     
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100):
-        return db.query(models.GiangVien).offset(skip).limit(limit).all()
+    def get_all(db: Session, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return paginate(db.query(models.GiangVien), models.GiangVien.id, skip, limit, after)
     
     @staticmethod
     def get_by_id(db: Session, giang_vien_id: int):
@@ -214,7 +246,7 @@ class GiangVienService:
     def update(db: Session, giang_vien_id: int, giang_vien_update: schemas.GiangVienUpdate):
         db_giang_vien = GiangVienService.get_by_id(db, giang_vien_id)
         
-        update_data = giang_vien_update.dict(exclude_unset=True)
+        update_data = giang_vien_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_giang_vien, key, value)
             
@@ -262,8 +294,8 @@ class HocPhanService:
             )
     
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100):
-        return db.query(models.HocPhan).offset(skip).limit(limit).all()
+    def get_all(db: Session, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return paginate(db.query(models.HocPhan), models.HocPhan.id, skip, limit, after)
     
     @staticmethod
     def get_by_id(db: Session, hoc_phan_id: int):
@@ -277,17 +309,24 @@ class HocPhanService:
     
     @staticmethod
     def get_by_ma_hp(db: Session, ma_hp: str):
-        return db.query(models.HocPhan).filter(models.HocPhan.ma_hp == ma_hp).first()
+        data = HOCPHAN_CACHE.lookup_code(ma_hp)
+        if data is not None:
+            return HOCPHAN_CACHE.attach(db, data)
+        db_hoc_phan = db.query(models.HocPhan).filter(models.HocPhan.ma_hp == ma_hp).first()
+        if db_hoc_phan is not None:
+            HOCPHAN_CACHE.store(db_hoc_phan)
+        return db_hoc_phan
     
     @staticmethod
     def update(db: Session, hoc_phan_id: int, hoc_phan_update: schemas.HocPhanUpdate):
         db_hoc_phan = HocPhanService.get_by_id(db, hoc_phan_id)
         
-        update_data = hoc_phan_update.dict(exclude_unset=True)
+        update_data = hoc_phan_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_hoc_phan, key, value)
             
         db.commit()
+        HOCPHAN_CACHE.invalidate(hoc_phan_id)
         db.refresh(db_hoc_phan)
         return db_hoc_phan
     
@@ -297,6 +336,7 @@ class HocPhanService:
         
         db.delete(db_hoc_phan)
         db.commit()
+        HOCPHAN_CACHE.invalidate(hoc_phan_id)
         
         return {"detail": f"Học phần với ID {hoc_phan_id} đã bị xóa"}
 
@@ -330,8 +370,8 @@ class LopHocService:
             )
     
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100):
-        return db.query(models.LopHoc).offset(skip).limit(limit).all()
+    def get_all(db: Session, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return paginate(db.query(models.LopHoc), models.LopHoc.id, skip, limit, after)
     
     @staticmethod
     def get_by_id(db: Session, lop_hoc_id: int):
@@ -345,7 +385,9 @@ class LopHocService:
     
     @staticmethod
     def get_detail_by_id(db: Session, lop_hoc_id: int):
-        db_lop_hoc = db.query(models.LopHoc).filter(models.LopHoc.id == lop_hoc_id).first()
+        db_lop_hoc = db.query(models.LopHoc).options(
+            *loader_options(models.LopHoc, schemas.LopHocDetail)
+        ).filter(models.LopHoc.id == lop_hoc_id).first()
         if db_lop_hoc is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -355,7 +397,18 @@ class LopHocService:
     
     @staticmethod
     def get_by_ma_lop(db: Session, ma_lop: str):
-        return db.query(models.LopHoc).filter(models.LopHoc.ma_lop == ma_lop).first()
+        data = LOPHOC_CACHE.lookup_code(ma_lop)
+        if data is not None:
+            return LOPHOC_CACHE.attach(db, data)
+        db_lop_hoc = db.query(models.LopHoc).filter(models.LopHoc.ma_lop == ma_lop).first()
+        if db_lop_hoc is not None:
+            LOPHOC_CACHE.store(db_lop_hoc)
+        return db_lop_hoc
+    
+    @staticmethod
+    def ensure_exists(db: Session, lop_hoc_id: int):
+        if LOPHOC_CACHE.lookup_id(lop_hoc_id) is None:
+            LOPHOC_CACHE.store(LopHocService.get_by_id(db, lop_hoc_id))
     
     @staticmethod
     def get_by_giangvien(db: Session, giangvien_id: int):
@@ -369,7 +422,7 @@ class LopHocService:
     def update(db: Session, lop_hoc_id: int, lop_hoc_update: schemas.LopHocUpdate):
         db_lop_hoc = LopHocService.get_by_id(db, lop_hoc_id)
         
-        update_data = lop_hoc_update.dict(exclude_unset=True)
+        update_data = lop_hoc_update.model_dump(exclude_unset=True)
         
         if 'hocphan_id' in update_data:
             HocPhanService.get_by_id(db, update_data['hocphan_id'])
@@ -381,6 +434,7 @@ class LopHocService:
             setattr(db_lop_hoc, key, value)
             
         db.commit()
+        LOPHOC_CACHE.invalidate(lop_hoc_id)
         db.refresh(db_lop_hoc)
         return db_lop_hoc
     
@@ -390,6 +444,7 @@ class LopHocService:
         
         db.delete(db_lop_hoc)
         db.commit()
+        LOPHOC_CACHE.invalidate(lop_hoc_id)
         
         return {"detail": f"Lớp học với ID {lop_hoc_id} đã bị xóa"}
 
@@ -398,37 +453,81 @@ class DiemService:
     @staticmethod
     def create(db: Session, diem: schemas.DiemCreate):
  
-        SinhVienService.get_by_id(db, diem.sinhvien_id)
-        LopHocService.get_by_id(db, diem.lophoc_id)
-        
-        existing = db.query(models.Diem).filter(
-            models.Diem.sinhvien_id == diem.sinhvien_id,
-            models.Diem.lophoc_id == diem.lophoc_id
-        ).first()
-        
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Sinh viên đã có điểm trong lớp học này"
-            )
+        SinhVienService.ensure_exists(db, diem.sinhvien_id)
+        LopHocService.ensure_exists(db, diem.lophoc_id)
         
-        db_diem = models.Diem(
+        # The unique index on (sinhvien_id, lophoc_id) decides duplicates atomically.
+        stmt = dialect_insert(db, models.Diem).values(
             sinhvien_id=diem.sinhvien_id,
             lophoc_id=diem.lophoc_id,
             diem_chuyen_can=diem.diem_chuyen_can,
             diem_giua_ky=diem.diem_giua_ky,
             diem_cuoi_ky=diem.diem_cuoi_ky,
             diem_tong_ket=diem.diem_tong_ket
-        )
+        ).on_conflict_do_nothing(
+            index_elements=['sinhvien_id', 'lophoc_id']
+        ).returning(models.Diem)
         
-        db.add(db_diem)
+        db_diem = db.execute(stmt).scalar()
+        if db_diem is None:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Sinh viên đã có điểm trong lớp học này"
+            )
+        
+        TongHopHocTapService.refresh(db, [diem.sinhvien_id])
         db.commit()
-        db.refresh(db_diem)
         return db_diem
     
     @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100):
-        return db.query(models.Diem).offset(skip).limit(limit).all()
+    def bulk_upsert(db: Session, diems: List[schemas.DiemCreate]):
+        sinhvien_ids = {diem.sinhvien_id for diem in diems}
+        lophoc_ids = {diem.lophoc_id for diem in diems}
+        existing_sinhvien = {
+            row.id for row in db.query(models.SinhVien.id).filter(models.SinhVien.id.in_(sinhvien_ids))
+        }
+        existing_lophoc = {
+            row.id for row in db.query(models.LopHoc.id).filter(models.LopHoc.id.in_(lophoc_ids))
+        }
+
+        errors = []
+        rows = []
+        seen = {}
+        for index, diem in enumerate(diems):
+            key = (diem.sinhvien_id, diem.lophoc_id)
+            if diem.sinhvien_id not in existing_sinhvien:
+                detail = f"Không tìm thấy sinh viên với ID: {diem.sinhvien_id}"
+            elif diem.lophoc_id not in existing_lophoc:
+                detail = f"Không tìm thấy lớp học với ID: {diem.lophoc_id}"
+            elif key in seen:
+                detail = f"Trùng sinh viên và lớp học với dòng {seen[key]}"
+            else:
+                seen[key] = index
+                rows.append(diem.model_dump())
+                continue
+            errors.append({
+                "vi_tri": index,
+                "sinhvien_id": diem.sinhvien_id,
+                "lophoc_id": diem.lophoc_id,
+                "chi_tiet": detail
+            })
+
+        if rows:
+            stmt = dialect_insert(db, models.Diem)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['sinhvien_id', 'lophoc_id'],
+                set_={column: stmt.excluded[column] for column in DIEM_COLUMNS}
+            )
+            db.execute(stmt, rows)
+            TongHopHocTapService.refresh(db, {row['sinhvien_id'] for row in rows})
+        db.commit()
+
+        return {"so_ban_ghi": len(rows), "loi": errors}
+
+    @staticmethod
+    def get_all(db: Session, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return paginate(db.query(models.Diem), models.Diem.id, skip, limit, after)
     
     @staticmethod
     def get_by_id(db: Session, diem_id: int):
@@ -442,7 +541,9 @@ class DiemService:
     
     @staticmethod
     def get_detail_by_id(db: Session, diem_id: int):
-        db_diem = db.query(models.Diem).filter(models.Diem.id == diem_id).first()
+        db_diem = db.query(models.Diem).options(
+            *loader_options(models.Diem, schemas.DiemDetail)
+        ).filter(models.Diem.id == diem_id).first()
         if db_diem is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -476,24 +577,36 @@ class DiemService:
     def update(db: Session, diem_id: int, diem_update: schemas.DiemUpdate):
         db_diem = DiemService.get_by_id(db, diem_id)
         
-        update_data = diem_update.dict(exclude_unset=True)
+        update_data = diem_update.model_dump(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_diem, key, value)
             
+        TongHopHocTapService.refresh(db, [db_diem.sinhvien_id])
         db.commit()
         db.refresh(db_diem)
         return db_diem
     
     @staticmethod
     def update_by_sinhvien_lophoc(db: Session, sinhvien_id: int, lophoc_id: int, diem_update: schemas.DiemUpdate):
-        db_diem = DiemService.get_by_sinhvien_lophoc(db, sinhvien_id, lophoc_id)
+        update_data = diem_update.model_dump(exclude_unset=True)
+        if not update_data:
+            return DiemService.get_by_sinhvien_lophoc(db, sinhvien_id, lophoc_id)
+        
+        db_diem = db.execute(
+            update(models.Diem)
+            .where(models.Diem.sinhvien_id == sinhvien_id, models.Diem.lophoc_id == lophoc_id)
+            .values(**update_data)
+            .returning(models.Diem)
+        ).scalar()
+        if db_diem is None:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Không tìm thấy điểm của sinh viên {sinhvien_id} trong lớp học {lophoc_id}"
+            )
         
-        update_data = diem_update.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_diem, key, value)
-            
+        TongHopHocTapService.refresh(db, [sinhvien_id])
         db.commit()
-        db.refresh(db_diem)
         return db_diem
     
     @staticmethod
@@ -501,15 +614,26 @@ class DiemService:
         db_diem = DiemService.get_by_id(db, diem_id)
         
         db.delete(db_diem)
+        TongHopHocTapService.refresh(db, [db_diem.sinhvien_id])
         db.commit()
         
         return {"detail": f"Điểm với ID {diem_id} đã bị xóa"}
     
     @staticmethod
     def delete_by_sinhvien_lophoc(db: Session, sinhvien_id: int, lophoc_id: int):
-        db_diem = DiemService.get_by_sinhvien_lophoc(db, sinhvien_id, lophoc_id)
+        deleted_id = db.execute(
+            delete(models.Diem)
+            .where(models.Diem.sinhvien_id == sinhvien_id, models.Diem.lophoc_id == lophoc_id)
+            .returning(models.Diem.id)
+        ).scalar()
+        if deleted_id is None:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Không tìm thấy điểm của sinh viên {sinhvien_id} trong lớp học {lophoc_id}"
+            )
         
-        db.delete(db_diem)
+        TongHopHocTapService.refresh(db, [sinhvien_id])
         db.commit()
         
         return {"detail": f"Điểm của sinh viên {sinhvien_id} trong lớp học {lophoc_id} đã bị xóa"}
@@ -518,10 +642,11 @@ from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 from typing import List, Optional
 from datetime import date
-import bcrypt
 
 from ..models import models
 from ..schemas import schemas
+from .loading import loader_options
+from .pagination import paginate
 
 class VienService:
     @staticmethod
@@ -536,17 +661,20 @@ class VienService:
 
     @staticmethod
     def get_vien_by_ma_vien(db: Session, ma_vien: str) -> models.Vien:
+        data = VIEN_CACHE.lookup_code(ma_vien)
+        if data is not None:
+            return VIEN_CACHE.attach(db, data)
         vien = db.query(models.Vien).filter(models.Vien.ma_vien == ma_vien).first()
         if vien is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Viện với mã {ma_vien} không tồn tại"
             )
-        return vien
+        return VIEN_CACHE.store(vien)
 
     @staticmethod
-    def get_viens(db: Session, skip: int = 0, limit: int = 100) -> List[models.Vien]:
-        return db.query(models.Vien).offset(skip).limit(limit).all()
+    def get_viens(db: Session, skip: int = 0, limit: int = 100, after: Optional[int] = None) -> List[models.Vien]:
+        return paginate(db.query(models.Vien), models.Vien.id, skip, limit, after)
 
     @staticmethod
     def create_vien(db: Session, vien: schemas.VienCreate) -> models.Vien:
@@ -572,12 +700,13 @@ class VienService:
     def update_vien(db: Session, vien_id: int, vien: schemas.VienUpdate) -> models.Vien:
         db_vien = VienService.get_vien(db, vien_id)
         
-        vien_data = vien.dict(exclude_unset=True)
+        vien_data = vien.model_dump(exclude_unset=True)
         for key, value in vien_data.items():
             setattr(db_vien, key, value)
             
         try:
             db.commit()
+            VIEN_CACHE.invalidate(vien_id)
             db.refresh(db_vien)
             return db_vien
         except IntegrityError:
@@ -602,11 +731,14 @@ class VienService:
         
         db.delete(db_vien)
         db.commit()
+        VIEN_CACHE.invalidate(vien_id)
         return db_vien
 
     @staticmethod
     def get_vien_detail(db: Session, vien_id: int) -> models.Vien:
-        vien = db.query(models.Vien).filter(models.Vien.id == vien_id).first()
+        vien = db.query(models.Vien).options(
+            *loader_options(models.Vien, schemas.VienDetail)
+        ).filter(models.Vien.id == vien_id).first()
         if vien is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -627,8 +759,8 @@ class TiendohoctapService:
         return tiendohoctap
 
     @staticmethod
-    def get_tiendohoctaps(db: Session, skip: int = 0, limit: int = 100) -> List[models.TienDoHocTap]:
-        return db.query(models.TienDoHocTap).offset(skip).limit(limit).all()
+    def get_tiendohoctaps(db: Session, skip: int = 0, limit: int = 100, after: Optional[int] = None) -> List[models.TienDoHocTap]:
+        return paginate(db.query(models.TienDoHocTap), models.TienDoHocTap.id, skip, limit, after)
 
     @staticmethod
     def get_tiendohoctaps_by_sinhvien(db: Session, sinhvien_id: int) -> List[models.TienDoHocTap]:
@@ -684,6 +816,7 @@ class TiendohoctapService:
                 xu_ly_hoc_tap=tiendohoctap.xu_ly_hoc_tap
             )
             db.add(db_tiendohoctap)
+            TongHopHocTapService.refresh(db, [tiendohoctap.sinhvien_id])
             db.commit()
             db.refresh(db_tiendohoctap)
             return db_tiendohoctap
@@ -698,11 +831,12 @@ class TiendohoctapService:
     def update_tiendohoctap(db: Session, tiendohoctap_id: int, tiendohoctap: schemas.TienDoHocTapUpdate) -> models.TienDoHocTap:
         db_tiendohoctap = TiendohoctapService.get_tiendohoctap(db, tiendohoctap_id)
         
-        tiendohoctap_data = tiendohoctap.dict(exclude_unset=True)
+        tiendohoctap_data = tiendohoctap.model_dump(exclude_unset=True)
         for key, value in tiendohoctap_data.items():
             setattr(db_tiendohoctap, key, value)
             
         try:
+            TongHopHocTapService.refresh(db, [db_tiendohoctap.sinhvien_id])
             db.commit()
             db.refresh(db_tiendohoctap)
             return db_tiendohoctap
@@ -717,15 +851,108 @@ class TiendohoctapService:
     def delete_tiendohoctap(db: Session, tiendohoctap_id: int) -> models.TienDoHocTap:
         db_tiendohoctap = TiendohoctapService.get_tiendohoctap(db, tiendohoctap_id)
         db.delete(db_tiendohoctap)
+        TongHopHocTapService.refresh(db, [db_tiendohoctap.sinhvien_id])
         db.commit()
         return db_tiendohoctap
 
     @staticmethod
     def get_tiendohoctap_detail(db: Session, tiendohoctap_id: int) -> models.TienDoHocTap:
-        tiendohoctap = db.query(models.TienDoHocTap).filter(models.TienDoHocTap.id == tiendohoctap_id).first()
+        tiendohoctap = db.query(models.TienDoHocTap).options(
+            *loader_options(models.TienDoHocTap, schemas.TienDoHocTapDetail)
+        ).filter(models.TienDoHocTap.id == tiendohoctap_id).first()
         if tiendohoctap is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Tiến độ học tập với ID {tiendohoctap_id} không tồn tại"
             )
-        return tiendohoctap
\ No newline at end of file
+        return tiendohoctap
+
+
+class TongHopHocTapService:
+    # Keeps IN lists well below the bind-parameter limits of SQLite and PostgreSQL.
+    CHUNK = 1000
+
+    @staticmethod
+    def refresh(db: Session, sinhvien_ids: Iterable[int]):
+        """
+        Recomputes the summary rows of the given students from their diem and
+        tiendohoctap rows. Runs inside the caller's transaction and does not commit;
+        the students' rows stay locked until it ends.
+        """
+        sinhvien_ids = sorted(set(sinhvien_ids))
+        if not sinhvien_ids:
+            return
+        db.flush()
+
+        for start in range(0, len(sinhvien_ids), TongHopHocTapService.CHUNK):
+            chunk = sinhvien_ids[start:start + TongHopHocTapService.CHUNK]
+            # Serialises concurrent refreshes of a student, so the last one to commit has read
+            # every committed write. NO KEY UPDATE does not conflict with the KEY SHARE locks the
+            # foreign keys of diem/tiendohoctap inserts take; SQLite ignores the clause.
+            db.query(models.SinhVien.id).filter(models.SinhVien.id.in_(chunk)).order_by(
+                models.SinhVien.id
+            ).with_for_update(key_share=True).all()
+            diem = {
+                row.sinhvien_id: row
+                for row in db.query(
+                    models.Diem.sinhvien_id,
+                    func.count(models.Diem.diem_tong_ket).label("so_lop"),
+                    func.avg(models.Diem.diem_tong_ket).label("trung_binh")
+                ).filter(models.Diem.sinhvien_id.in_(chunk)).group_by(models.Diem.sinhvien_id)
+            }
+            lich_su = defaultdict(list)
+            tiendo = models.TienDoHocTap
+            for row in db.query(
+                tiendo.sinhvien_id, tiendo.hoc_ky, tiendo.nam_hoc, tiendo.tin_chi_dang_ky, tiendo.diem_trung_binh_hk,
+                tiendo.tong_tin_chi_tich_luy, tiendo.diem_trung_binh_tich_luy, tiendo.xu_ly_hoc_tap
+            ).filter(tiendo.sinhvien_id.in_(chunk)).order_by(tiendo.sinhvien_id, tiendo.nam_hoc, tiendo.hoc_ky):
+                lich_su[row.sinhvien_id].append({
+                    "hoc_ky": row.hoc_ky,
+                    "nam_hoc": row.nam_hoc,
+                    "tin_chi_dang_ky": row.tin_chi_dang_ky,
+                    "diem_trung_binh_hk": row.diem_trung_binh_hk,
+                    "tong_tin_chi_tich_luy": row.tong_tin_chi_tich_luy,
+                    "diem_trung_binh_tich_luy": row.diem_trung_binh_tich_luy,
+                    "xu_ly_hoc_tap": row.xu_ly_hoc_tap
+                })
+
+            now = datetime.utcnow()
+            rows = []
+            for sinhvien_id in chunk:
+                hoc_kys = lich_su.get(sinhvien_id, [])
+                latest = hoc_kys[-1] if hoc_kys else {}
+                aggregates = diem.get(sinhvien_id)
+                rows.append({
+                    "sinhvien_id": sinhvien_id,
+                    "so_hoc_ky": len(hoc_kys),
+                    "hoc_ky_gan_nhat": latest.get("hoc_ky"),
+                    "nam_hoc_gan_nhat": latest.get("nam_hoc"),
+                    "tong_tin_chi_tich_luy": latest.get("tong_tin_chi_tich_luy"),
+                    "diem_trung_binh_tich_luy": latest.get("diem_trung_binh_tich_luy"),
+                    "xu_ly_hoc_tap": latest.get("xu_ly_hoc_tap"),
+                    "so_lop_co_diem": aggregates.so_lop if aggregates else 0,
+                    "diem_tong_ket_trung_binh": float(aggregates.trung_binh) if aggregates and aggregates.trung_binh is not None else None,
+                    "lich_su": hoc_kys,
+                    "cap_nhat_luc": now
+                })
+
+            stmt = dialect_insert(db, models.TongHopHocTap)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["sinhvien_id"],
+                set_={column: stmt.excluded[column] for column in rows[0] if column != "sinhvien_id"}
+            )
+            db.execute(stmt, rows)
+
+    @staticmethod
+    def get_by_sinhvien(db: Session, sinhvien_id: int) -> models.TongHopHocTap:
+        """
+        Read-repair: a student without a summary row (created after the m0002 backfill and
+        not written to since) gets one computed and committed here, so this read may write.
+        """
+        tong_hop = db.get(models.TongHopHocTap, sinhvien_id)
+        if tong_hop is None:
+            SinhVienService.ensure_exists(db, sinhvien_id)
+            TongHopHocTapService.refresh(db, [sinhvien_id])
+            db.commit()
+            tong_hop = db.get(models.TongHopHocTap, sinhvien_id)
+        return tong_hop
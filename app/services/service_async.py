@@ -0,0 +1,209 @@
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from ..models import models
+from ..schemas import schemas
+from .loading import loader_options
+from .pagination import keyset
+from .service import HOCPHAN_CACHE, LOPHOC_CACHE, VIEN_CACHE
+
+# Async counterparts of the lookups in service.py, used by the read endpoints when
+# DB_ASYNC is enabled. Relationships cannot be lazy-loaded on an AsyncSession, so
+# detail lookups rely on the loading plan of their response schema.
+
+async def _first(db: AsyncSession, statement):
+    return (await db.scalars(statement.limit(1))).first()
+
+async def _all(db: AsyncSession, statement) -> List:
+    return (await db.scalars(statement)).all()
+
+def _not_found(detail: str):
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=detail
+    )
+
+class SinhVienService:
+    @staticmethod
+    async def get_all(db: AsyncSession, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return await _all(db, keyset(select(models.SinhVien), models.SinhVien.id, skip, limit, after))
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, sinh_vien_id: int):
+        db_sinh_vien = await db.get(models.SinhVien, sinh_vien_id)
+        if db_sinh_vien is None:
+            raise _not_found(f"Không tìm thấy sinh viên với ID: {sinh_vien_id}")
+        return db_sinh_vien
+
+    @staticmethod
+    async def get_by_ma_sv(db: AsyncSession, ma_sv: str):
+        return await _first(db, select(models.SinhVien).where(models.SinhVien.ma_sv == ma_sv))
+
+class GiangVienService:
+    @staticmethod
+    async def get_all(db: AsyncSession, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return await _all(db, keyset(select(models.GiangVien), models.GiangVien.id, skip, limit, after))
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, giang_vien_id: int):
+        db_giang_vien = await db.get(models.GiangVien, giang_vien_id)
+        if db_giang_vien is None:
+            raise _not_found(f"Không tìm thấy giảng viên với ID: {giang_vien_id}")
+        return db_giang_vien
+
+    @staticmethod
+    async def get_by_ma_gv(db: AsyncSession, ma_gv: str):
+        return await _first(db, select(models.GiangVien).where(models.GiangVien.ma_gv == ma_gv))
+
+class HocPhanService:
+    @staticmethod
+    async def get_all(db: AsyncSession, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return await _all(db, keyset(select(models.HocPhan), models.HocPhan.id, skip, limit, after))
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, hoc_phan_id: int):
+        db_hoc_phan = await db.get(models.HocPhan, hoc_phan_id)
+        if db_hoc_phan is None:
+            raise _not_found(f"Không tìm thấy học phần với ID: {hoc_phan_id}")
+        return db_hoc_phan
+
+    @staticmethod
+    async def get_by_ma_hp(db: AsyncSession, ma_hp: str):
+        data = HOCPHAN_CACHE.lookup_code(ma_hp)
+        if data is not None:
+            return await db.merge(HOCPHAN_CACHE.detached(data), load=False)
+        db_hoc_phan = await _first(db, select(models.HocPhan).where(models.HocPhan.ma_hp == ma_hp))
+        if db_hoc_phan is not None:
+            HOCPHAN_CACHE.store(db_hoc_phan)
+        return db_hoc_phan
+
+class LopHocService:
+    @staticmethod
+    async def get_all(db: AsyncSession, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return await _all(db, keyset(select(models.LopHoc), models.LopHoc.id, skip, limit, after))
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, lop_hoc_id: int):
+        db_lop_hoc = await db.get(models.LopHoc, lop_hoc_id)
+        if db_lop_hoc is None:
+            raise _not_found(f"Không tìm thấy lớp học với ID: {lop_hoc_id}")
+        return db_lop_hoc
+
+    @staticmethod
+    async def get_detail_by_id(db: AsyncSession, lop_hoc_id: int):
+        db_lop_hoc = await _first(db, select(models.LopHoc).options(
+            *loader_options(models.LopHoc, schemas.LopHocDetail)
+        ).where(models.LopHoc.id == lop_hoc_id))
+        if db_lop_hoc is None:
+            raise _not_found(f"Không tìm thấy lớp học với ID: {lop_hoc_id}")
+        return db_lop_hoc
+
+    @staticmethod
+    async def get_by_ma_lop(db: AsyncSession, ma_lop: str):
+        data = LOPHOC_CACHE.lookup_code(ma_lop)
+        if data is not None:
+            return await db.merge(LOPHOC_CACHE.detached(data), load=False)
+        db_lop_hoc = await _first(db, select(models.LopHoc).where(models.LopHoc.ma_lop == ma_lop))
+        if db_lop_hoc is not None:
+            LOPHOC_CACHE.store(db_lop_hoc)
+        return db_lop_hoc
+
+    @staticmethod
+    async def get_by_giangvien(db: AsyncSession, giangvien_id: int):
+        return await _all(db, select(models.LopHoc).where(models.LopHoc.giangvien_id == giangvien_id))
+
+    @staticmethod
+    async def get_by_hocphan(db: AsyncSession, hocphan_id: int):
+        return await _all(db, select(models.LopHoc).where(models.LopHoc.hocphan_id == hocphan_id))
+
+class DiemService:
+    @staticmethod
+    async def get_all(db: AsyncSession, skip: int = 0, limit: int = 100, after: Optional[int] = None):
+        return await _all(db, keyset(select(models.Diem), models.Diem.id, skip, limit, after))
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, diem_id: int):
+        db_diem = await db.get(models.Diem, diem_id)
+        if db_diem is None:
+            raise _not_found(f"Không tìm thấy điểm với ID: {diem_id}")
+        return db_diem
+
+    @staticmethod
+    async def get_detail_by_id(db: AsyncSession, diem_id: int):
+        db_diem = await _first(db, select(models.Diem).options(
+            *loader_options(models.Diem, schemas.DiemDetail)
+        ).where(models.Diem.id == diem_id))
+        if db_diem is None:
+            raise _not_found(f"Không tìm thấy điểm với ID: {diem_id}")
+        return db_diem
+
+    @staticmethod
+    async def get_by_sinhvien(db: AsyncSession, sinhvien_id: int):
+        return await _all(db, select(models.Diem).where(models.Diem.sinhvien_id == sinhvien_id))
+
+    @staticmethod
+    async def get_by_lophoc(db: AsyncSession, lophoc_id: int):
+        return await _all(db, select(models.Diem).where(models.Diem.lophoc_id == lophoc_id))
+
+    @staticmethod
+    async def get_by_sinhvien_lophoc(db: AsyncSession, sinhvien_id: int, lophoc_id: int):
+        db_diem = await _first(db, select(models.Diem).where(
+            models.Diem.sinhvien_id == sinhvien_id,
+            models.Diem.lophoc_id == lophoc_id
+        ))
+        if db_diem is None:
+            raise _not_found(f"Không tìm thấy điểm của sinh viên {sinhvien_id} trong lớp học {lophoc_id}")
+        return db_diem
+
+class VienService:
+    @staticmethod
+    async def get_vien_by_ma_vien(db: AsyncSession, ma_vien: str) -> models.Vien:
+        data = VIEN_CACHE.lookup_code(ma_vien)
+        if data is not None:
+            return await db.merge(VIEN_CACHE.detached(data), load=False)
+        vien = await _first(db, select(models.Vien).where(models.Vien.ma_vien == ma_vien))
+        if vien is None:
+            raise _not_found(f"Viện với mã {ma_vien} không tồn tại")
+        return VIEN_CACHE.store(vien)
+
+    @staticmethod
+    async def get_viens(db: AsyncSession, skip: int = 0, limit: int = 100, after: Optional[int] = None) -> List[models.Vien]:
+        return await _all(db, keyset(select(models.Vien), models.Vien.id, skip, limit, after))
+
+    @staticmethod
+    async def get_vien_detail(db: AsyncSession, vien_id: int) -> models.Vien:
+        vien = await _first(db, select(models.Vien).options(
+            *loader_options(models.Vien, schemas.VienDetail)
+        ).where(models.Vien.id == vien_id))
+        if vien is None:
+            raise _not_found(f"Viện với ID {vien_id} không tồn tại")
+        return vien
+
+class TiendohoctapService:
+    @staticmethod
+    async def get_tiendohoctap(db: AsyncSession, tiendohoctap_id: int) -> models.TienDoHocTap:
+        tiendohoctap = await db.get(models.TienDoHocTap, tiendohoctap_id)
+        if tiendohoctap is None:
+            raise _not_found(f"Tiến độ học tập với ID {tiendohoctap_id} không tồn tại")
+        return tiendohoctap
+
+    @staticmethod
+    async def get_tiendohoctaps(
+        db: AsyncSession, skip: int = 0, limit: int = 100, after: Optional[int] = None
+    ) -> List[models.TienDoHocTap]:
+        return await _all(db, keyset(select(models.TienDoHocTap), models.TienDoHocTap.id, skip, limit, after))
+
+    @staticmethod
+    async def get_tiendohoctaps_by_sinhvien(db: AsyncSession, sinhvien_id: int) -> List[models.TienDoHocTap]:
+        return await _all(db, select(models.TienDoHocTap).where(models.TienDoHocTap.sinhvien_id == sinhvien_id))
+
+    @staticmethod
+    async def get_tiendohoctap_detail(db: AsyncSession, tiendohoctap_id: int) -> models.TienDoHocTap:
+        tiendohoctap = await _first(db, select(models.TienDoHocTap).options(
+            *loader_options(models.TienDoHocTap, schemas.TienDoHocTapDetail)
+        ).where(models.TienDoHocTap.id == tiendohoctap_id))
+        if tiendohoctap is None:
+            raise _not_found(f"Tiến độ học tập với ID {tiendohoctap_id} không tồn tại")
+        return tiendohoctap
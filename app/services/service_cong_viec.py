@@ -0,0 +1,160 @@
+import logging
+import math
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, insert, or_, update
+from sqlalchemy.orm import Session, defer
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models import models
+from .pagination import paginate
+from .service_learning_result import LearningResultsService
+
+CHO_XU_LY = "cho_xu_ly"
+DANG_XU_LY = "dang_xu_ly"
+HOAN_THANH = "hoan_thanh"
+THAT_BAI = "that_bai"
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.JOB_WORKERS, thread_name_prefix="cong-viec")
+    return _executor
+
+def shutdown_executor():
+    # Unfinished jobs stay in the database and are picked up again on the next start.
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+class CongViecService:
+    @staticmethod
+    def submit(db: Session, students: List[Dict]) -> models.CongViecXuLy:
+        db_cong_viec = models.CongViecXuLy(
+            id=uuid.uuid4().hex,
+            trang_thai=CHO_XU_LY,
+            tong_so=len(students),
+            da_xu_ly=0,
+            du_lieu=students
+        )
+        db.add(db_cong_viec)
+        db.commit()
+        db.refresh(db_cong_viec)
+
+        get_executor().submit(CongViecService.run, db_cong_viec.id)
+        return db_cong_viec
+
+    @staticmethod
+    def get_by_id(db: Session, cong_viec_id: str) -> models.CongViecXuLy:
+        # The submitted batch is only read by run(); status polls and result pages skip it.
+        db_cong_viec = db.query(models.CongViecXuLy).options(defer(models.CongViecXuLy.du_lieu)).filter(
+            models.CongViecXuLy.id == cong_viec_id
+        ).first()
+        if db_cong_viec is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Không tìm thấy công việc với ID: {cong_viec_id}"
+            )
+        return db_cong_viec
+
+    @staticmethod
+    def get_results(
+        db: Session, cong_viec_id: str, skip: int = 0, limit: int = 1000, after: Optional[int] = None
+    ) -> List[models.KetQuaCongViec]:
+        CongViecService.get_by_id(db, cong_viec_id)
+        query = db.query(models.KetQuaCongViec.thu_tu, models.KetQuaCongViec.du_lieu).filter(
+            models.KetQuaCongViec.cong_viec_id == cong_viec_id
+        )
+        return paginate(query, models.KetQuaCongViec.thu_tu, skip, limit, after)
+
+    @staticmethod
+    def _claimable():
+        stale_before = datetime.utcnow() - timedelta(seconds=settings.JOB_STALE_SECONDS)
+        return or_(
+            models.CongViecXuLy.trang_thai == CHO_XU_LY,
+            and_(
+                models.CongViecXuLy.trang_thai == DANG_XU_LY,
+                models.CongViecXuLy.cap_nhat_luc < stale_before
+            )
+        )
+
+    @staticmethod
+    def _claim(db: Session, cong_viec_id: str) -> bool:
+        # Conditional update, so only one worker process runs a job even if several resume it.
+        result = db.execute(
+            update(models.CongViecXuLy)
+            .where(models.CongViecXuLy.id == cong_viec_id, CongViecService._claimable())
+            .values(trang_thai=DANG_XU_LY, cap_nhat_luc=datetime.utcnow())
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def run(cong_viec_id: str):
+        db = SessionLocal()
+        try:
+            if not CongViecService._claim(db, cong_viec_id):
+                return
+
+            db_cong_viec = CongViecService.get_by_id(db, cong_viec_id)
+            # A resumed job starts over, so results of an interrupted run are dropped first.
+            db.query(models.KetQuaCongViec).filter(
+                models.KetQuaCongViec.cong_viec_id == cong_viec_id
+            ).delete()
+            db_cong_viec.da_xu_ly = 0
+            db.commit()
+
+            students = db_cong_viec.du_lieu or []
+            shard_count = max(1, math.ceil(len(students) / settings.JOB_CHUNK_ROWS))
+            position = 0
+            for shard in LearningResultsService.shard_by_student(students, shard_count):
+                processed = LearningResultsService.process_academic_performance_vectorized(shard)
+                if processed:
+                    db.execute(insert(models.KetQuaCongViec), [
+                        {"cong_viec_id": cong_viec_id, "thu_tu": position + offset, "du_lieu": record}
+                        for offset, record in enumerate(processed)
+                    ])
+                position += len(processed)
+                db_cong_viec.da_xu_ly = position
+                db_cong_viec.cap_nhat_luc = datetime.utcnow()
+                db.commit()
+
+            db_cong_viec.trang_thai = HOAN_THANH
+            db_cong_viec.du_lieu = None
+            db_cong_viec.cap_nhat_luc = datetime.utcnow()
+            db.commit()
+        except Exception as e:
+            logger.exception("Công việc %s thất bại", cong_viec_id)
+            db.rollback()
+            db.query(models.CongViecXuLy).filter(models.CongViecXuLy.id == cong_viec_id).update({
+                models.CongViecXuLy.trang_thai: THAT_BAI,
+                models.CongViecXuLy.loi: str(e),
+                models.CongViecXuLy.cap_nhat_luc: datetime.utcnow()
+            })
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def resume_unfinished():
+        db = SessionLocal()
+        try:
+            rows = db.query(models.CongViecXuLy.id).filter(
+                CongViecService._claimable()
+            ).order_by(models.CongViecXuLy.tao_luc).all()
+        finally:
+            db.close()
+
+        for row in rows:
+            get_executor().submit(CongViecService.run, row.id)
@@ -0,0 +1,183 @@
+"""
+Registrar Excel export to one CSV sorted by student and semester.
+
+Every sheet is read in its own worker process and written as a sorted run; the runs
+are then merged k-way, so only one sheet per worker is ever held in memory. The
+command line lives in scripts/excel_ingest.py.
+"""
+import csv
+import heapq
+import importlib.util
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+DEFAULT_COLUMNS = [
+    'ID', 'Nganh', 'Gioi tinh', 'Doi tuong', 'Khu vuc',
+    'Khoi TS', 'Diem TS', 'Hoc Ky', 'DKHK', 'TBHK',
+    'TCTL', 'TBTL', 'XLHV', 'Diem TN', 'KET QUA'
+]
+DEFAULT_SORT_KEYS = ['ID', 'Hoc Ky']
+
+# Positional names for the sheet columns, or sheet header -> output name.
+ColumnMapping = Union[Sequence[str], Mapping[str, str]]
+
+def reader_engine() -> Optional[str]:
+    """calamine (Rust) when installed, otherwise pandas' default openpyxl reader."""
+    return "calamine" if importlib.util.find_spec("python_calamine") is not None else None
+
+class ExcelIngestService:
+    @staticmethod
+    def apply_columns(frame: pd.DataFrame, columns: ColumnMapping, sheet: str) -> pd.DataFrame:
+        if isinstance(columns, Mapping):
+            missing = [name for name in columns if name not in frame.columns]
+            if missing:
+                raise ValueError(f"Sheet {sheet} thiếu cột: {', '.join(missing)}")
+            return frame[list(columns)].rename(columns=dict(columns))
+        if len(frame.columns) != len(columns):
+            raise ValueError(f"Sheet {sheet} có {len(frame.columns)} cột, cần {len(columns)}")
+        frame.columns = list(columns)
+        return frame
+
+    @staticmethod
+    def sort_key_kinds(frame: pd.DataFrame, sort_keys: Sequence[str]) -> List[str]:
+        return [
+            "number" if pd.api.types.is_numeric_dtype(frame[key]) and not pd.api.types.is_bool_dtype(frame[key])
+            else "text"
+            for key in sort_keys
+        ]
+
+    @staticmethod
+    def read_key_kinds(
+        path: str,
+        sheet: str,
+        columns: ColumnMapping,
+        sort_keys: Sequence[str],
+        engine: Optional[str] = None
+    ) -> List[str]:
+        """Worker: reads only the sort-key columns of one sheet and reports how they compare."""
+        if isinstance(columns, Mapping):
+            source = {target: name for name, target in columns.items()}
+            frame = pd.read_excel(path, sheet_name=sheet, header=0, usecols=[source[key] for key in sort_keys], engine=engine)
+            frame = frame.rename(columns=dict(columns))
+        else:
+            indexes = sorted({list(columns).index(key) for key in sort_keys})
+            frame = pd.read_excel(path, sheet_name=sheet, header=0, usecols=indexes, engine=engine)
+            frame.columns = [columns[index] for index in indexes]
+        return ExcelIngestService.sort_key_kinds(frame, sort_keys)
+
+    @staticmethod
+    def sort_frame(frame: pd.DataFrame, sort_keys: Sequence[str], kinds: Sequence[str]) -> pd.DataFrame:
+        """Orders the rows exactly as merge_runs compares them: text keys by their CSV text, blanks last."""
+        text_keys = {key for key, kind in zip(sort_keys, kinds) if kind == "text"}
+
+        def as_compared(column: pd.Series) -> pd.Series:
+            if column.name not in text_keys:
+                return column
+            text = column.astype(str).where(column.notna())
+            return text.where(text != "")
+
+        return frame.sort_values(by=list(sort_keys), key=as_compared, kind="stable", na_position="last")
+
+    @staticmethod
+    def write_sorted_run(
+        path: str,
+        sheet: str,
+        columns: ColumnMapping,
+        sort_keys: Sequence[str],
+        kinds: Sequence[str],
+        run_path: str,
+        engine: Optional[str] = None
+    ) -> Tuple[str, int]:
+        """Worker: reads one sheet, sorts it by the kinds shared by all sheets and writes it as a headerless CSV run."""
+        frame = pd.read_excel(path, sheet_name=sheet, header=0, engine=engine)
+        frame = ExcelIngestService.apply_columns(frame, columns, sheet)
+        frame = ExcelIngestService.sort_frame(frame, sort_keys, kinds)
+        frame.to_csv(run_path, index=False, header=False, encoding="utf-8")
+        return run_path, len(frame)
+
+    @staticmethod
+    def read_run(run_path: str, key_indexes: Sequence[int], kinds: Sequence[str]) -> Iterator[Tuple[Tuple, List[str]]]:
+        def key_part(value: str, kind: str):
+            # Missing keys sort last, as in the per-sheet sort_values(na_position="last").
+            if value == "":
+                return (1, 0)
+            return (0, float(value) if kind == "number" else value)
+
+        with open(run_path, newline="", encoding="utf-8") as f:
+            for row in csv.reader(f):
+                yield tuple(key_part(row[index], kind) for index, kind in zip(key_indexes, kinds)), row
+
+    @staticmethod
+    def merge_runs(
+        runs: Sequence[str],
+        kinds: Sequence[str],
+        header: Sequence[str],
+        sort_keys: Sequence[str],
+        output: str
+    ) -> int:
+        key_indexes = [list(header).index(key) for key in sort_keys]
+        streams = [ExcelIngestService.read_run(run, key_indexes, kinds) for run in runs]
+        count = 0
+        with open(output, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for _, row in heapq.merge(*streams, key=lambda item: item[0]):
+                writer.writerow(row)
+                count += 1
+        return count
+
+    @staticmethod
+    def ingest(
+        path: str,
+        sheets: Optional[Sequence[str]] = None,
+        output: str = "raw_data.csv",
+        columns: ColumnMapping = DEFAULT_COLUMNS,
+        sort_keys: Sequence[str] = DEFAULT_SORT_KEYS,
+        workers: int = 0,
+        engine: Optional[str] = None
+    ) -> Dict:
+        if sheets is None:
+            sheets = pd.ExcelFile(path, engine=engine).sheet_names
+        header = list(columns.values()) if isinstance(columns, Mapping) else list(columns)
+        missing = [key for key in sort_keys if key not in header]
+        if missing:
+            raise ValueError(f"Cột sắp xếp không có trong dữ liệu: {', '.join(missing)}")
+        workers = min(len(sheets), workers or os.cpu_count() or 1)
+
+        started = time.perf_counter()
+        with tempfile.TemporaryDirectory(prefix="excel-ingest-") as run_dir:
+            run_paths = [os.path.join(run_dir, f"{index}.csv") for index in range(len(sheets))]
+            # spawn, like the learning-results pool, so this is also safe to call from the API process.
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                futures = [
+                    pool.submit(ExcelIngestService.read_key_kinds, path, sheet, columns, sort_keys, engine)
+                    for sheet in sheets
+                ]
+                sheet_kinds = [future.result() for future in futures]
+                # A key that is text in any sheet is compared as text in every run and in the merge.
+                kinds = [
+                    "number" if all(found[index] == "number" for found in sheet_kinds) else "text"
+                    for index in range(len(sort_keys))
+                ]
+                futures = [
+                    pool.submit(ExcelIngestService.write_sorted_run, path, sheet, columns, sort_keys, kinds, run_path, engine)
+                    for sheet, run_path in zip(sheets, run_paths)
+                ]
+                results = [future.result() for future in futures]
+            read_seconds = time.perf_counter() - started
+
+            count = ExcelIngestService.merge_runs(run_paths, kinds, header, sort_keys, output)
+
+        return {
+            "output": output,
+            "sheets": {sheet: result[1] for sheet, result in zip(sheets, results)},
+            "rows": count,
+            "read_seconds": round(read_seconds, 2),
+            "total_seconds": round(time.perf_counter() - started, 2),
+        }
@@ -1,48 +1,78 @@
-from typing import List, Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+import json
+import math
+import multiprocessing
+import os
+from typing import AsyncIterable, AsyncIterator, List, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import models
+from .warning_rules import get_rule_engine
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+STATE_QUERY_CHUNK = 1000
+SHARDS_PER_WORKER = 4
+
+NUMERIC_FIELDS = [
+    'registered_credits',
+    'semester_average',
+    'cumulative_average',
+    'accumulated_credits',
+]
+
+# Set by the engines on every processed record.
+RESULT_FIELDS = ('academic_processing', 'academic_processing_rule')
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+def process_pool_size() -> int:
+    return settings.LEARNING_RESULTS_WORKERS or os.cpu_count() or 1
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # spawn, not fork: the API process runs threads (uvicorn, the threadpool) that fork would copy mid-state
+        _process_pool = ProcessPoolExecutor(
+            max_workers=process_pool_size(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+def shutdown_process_pool():
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
 
 class LearningResultsService:
     @staticmethod
-    def calculate_credit_warning(current_record: Dict, previous_records: List[Dict]) -> Optional[str]:
-
+    def find_warning_rule(current_record: Dict) -> Tuple[str, str]:
+        """Returns the warning label and the code of the rule that fired, both empty when none fires."""
         try:
-            registered_credits = float(current_record['registered_credits'])
-            semester_average = float(current_record['semester_average'])
-            cumulative_average = float(current_record['cumulative_average'])
-            semester = int(current_record['semester'])
-            accumulated_credits = float(current_record['accumulated_credits'])
-            
-            current_year = (semester + 1) // 2
-            
-            condition_b = (registered_credits == 0 and semester > 1)
-            
-            if condition_b:
-                return 'Cảnh báo'
-            
-            condition_c = (
-                (semester == 1 and semester_average < 0.8) or  
-                (semester > 1 and semester_average < 1.0)      
+            rule_set = get_rule_engine().for_major(current_record.get('major'))
+            rule = rule_set.evaluate(
+                int(current_record['semester']),
+                float(current_record['registered_credits']),
+                float(current_record['semester_average']),
+                float(current_record['accumulated_credits']),
+                float(current_record['cumulative_average']),
             )
-            
-            if current_year == 1:
-                min_cumulative_avg = 1.2
-            elif current_year == 2:
-                min_cumulative_avg = 1.4
-            elif current_year == 3:
-                min_cumulative_avg = 1.6
-            else:
-                min_cumulative_avg = 1.8
-            
-            condition_d = (cumulative_average < min_cumulative_avg)
-            
-
-            condition_a = False
-            
-            if condition_a or condition_b or condition_c or condition_d:
-                return 'Cảnh báo'
-            
-            return None
         except (ValueError, KeyError):
-            return None
+            return "", ""
+        return (rule_set.label, rule) if rule else ("", "")
+
+    @staticmethod
+    def calculate_credit_warning(current_record: Dict, previous_records: List[Dict]) -> Optional[str]:
+
+        warning, _ = LearningResultsService.find_warning_rule(current_record)
+        return warning or None
 
     @staticmethod
     def process_academic_performance(students: List[Dict]) -> List[Dict]:
@@ -63,11 +93,273 @@ class LearningResultsService:
             for record in sorted_records:
                 processed_record = record.copy()
                 
-                warning = LearningResultsService.calculate_credit_warning(record, previous_records)
-                processed_record['academic_processing'] = warning if warning else ""
+                warning, rule = LearningResultsService.find_warning_rule(record)
+                processed_record['academic_processing'] = warning
+                processed_record['academic_processing_rule'] = rule
                 
                 processed_students.append(processed_record)
                 
                 previous_records.append(record)
         
-        return processed_students
\ No newline at end of file
+        return processed_students
+
+    @staticmethod
+    def _load_states(db: Session, student_ids: List[str]) -> Dict[str, models.TrangThaiXuLyHocTap]:
+        states = {}
+        for start in range(0, len(student_ids), STATE_QUERY_CHUNK):
+            chunk = student_ids[start:start + STATE_QUERY_CHUNK]
+            for state in db.query(models.TrangThaiXuLyHocTap).filter(
+                models.TrangThaiXuLyHocTap.ma_sv.in_(chunk)
+            ):
+                states[state.ma_sv] = state
+        return states
+
+    @staticmethod
+    def _input_fields(record: Dict) -> Dict:
+        return {field: value for field, value in record.items() if field not in RESULT_FIELDS}
+
+    @staticmethod
+    def process_academic_performance_incremental(db: Session, students: List[Dict]) -> List[Dict]:
+        """
+        Only processes semesters newer than the stored state of each student, plus a corrected
+        row for the last processed semester, and returns those records. Rows for older
+        semesters, or identical to the stored last record, are skipped.
+        """
+        student_records = {}
+        for student in students:
+            if student['id'] not in student_records:
+                student_records[student['id']] = []
+            student_records[student['id']].append(student)
+
+        states = LearningResultsService._load_states(db, list(student_records))
+
+        processed_students = []
+
+        for student_id, records in student_records.items():
+            state = states.get(student_id)
+            last_semester = state.hoc_ky_cuoi if state else 0
+            warning_count = (state.so_lan_canh_bao or 0) if state else 0
+            last_record = LearningResultsService._input_fields(state.ban_ghi_cuoi or {}) if state else None
+
+            def is_pending(record: Dict) -> bool:
+                semester = int(record['semester'])
+                return semester > last_semester or (
+                    semester == last_semester and LearningResultsService._input_fields(record) != last_record
+                )
+
+            new_records = sorted(filter(is_pending, records), key=lambda x: int(x['semester']))
+            if not new_records:
+                continue
+            if int(new_records[0]['semester']) == last_semester and state.xu_ly_hoc_tap:
+                # The corrected last semester replaces the stored one, warning included.
+                warning_count -= 1
+
+            for record in new_records:
+                processed_record = record.copy()
+
+                warning, rule = LearningResultsService.find_warning_rule(record)
+                processed_record['academic_processing'] = warning
+                processed_record['academic_processing_rule'] = rule
+                if warning:
+                    warning_count += 1
+
+                processed_students.append(processed_record)
+
+            if state is None:
+                state = models.TrangThaiXuLyHocTap(ma_sv=student_id)
+                db.add(state)
+            state.hoc_ky_cuoi = int(processed_record['semester'])
+            state.so_lan_canh_bao = warning_count
+            state.xu_ly_hoc_tap = processed_record['academic_processing']
+            state.ban_ghi_cuoi = processed_record
+
+        db.commit()
+
+        return processed_students
+
+    @staticmethod
+    def _parse_numeric(values) -> Tuple[np.ndarray, np.ndarray]:
+        """Parse a column once with float() semantics, returning the values and a mask of unparseable rows."""
+        try:
+            parsed = np.fromiter(map(float, values), dtype='float64', count=len(values))
+            return parsed, np.zeros(len(parsed), dtype=bool)
+        except (ValueError, TypeError):
+            pass
+
+        parsed = pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype='float64', copy=True)
+        # to_numeric rejects some strings float() accepts ('1_0', non-ASCII digits, 'nan'),
+        # so whatever it could not parse goes through float() itself.
+        invalid = np.isnan(parsed)
+        for index in np.flatnonzero(invalid).tolist():
+            try:
+                parsed[index] = float(values[index])
+            except (ValueError, TypeError):
+                continue
+            invalid[index] = False
+        return parsed, invalid
+
+    @staticmethod
+    def load_columns(students: List[Dict]) -> Dict[str, np.ndarray]:
+        """Load the fields the warning rules need into typed columns, parsing every value exactly once."""
+        semester = np.fromiter(
+            map(int, map(itemgetter('semester'), students)), dtype='int64', count=len(students)
+        )
+        columns = {'semester': semester, 'invalid': np.zeros(len(students), dtype=bool)}
+        for field in NUMERIC_FIELDS:
+            try:
+                raw = list(map(itemgetter(field), students))
+            except KeyError:
+                raw = [student.get(field) for student in students]
+            values, invalid = LearningResultsService._parse_numeric(raw)
+            columns[field] = values
+            columns['invalid'] |= invalid
+        columns['major'] = np.array([student.get('major') for student in students], dtype=object)
+        return columns
+
+    @staticmethod
+    def process_academic_performance_vectorized(students: List[Dict]) -> List[Dict]:
+
+        if not students:
+            return []
+
+        columns = LearningResultsService.load_columns(students)
+
+        # Students keep their first-seen order, semesters are sorted stably inside each student.
+        student_codes, _ = pd.factorize(np.array(list(map(itemgetter('id'), students)), dtype=object))
+        order = np.lexsort((columns['semester'], student_codes))
+
+        labels, rules = get_rule_engine().evaluate_columns(columns)
+
+        return [
+            {**students[index], 'academic_processing': labels[index], 'academic_processing_rule': rules[index]}
+            for index in order.tolist()
+        ]
+
+    @staticmethod
+    def read_arrow(body: bytes) -> pa.Table:
+        return pa.ipc.open_stream(body).read_all()
+
+    @staticmethod
+    def write_arrow(table: pa.Table) -> bytes:
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    @staticmethod
+    def _arrow_numeric(column: pa.ChunkedArray) -> Tuple[np.ndarray, np.ndarray]:
+        if pa.types.is_integer(column.type) or pa.types.is_floating(column.type):
+            values = column.cast(pa.float64()).to_numpy()
+            return values, column.is_null().to_numpy(zero_copy_only=False)
+        return LearningResultsService._parse_numeric(column.to_pylist())
+
+    @staticmethod
+    def process_academic_performance_columnar(table: pa.Table) -> pa.Table:
+        """
+        Same result as process_academic_performance_vectorized for a typed Arrow table;
+        numeric columns are read straight from the buffers and no per-row dicts are built.
+        """
+        semester = table.column('semester').cast(pa.int64()).to_numpy()
+        columns = {'semester': semester, 'invalid': np.zeros(table.num_rows, dtype=bool)}
+        for field in NUMERIC_FIELDS:
+            if field not in table.column_names:
+                columns[field] = np.full(table.num_rows, np.nan)
+                columns['invalid'][:] = True
+                continue
+            values, invalid = LearningResultsService._arrow_numeric(table.column(field))
+            columns[field] = values
+            columns['invalid'] |= invalid
+        if 'major' in table.column_names:
+            columns['major'] = table.column('major').to_numpy(zero_copy_only=False)
+
+        # dictionary_encode numbers the ids in first-seen order.
+        student_codes = table.column('id').combine_chunks().dictionary_encode().indices.to_numpy(zero_copy_only=False)
+        order = np.lexsort((semester, student_codes))
+
+        labels, rules = get_rule_engine().evaluate_columns(columns)
+
+        result = table
+        for name, values in (('academic_processing', labels), ('academic_processing_rule', rules)):
+            if name in result.column_names:
+                result = result.drop_columns([name])
+            result = result.append_column(name, pa.array(values, type=pa.string()))
+        return result.take(pa.array(order))
+
+    @staticmethod
+    def shard_by_student(students: List[Dict], shard_count: int) -> List[List[Dict]]:
+        """Split the batch into contiguous shards of whole students, in first-seen student order."""
+        student_records = {}
+        for student in students:
+            if student['id'] not in student_records:
+                student_records[student['id']] = []
+            student_records[student['id']].append(student)
+
+        target_size = math.ceil(len(students) / shard_count)
+        shards = [[]]
+        for records in student_records.values():
+            if len(shards[-1]) >= target_size:
+                shards.append([])
+            shards[-1].extend(records)
+        return shards
+
+    @staticmethod
+    def process_academic_performance_parallel(students: List[Dict]) -> List[Dict]:
+        """
+        Shards students across the process pool and merges shard results in submission order,
+        so the output matches the inline engines. Small batches, where IPC would dominate,
+        and single-worker configurations are processed inline.
+        """
+        if len(students) < settings.LEARNING_RESULTS_PARALLEL_MIN_ROWS or process_pool_size() < 2:
+            return LearningResultsService.process_academic_performance_vectorized(students)
+
+        pool = get_process_pool()
+        shards = LearningResultsService.shard_by_student(students, process_pool_size() * SHARDS_PER_WORKER)
+
+        processed_students = []
+        for processed_shard in pool.map(LearningResultsService.process_academic_performance_vectorized, shards):
+            processed_students.extend(processed_shard)
+        return processed_students
+
+    @staticmethod
+    def _parse_ndjson_line(line: bytes, line_number: int) -> List[Dict]:
+        try:
+            payload = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Dòng {line_number}: {e}")
+        return payload if isinstance(payload, list) else [payload]
+
+    @staticmethod
+    async def iter_ndjson_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[int, Dict]]:
+        """Parse an NDJSON body incrementally; a line may also hold a JSON array chunk of records."""
+        # Fragments of the unterminated last line; only each new chunk is split, so a
+        # line spanning many chunks is joined once instead of re-scanned per chunk.
+        pending = []
+        line_number = 0
+        async for chunk in chunks:
+            *lines, tail = chunk.split(b'\n')
+            if lines:
+                lines[0] = b''.join(pending + [lines[0]])
+                pending = []
+            for line in lines:
+                line_number += 1
+                if line.strip():
+                    for record in LearningResultsService._parse_ndjson_line(line, line_number):
+                        yield line_number, record
+            if tail:
+                pending.append(tail)
+        buffer = b''.join(pending)
+        if buffer.strip():
+            for record in LearningResultsService._parse_ndjson_line(buffer, line_number + 1):
+                yield line_number + 1, record
+
+    @staticmethod
+    async def iter_student_runs(records: AsyncIterable[Dict]) -> AsyncIterator[List[Dict]]:
+        """Group consecutive records of the same student; a run is complete once the id changes."""
+        run = []
+        async for record in records:
+            if run and record['id'] != run[-1]['id']:
+                yield run
+                run = []
+            run.append(record)
+        if run:
+            yield run
@@ -0,0 +1,295 @@
+"""
+Bulk load of the registrar export (the expected_cols layout of raw_data.csv) into
+sinhvien and tiendohoctap.
+
+The CSV is copied into a temporary staging table (COPY on PostgreSQL, batched
+inserts elsewhere) and merged with set-based statements in one transaction:
+
+    python -m app.services.service_registrar_import raw_data.csv --nam-nhap-truong 2021
+    python -m app.services.service_registrar_import Data.xlsx --sheets Data1 Data2
+"""
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+from itertools import islice
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import (
+    Column, Float, Integer, MetaData, Numeric, String, Table, Text,
+    and_, cast, delete, exists, func, insert, literal, literal_column, or_, select, text, update
+)
+from sqlalchemy.orm import Session
+
+from ..models import models
+from .service import SINHVIEN_CACHE, TongHopHocTapService, dialect_insert
+from .service_excel_ingest import DEFAULT_COLUMNS, ExcelIngestService, reader_engine
+
+# Staging column for each registrar column, in DEFAULT_COLUMNS order.
+STAGING_COLUMNS = [
+    "ma_sv", "nganh", "gioi_tinh", "doi_tuong", "khu_vuc",
+    "khoi_ts", "diem_ts", "hoc_ky", "dkhk", "tbhk",
+    "tctl", "tbtl", "xlhv", "diem_tn", "ket_qua"
+]
+BATCH_SIZE = 10000
+
+def _analyze(db: Session, *tables: Table):
+    """
+    Autovacuum never analyzes temporary tables, and the rows merged into the real
+    ones are invisible to it until commit; without statistics the joins below and
+    the summary refresh fall back to sequential scans.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text(f"ANALYZE {', '.join(table.name for table in tables)}"))
+
+_metadata = MetaData()
+# "dong" keeps file order, so the last row of a duplicated (ID, Hoc Ky) wins.
+STAGING = Table(
+    "dangky_tam", _metadata,
+    Column("dong", Integer, primary_key=True),
+    *(Column(name, Text) for name in STAGING_COLUMNS),
+    prefixes=["TEMPORARY"]
+)
+TIENDO_STAGING = Table(
+    "tiendo_tam", _metadata,
+    Column("sinhvien_id", Integer),
+    Column("hoc_ky", String),
+    Column("nam_hoc", String),
+    Column("tin_chi_dang_ky", Integer),
+    Column("diem_trung_binh_hk", Float),
+    Column("tong_tin_chi_tich_luy", Integer),
+    Column("diem_trung_binh_tich_luy", Float),
+    Column("xu_ly_hoc_tap", String),
+    prefixes=["TEMPORARY"]
+)
+
+def _text(column):
+    # A literal rather than a bind, so the GROUP BY matches the select list on PostgreSQL.
+    return func.nullif(func.trim(column), literal_column("''"))
+
+def _integer(column):
+    # Through NUMERIC so exports like "15.0" cast on PostgreSQL too.
+    return cast(cast(_text(column), Numeric), Integer)
+
+def _float(column):
+    return cast(_text(column), Float)
+
+class RegistrarImportService:
+    @staticmethod
+    def read_header(f) -> None:
+        header = next(csv.reader([f.readline()]), [])
+        if [name.strip() for name in header] != DEFAULT_COLUMNS:
+            raise ValueError(f"Tiêu đề CSV không đúng, cần: {', '.join(DEFAULT_COLUMNS)}")
+
+    @staticmethod
+    def copy_rows(db: Session, path: str) -> int:
+        """Loads the CSV into the staging table and returns the number of rows."""
+        connection = db.connection()
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            RegistrarImportService.read_header(f)
+            if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2":
+                with connection.connection.driver_connection.cursor() as cursor:
+                    cursor.copy_expert(
+                        f"COPY {STAGING.name} ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", f
+                    )
+            else:
+                reader = csv.reader(f)
+                while True:
+                    batch = [dict(zip(STAGING_COLUMNS, row)) for row in islice(reader, BATCH_SIZE)]
+                    if not batch:
+                        break
+                    connection.execute(insert(STAGING), batch)
+        return connection.execute(select(func.count()).select_from(STAGING)).scalar()
+
+    @staticmethod
+    def remove_duplicates(db: Session) -> int:
+        """Keeps the last row per student and semester, keyed like stage_progress reads them."""
+        latest = select(func.max(STAGING.c.dong)).group_by(_text(STAGING.c.ma_sv), _integer(STAGING.c.hoc_ky))
+        return db.execute(
+            delete(STAGING).where(STAGING.c.dong.not_in(latest.scalar_subquery()))
+        ).rowcount
+
+    @staticmethod
+    def upsert_students(db: Session, nam_nhap_truong: Optional[int]) -> Tuple[Dict, List[int]]:
+        """Returns the counts and the ids of the students that were inserted or changed."""
+        ma_sv = _text(STAGING.c.ma_sv)
+        students = select(ma_sv.label("ma_sv")).where(ma_sv.isnot(None)).distinct().subquery()
+        total, existing = db.execute(
+            select(
+                func.count(),
+                func.count().filter(exists().where(models.SinhVien.ma_sv == students.c.ma_sv))
+            ).select_from(students)
+        ).one()
+
+        source = select(
+            ma_sv,
+            func.max(_text(STAGING.c.nganh)),
+            func.max(_text(STAGING.c.gioi_tinh)),
+            literal(nam_nhap_truong, Integer)
+        ).where(ma_sv.isnot(None)).group_by(ma_sv)
+        stmt = dialect_insert(db, models.SinhVien).from_select(
+            ["ma_sv", "nganh", "gioi_tinh", "nam_nhap_truong"], source
+        )
+        sinhvien = models.SinhVien.__table__
+        set_ = {
+            "nganh": func.coalesce(stmt.excluded.nganh, sinhvien.c.nganh),
+            "gioi_tinh": func.coalesce(stmt.excluded.gioi_tinh, sinhvien.c.gioi_tinh),
+            "nam_nhap_truong": func.coalesce(sinhvien.c.nam_nhap_truong, stmt.excluded.nam_nhap_truong),
+        }
+        # Exports are cumulative; students that did not change are left alone.
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["ma_sv"],
+            set_=set_,
+            where=or_(*(sinhvien.c[name].is_distinct_from(value) for name, value in set_.items()))
+        ).returning(sinhvien.c.id)
+        ids = db.execute(stmt).scalars().all()
+        return {"sinh_vien_moi": total - existing, "sinh_vien_cap_nhat": len(ids) - (total - existing)}, ids
+
+    @staticmethod
+    def stage_progress(db: Session) -> int:
+        """
+        Semester k of the export becomes hoc_ky 1/2 of the school year
+        nam_nhap_truong + (k - 1) // 2, written like the rest of the data ("2021-2022").
+        """
+        semester = _integer(STAGING.c.hoc_ky)
+        year = models.SinhVien.nam_nhap_truong + (semester - 1) // 2
+        source = select(
+            models.SinhVien.id,
+            cast((semester - 1) % 2 + 1, String),
+            cast(year, String) + "-" + cast(year + 1, String),
+            _integer(STAGING.c.dkhk),
+            _float(STAGING.c.tbhk),
+            _integer(STAGING.c.tctl),
+            _float(STAGING.c.tbtl),
+            func.coalesce(func.trim(STAGING.c.xlhv), "")
+        ).join(models.SinhVien, models.SinhVien.ma_sv == _text(STAGING.c.ma_sv)).where(
+            models.SinhVien.nam_nhap_truong.isnot(None), semester >= 1
+        )
+        return db.execute(
+            insert(TIENDO_STAGING).from_select([column.name for column in TIENDO_STAGING.columns], source)
+        ).rowcount
+
+    @staticmethod
+    def merge_progress(db: Session) -> Tuple[Dict, Set[int]]:
+        """
+        tiendohoctap has no unique key on (sinhvien_id, hoc_ky, nam_hoc): changed rows
+        are updated and the rest inserted. Returns the counts and the students touched.
+        """
+        tiendo = models.TienDoHocTap.__table__
+        same_semester = and_(
+            tiendo.c.sinhvien_id == TIENDO_STAGING.c.sinhvien_id,
+            tiendo.c.hoc_ky == TIENDO_STAGING.c.hoc_ky,
+            tiendo.c.nam_hoc == TIENDO_STAGING.c.nam_hoc
+        )
+        values = [column.name for column in TIENDO_STAGING.columns]
+        changed = or_(*(tiendo.c[name].is_distinct_from(TIENDO_STAGING.c[name]) for name in values[3:]))
+        updated = db.execute(
+            update(tiendo).where(same_semester, changed).values(
+                {name: TIENDO_STAGING.c[name] for name in values[3:]}
+            ).returning(tiendo.c.sinhvien_id)
+        ).scalars().all()
+        inserted = db.execute(
+            insert(tiendo).from_select(
+                values, select(TIENDO_STAGING).where(~exists().where(same_semester))
+            ).returning(tiendo.c.sinhvien_id)
+        ).scalars().all()
+        return {"tien_do_moi": len(inserted), "tien_do_cap_nhat": len(updated)}, set(updated) | set(inserted)
+
+    @staticmethod
+    def import_csv(db: Session, path: str, nam_nhap_truong: Optional[int] = None) -> Dict:
+        """
+        Imports one registrar CSV in a single transaction. Rows of students without
+        nam_nhap_truong (new students when it is not given) cannot be placed in a
+        school year and are counted as skipped.
+        """
+        timings = {}
+        started = step = time.perf_counter()
+
+        def mark(name):
+            nonlocal step
+            now = time.perf_counter()
+            timings[name] = round(now - step, 2)
+            step = now
+
+        connection = db.connection()
+        try:
+            # pysqlite runs DDL outside the transaction, so a failed import can leave them behind.
+            for table in (STAGING, TIENDO_STAGING):
+                table.drop(connection, checkfirst=True)
+                table.create(connection)
+            so_dong = RegistrarImportService.copy_rows(db, path)
+            _analyze(db, STAGING)
+            mark("nap")
+            trung_lap = RegistrarImportService.remove_duplicates(db)
+            sinh_vien, changed_students = RegistrarImportService.upsert_students(db, nam_nhap_truong)
+            _analyze(db, models.SinhVien.__table__)
+            mark("sinh_vien")
+            hop_le = RegistrarImportService.stage_progress(db)
+            _analyze(db, TIENDO_STAGING)
+            tien_do, sinhvien_ids = RegistrarImportService.merge_progress(db)
+            _analyze(db, models.TienDoHocTap.__table__)
+            mark("tien_do")
+            TIENDO_STAGING.drop(connection)
+            STAGING.drop(connection)
+            TongHopHocTapService.refresh(db, sinhvien_ids)
+            db.commit()
+            mark("tong_hop")
+        except Exception:
+            db.rollback()
+            raise
+        SINHVIEN_CACHE.invalidate(*changed_students)
+
+        return {
+            "so_dong": so_dong,
+            "trung_lap": trung_lap,
+            "bo_qua": so_dong - trung_lap - hop_le,
+            **sinh_vien,
+            **tien_do,
+            "thoi_gian": {**timings, "tong": round(time.perf_counter() - started, 2)},
+        }
+
+    @staticmethod
+    def import_file(db: Session, path: str, nam_nhap_truong: Optional[int] = None, **ingest_options) -> Dict:
+        """
+        Excel exports go through ExcelIngestService first, CSV files are imported directly.
+        Unreadable Excel files raise ValueError.
+        """
+        if not path.lower().endswith((".xlsx", ".xls")):
+            return RegistrarImportService.import_csv(db, path, nam_nhap_truong)
+        with tempfile.TemporaryDirectory(prefix="registrar-import-") as work_dir:
+            try:
+                ingest = ExcelIngestService.ingest(path, output=os.path.join(work_dir, "raw_data.csv"), **ingest_options)
+            except ValueError:
+                raise
+            except Exception as e:
+                # Each reader fails differently on a corrupt file (zipfile, calamine, openpyxl errors).
+                raise ValueError(f"Không đọc được file Excel: {e}") from e
+            result = RegistrarImportService.import_csv(db, ingest["output"], nam_nhap_truong)
+        result["thoi_gian"]["doc_excel"] = ingest["total_seconds"]
+        return result
+
+def main(argv: Optional[Sequence[str]] = None):
+    from ..database import SessionLocal
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="File CSV (raw_data.csv) hoặc Excel của phòng đào tạo")
+    parser.add_argument("--nam-nhap-truong", type=int, help="Năm nhập trường của sinh viên mới")
+    parser.add_argument("--sheets", nargs="+", help="Các sheet cần đọc khi đầu vào là Excel")
+    parser.add_argument("--workers", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        result = RegistrarImportService.import_file(
+            db, args.path, args.nam_nhap_truong,
+            sheets=args.sheets, workers=args.workers, engine=reader_engine()
+        )
+    finally:
+        db.close()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
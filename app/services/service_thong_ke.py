@@ -0,0 +1,158 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+
+from ..models import models
+
+# Final grades are on a 0-10 scale; the histogram has one bucket per point, the last one closed.
+DIEM_BUCKETS = 10
+PERCENTILES = {"p25": 0.25, "p50": 0.5, "p75": 0.75}
+
+def _is_warned(column):
+    return and_(column.isnot(None), column != "")
+
+def _percentiles(db: Session, column) -> List:
+    """percentile_cont aggregates on PostgreSQL; other databases report None for them."""
+    if db.get_bind().dialect.name != "postgresql":
+        return []
+    return [func.percentile_cont(q).within_group(column).label(name) for name, q in PERCENTILES.items()]
+
+def _round(value, digits: int = 3):
+    return None if value is None else round(float(value), digits)
+
+class ThongKeService:
+    @staticmethod
+    def get_canh_bao_hien_tai(
+        db: Session, nganh: Optional[str] = None, nam_nhap_truong: Optional[int] = None
+    ) -> Dict:
+        """Students whose latest semester carries a warning, in one query."""
+        tiendo = models.TienDoHocTap
+        sinhvien = models.SinhVien
+        # The cohort filter goes inside, so only the selected students' semesters get ranked.
+        ranked = select(
+            sinhvien.id,
+            sinhvien.ma_sv,
+            sinhvien.ho_ten,
+            sinhvien.nganh,
+            sinhvien.nam_nhap_truong,
+            tiendo.hoc_ky,
+            tiendo.nam_hoc,
+            tiendo.tong_tin_chi_tich_luy,
+            tiendo.diem_trung_binh_tich_luy,
+            tiendo.xu_ly_hoc_tap,
+            func.row_number().over(
+                partition_by=tiendo.sinhvien_id,
+                order_by=(tiendo.nam_hoc.desc(), tiendo.hoc_ky.desc())
+            ).label("thu_tu")
+        ).join(sinhvien, sinhvien.id == tiendo.sinhvien_id)
+        if nganh is not None:
+            ranked = ranked.where(sinhvien.nganh == nganh)
+        if nam_nhap_truong is not None:
+            ranked = ranked.where(sinhvien.nam_nhap_truong == nam_nhap_truong)
+        latest = ranked.subquery()
+
+        stmt = select(*(column for column in latest.c if column.key != "thu_tu")).where(
+            latest.c.thu_tu == 1,
+            _is_warned(latest.c.xu_ly_hoc_tap)
+        )
+
+        sinh_vien = [dict(row._mapping) for row in db.execute(stmt.order_by(latest.c.ma_sv))]
+        return {"so_sinh_vien": len(sinh_vien), "sinh_vien": sinh_vien}
+
+    @staticmethod
+    def get_phan_bo_diem_lop_hoc(
+        db: Session,
+        hoc_ky: Optional[str] = None,
+        nam_hoc: Optional[str] = None,
+        hocphan_id: Optional[int] = None
+    ) -> List[Dict]:
+        """Count, mean, range, quartiles and a 10-bucket histogram of final grades per class."""
+        diem = models.Diem.diem_tong_ket
+        buckets = [
+            func.sum(case((and_(diem >= bucket, diem < bucket + 1 if bucket < DIEM_BUCKETS - 1 else diem <= DIEM_BUCKETS), 1), else_=0))
+            for bucket in range(DIEM_BUCKETS)
+        ]
+        stmt = select(
+            models.LopHoc.id.label("lophoc_id"),
+            models.LopHoc.ma_lop,
+            func.count(diem).label("so_luong"),
+            func.avg(diem).label("trung_binh"),
+            func.min(diem).label("thap_nhat"),
+            func.max(diem).label("cao_nhat"),
+            *_percentiles(db, diem),
+            *(bucket.label(f"b{index}") for index, bucket in enumerate(buckets))
+        ).join(models.Diem, models.Diem.lophoc_id == models.LopHoc.id).group_by(
+            models.LopHoc.id, models.LopHoc.ma_lop
+        ).order_by(models.LopHoc.id)
+        if hoc_ky is not None:
+            stmt = stmt.where(models.LopHoc.hoc_ky == hoc_ky)
+        if nam_hoc is not None:
+            stmt = stmt.where(models.LopHoc.nam_hoc == nam_hoc)
+        if hocphan_id is not None:
+            stmt = stmt.where(models.LopHoc.hocphan_id == hocphan_id)
+
+        results = []
+        for row in db.execute(stmt):
+            values = row._mapping
+            results.append({
+                "lophoc_id": values["lophoc_id"],
+                "ma_lop": values["ma_lop"],
+                "so_luong": values["so_luong"],
+                "trung_binh": _round(values["trung_binh"]),
+                "thap_nhat": values["thap_nhat"],
+                "cao_nhat": values["cao_nhat"],
+                **{name: _round(values.get(name)) for name in PERCENTILES},
+                "phan_bo": [int(values[f"b{index}"] or 0) for index in range(DIEM_BUCKETS)]
+            })
+        return results
+
+    @staticmethod
+    def get_tien_do_theo_khoa(
+        db: Session, nganh: Optional[str] = None, nam_nhap_truong: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Per major, intake year and semester: student count, semester GPA statistics,
+        warnings in the semester and the running total of warnings up to it.
+        """
+        tiendo = models.TienDoHocTap
+        cohort = (models.SinhVien.nganh, models.SinhVien.nam_nhap_truong)
+        warned = func.sum(case((_is_warned(tiendo.xu_ly_hoc_tap), 1), else_=0))
+        stmt = select(
+            models.SinhVien.nganh,
+            models.SinhVien.nam_nhap_truong,
+            tiendo.nam_hoc,
+            tiendo.hoc_ky,
+            func.count(tiendo.id).label("so_sinh_vien"),
+            func.avg(tiendo.diem_trung_binh_hk).label("diem_tb_hk"),
+            *_percentiles(db, tiendo.diem_trung_binh_hk),
+            func.avg(tiendo.tin_chi_dang_ky).label("tin_chi_dang_ky_tb"),
+            warned.label("so_canh_bao"),
+            func.sum(warned).over(
+                partition_by=cohort,
+                order_by=(tiendo.nam_hoc, tiendo.hoc_ky)
+            ).label("so_canh_bao_luy_ke")
+        ).join(models.SinhVien, models.SinhVien.id == tiendo.sinhvien_id).group_by(
+            *cohort, tiendo.nam_hoc, tiendo.hoc_ky
+        ).order_by(*cohort, tiendo.nam_hoc, tiendo.hoc_ky)
+        if nganh is not None:
+            stmt = stmt.where(models.SinhVien.nganh == nganh)
+        if nam_nhap_truong is not None:
+            stmt = stmt.where(models.SinhVien.nam_nhap_truong == nam_nhap_truong)
+
+        results = []
+        for row in db.execute(stmt):
+            values = row._mapping
+            results.append({
+                "nganh": values["nganh"],
+                "nam_nhap_truong": values["nam_nhap_truong"],
+                "nam_hoc": values["nam_hoc"],
+                "hoc_ky": values["hoc_ky"],
+                "so_sinh_vien": values["so_sinh_vien"],
+                "diem_tb_hk": _round(values["diem_tb_hk"]),
+                **{name: _round(values.get(name)) for name in PERCENTILES},
+                "tin_chi_dang_ky_tb": _round(values["tin_chi_dang_ky_tb"], 1),
+                "so_canh_bao": int(values["so_canh_bao"] or 0),
+                "so_canh_bao_luy_ke": int(values["so_canh_bao_luy_ke"] or 0)
+            })
+        return results
@@ -0,0 +1,147 @@
+import json
+import operator
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+
+DEFAULT_RULES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "warning_rules.json"
+)
+
+# Arguments of the generated evaluators, in this order; `year` is derived from `semester`.
+INPUT_FIELDS = ['semester', 'registered_credits', 'semester_average', 'accumulated_credits', 'cumulative_average']
+FIELDS = INPUT_FIELDS + ['year']
+
+OPERATORS = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+
+class CompiledRuleSet:
+    """
+    A rule set compiled once into a generated Python function (per record) and
+    NumPy predicates (per batch). Rules are checked in order and the first one that
+    fires is reported; a rule without conditions never fires.
+    """
+
+    def __init__(self, definition: Dict):
+        self.label = definition.get('nhan', 'Cảnh báo')
+        self.rules = definition['quy_tac']
+        self._constants = {}
+        self.evaluate = self._compile_function()
+
+    def _threshold(self, value) -> Tuple[str, object]:
+        if isinstance(value, dict):
+            by_year = {int(year): float(threshold) for year, threshold in value.get('theo_nam', {}).items()}
+            default = float(value['mac_dinh'])
+            name = f"_nguong_{len(self._constants)}"
+            self._constants[name] = (by_year, default)
+            return f"{name}[0].get(year, {default!r})", (by_year, default)
+        number = float(value)
+        return repr(number), number
+
+    def _clause(self, clause: List) -> Tuple[str, Tuple]:
+        field, op, value = clause
+        if field not in FIELDS:
+            raise ValueError(f"Trường không hợp lệ trong quy tắc cảnh báo: {field}")
+        if op not in OPERATORS:
+            raise ValueError(f"Toán tử không hợp lệ trong quy tắc cảnh báo: {op}")
+        source, threshold = self._threshold(value)
+        return f"{field} {op} {source}", (field, OPERATORS[op], threshold)
+
+    def _compile_function(self):
+        lines = [f"def evaluate({', '.join(INPUT_FIELDS)}):", "    year = (semester + 1) // 2"]
+        self._predicates = []
+        for rule in self.rules:
+            alternatives = []
+            compiled = []
+            for alternative in rule.get('dieu_kien', []):
+                clauses = [self._clause(clause) for clause in alternative]
+                alternatives.append("(" + " and ".join(source for source, _ in clauses) + ")")
+                compiled.append([predicate for _, predicate in clauses])
+            self._predicates.append(compiled)
+            if alternatives:
+                lines.append(f"    if {' or '.join(alternatives)}:")
+                lines.append(f"        return {rule['ma']!r}")
+        lines.append("    return None")
+
+        namespace = {name: constant for name, constant in self._constants.items()}
+        exec(compile("\n".join(lines), f"<quy_tac_canh_bao:{self.label}>", "exec"), namespace)
+        return namespace['evaluate']
+
+    @staticmethod
+    def _threshold_column(threshold, year: np.ndarray):
+        if not isinstance(threshold, tuple):
+            return threshold
+        by_year, default = threshold
+        values = np.full(len(year), default)
+        for rule_year, value in by_year.items():
+            values[year == rule_year] = value
+        return values
+
+    def evaluate_columns(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Returns the code of the first rule that fires for every row, or '' when none does."""
+        size = len(columns['semester'])
+        masks = []
+        for compiled in self._predicates:
+            mask = np.zeros(size, dtype=bool)
+            for alternative in compiled:
+                matched = np.ones(size, dtype=bool)
+                for field, compare, threshold in alternative:
+                    matched &= compare(columns[field], self._threshold_column(threshold, columns['year']))
+                mask |= matched
+            masks.append(mask)
+        if not masks:
+            return np.full(size, '', dtype=object)
+        return np.select(masks, [rule['ma'] for rule in self.rules], default='')
+
+
+class WarningRuleEngine:
+    def __init__(self, config: Dict):
+        self.default = CompiledRuleSet(config['mac_dinh'])
+        self.by_major = {
+            major: CompiledRuleSet(definition)
+            for major, definition in config.get('theo_nganh', {}).items()
+        }
+
+    def for_major(self, major: Optional[str]) -> CompiledRuleSet:
+        return self.by_major.get(major, self.default)
+
+    def evaluate_columns(self, columns: Dict[str, np.ndarray]) -> Tuple[List[str], List[str]]:
+        """Evaluates a batch of columns, returning the warning labels and the codes of the rules that fired."""
+        columns = dict(columns, year=(columns['semester'] + 1) // 2)
+        codes = self.default.evaluate_columns(columns).astype(object)
+        labels = np.where(codes != '', self.default.label, '').astype(object)
+
+        majors = columns.get('major')
+        if self.by_major and majors is not None:
+            for major, rule_set in self.by_major.items():
+                rows = np.flatnonzero(majors == major)
+                if not len(rows):
+                    continue
+                subset = {field: values[rows] for field, values in columns.items() if field in FIELDS}
+                major_codes = rule_set.evaluate_columns(subset)
+                codes[rows] = major_codes
+                labels[rows] = np.where(major_codes != '', rule_set.label, '')
+
+        invalid = columns.get('invalid')
+        if invalid is not None:
+            codes[invalid] = ''
+            labels[invalid] = ''
+        return labels.tolist(), codes.tolist()
+
+
+@lru_cache(maxsize=None)
+def get_rule_engine() -> WarningRuleEngine:
+    path = settings.WARNING_RULES_PATH or DEFAULT_RULES_PATH
+    with open(path, encoding='utf-8') as f:
+        return WarningRuleEngine(json.load(f))
@@ -0,0 +1,115 @@
+"""
+Throughput of the grade and student lookups served by the sync routers (threadpool)
+and by the async routers (DB_ASYNC=true), each in a single uvicorn worker.
+
+Runs against the database in DATABASE_URL, which must already contain students and grades:
+
+    python -m benchmarks.bench_async_db --requests 5000 --concurrency 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+from sqlalchemy import create_engine, text
+
+
+def lookup_paths(url: str, count: int, seed: int):
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        sinhvien_ids = [row[0] for row in connection.execute(text("SELECT id FROM sinhvien LIMIT 10000"))]
+        diem_pairs = [tuple(row) for row in connection.execute(text("SELECT sinhvien_id, lophoc_id FROM diem LIMIT 10000"))]
+    engine.dispose()
+    if not sinhvien_ids or not diem_pairs:
+        sys.exit("Cơ sở dữ liệu chưa có sinh viên hoặc điểm")
+
+    rng = random.Random(seed)
+    paths = []
+    for index in range(count):
+        if index % 2:
+            sinhvien_id, lophoc_id = rng.choice(diem_pairs)
+            paths.append(f"/api/diem/sinh-vien/{sinhvien_id}/lop-hoc/{lophoc_id}")
+        else:
+            paths.append(f"/api/sinh-vien/{rng.choice(sinhvien_ids)}")
+    return paths
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get("/api/vien/?limit=1")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError("uvicorn không khởi động được")
+
+
+async def run_load(base_url: str, paths, concurrency: int):
+    queue = iter(paths)
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors
+            for path in queue:
+                started = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return elapsed, sorted(latencies), errors
+
+
+def report(label: str, elapsed: float, latencies, errors: int):
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(
+        f"{label:<6} {len(latencies) / elapsed:8.1f} req/s  "
+        f"p50 {percentile(0.50):7.1f} ms  p95 {percentile(0.95):7.1f} ms  p99 {percentile(0.99):7.1f} ms  "
+        f"mean {statistics.mean(latencies) * 1000:7.1f} ms  lỗi {errors}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    paths = lookup_paths(os.environ["DATABASE_URL"], args.requests, args.seed)
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    for label, db_async in (("sync", "false"), ("async", "true")):
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port), "--log-level", "warning"],
+            env=dict(os.environ, DB_ASYNC=db_async),
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            asyncio.run(wait_until_ready(base_url))
+            # Warm up connections and caches before measuring.
+            asyncio.run(run_load(base_url, paths[:args.concurrency], args.concurrency))
+            report(label, *asyncio.run(run_load(base_url, paths, args.concurrency)))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+bcrypt cost of the password policy in app/services/auth_service: hash and verify
+latency at each BCRYPT_ROUNDS value, the logins per second one core sustains and
+the throughput of a pool of --threads threads (bcrypt releases the GIL).
+
+    python -m benchmarks.bench_password_hash --rounds 10 11 12 13 --target-ms 250 --threads 4
+
+Size PASSWORD_HASH_WORKERS from the per-core rate and the expected login peak.
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+PASSWORD = "mat-khau-thu-nghiem"
+
+
+def measure(rounds: int, samples: int, threads: int):
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    hash_times = []
+    for _ in range(max(1, samples // 4)):
+        started = time.perf_counter()
+        hashed = context.hash(PASSWORD)
+        hash_times.append(time.perf_counter() - started)
+
+    verify_times = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify(PASSWORD, hashed)
+        verify_times.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: context.verify(PASSWORD, hashed), range(samples * threads)))
+    pool_rate = samples * threads / (time.perf_counter() - started)
+
+    verify_times.sort()
+    return {
+        "hash_ms": statistics.median(hash_times) * 1000,
+        "p50_ms": verify_times[len(verify_times) // 2] * 1000,
+        "p95_ms": verify_times[min(len(verify_times) - 1, int(len(verify_times) * 0.95))] * 1000,
+        "per_core": 1 / statistics.median(verify_times),
+        "pool_rate": pool_rate,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--target-ms", type=float, default=250, help="Độ trễ kiểm tra mật khẩu mong muốn")
+    args = parser.parse_args()
+
+    print(f"{'rounds':>6} {'hash':>9} {'verify p50':>11} {'p95':>9} {'login/s/lõi':>12} {f'login/s ({args.threads} luồng)':>20}")
+    chosen = None
+    for rounds in sorted(args.rounds):
+        result = measure(rounds, args.samples, args.threads)
+        print(
+            f"{rounds:>6} {result['hash_ms']:7.1f}ms {result['p50_ms']:9.1f}ms {result['p95_ms']:7.1f}ms "
+            f"{result['per_core']:12.1f} {result['pool_rate']:20.1f}"
+        )
+        if result["p50_ms"] <= args.target_ms:
+            chosen = rounds
+    if chosen is None:
+        print(f"Không có mức nào đạt {args.target_ms:.0f} ms")
+    else:
+        print(f"BCRYPT_ROUNDS={chosen} là mức cao nhất có verify p50 <= {args.target_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Load test of the main endpoints: grade lists, detail views, learning-result
+processing and login. Reports throughput and p50/p95/p99 latency per scenario.
+
+Needs a database filled by scripts.seed_data; the ids to request are read from
+DATABASE_URL. Either point --base-url at a running server or let the harness start one:
+
+    python -m scripts.seed_data --students 100000 --reset
+    python -m benchmarks.load_test --start-server --workers 4 --requests 20000 --concurrency 64
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8000 --mix diem_list=1,login=1
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from app.services.pagination import encode_cursor
+from benchmarks.bench_async_db import wait_until_ready
+
+DEFAULT_MIX = {
+    "diem_list": 4,
+    "diem_detail": 3,
+    "lop_hoc_detail": 2,
+    "sinh_vien_diem": 3,
+    "sinh_vien_tong_hop": 3,
+    "learning_results": 1,
+    "login": 1,
+}
+
+
+def max_ids(url: str):
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        ids = {
+            table: connection.execute(text(f"SELECT MAX(id) FROM {table}")).scalar() or 0
+            for table in ("diem", "lophoc", "sinhvien", "nguoidung")
+        }
+    engine.dispose()
+    if not ids["diem"] or not ids["sinhvien"]:
+        sys.exit("Cơ sở dữ liệu chưa có dữ liệu; chạy python -m scripts.seed_data trước")
+    return ids
+
+
+def learning_results_batch(rng: random.Random, students: int, semesters: int = 8):
+    records = []
+    for index in range(students):
+        accumulated = 0
+        for semester in range(1, semesters + 1):
+            registered = rng.randint(12, 25)
+            accumulated += registered
+            average = round(rng.uniform(0.5, 4.0), 2)
+            records.append({
+                "id": f"LT{index:06d}",
+                "major": rng.choice(("Ngân hàng", "Kế toán", "Công nghệ thông tin")),
+                "gender": rng.choice(("Nam", "Nữ")),
+                "target": "0",
+                "region": str(rng.randint(1, 3)),
+                "admission_block": "A00",
+                "admission_score": str(round(rng.uniform(18, 29), 1)),
+                "semester": str(semester),
+                "registered_credits": str(registered),
+                "semester_average": str(average),
+                "accumulated_credits": str(float(accumulated)),
+                "cumulative_average": str(round(rng.uniform(1.0, 4.0), 2)),
+                "final_score": str(round(rng.uniform(1.0, 4.0), 2)),
+            })
+    return records
+
+
+def build_plan(args, ids):
+    """Every request of the run, drawn up front so runs with the same --seed are comparable."""
+    rng = random.Random(args.seed)
+    batch = learning_results_batch(rng, args.batch_students)
+    users = max(1, ids["nguoidung"] - 1)
+
+    requests = {
+        "diem_list": lambda: ("GET", "/api/diem/", {"params": {"limit": args.page_size, "cursor": encode_cursor(rng.randint(1, ids["diem"]))}}),
+        "diem_detail": lambda: ("GET", f"/api/diem/detail/{rng.randint(1, ids['diem'])}", {}),
+        "lop_hoc_detail": lambda: ("GET", f"/api/lop-hoc/detail/{rng.randint(1, ids['lophoc'])}", {}),
+        "sinh_vien_diem": lambda: ("GET", f"/api/sinh-vien/diem/{rng.randint(1, ids['sinhvien'])}", {}),
+        "sinh_vien_tong_hop": lambda: ("GET", f"/api/sinh-vien/{rng.randint(1, ids['sinhvien'])}/tong-hop", {}),
+        "learning_results": lambda: ("POST", "/api/plr/process-learning-results", {"params": {"engine": args.engine}, "json": batch}),
+        "login": lambda: ("POST", "/xacthuc/login", {"json": {"username": f"loadtest_{rng.randint(1, users)}", "password": args.password}}),
+    }
+    unknown = set(args.mix) - set(requests)
+    if unknown:
+        sys.exit(f"Kịch bản không hợp lệ: {', '.join(sorted(unknown))}")
+
+    names = list(args.mix)
+    weights = [args.mix[name] for name in names]
+    return [(name, *requests[name]()) for name in rng.choices(names, weights, k=args.requests)]
+
+
+async def run_load(base_url: str, plan, concurrency: int):
+    queue = iter(plan)
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        async def worker():
+            for name, method, path, options in queue:
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, path, **options)
+                    failed = response.status_code >= 400
+                except httpx.TransportError:
+                    failed = True
+                latencies[name].append(time.perf_counter() - started)
+                if failed:
+                    errors[name] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return elapsed, latencies, errors
+
+
+def report(elapsed: float, latencies, errors):
+    def line(label, values, error_count):
+        values = sorted(values)
+
+        def percentile(p):
+            return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+        print(
+            f"{label:<20} {len(values):>7} {len(values) / elapsed:9.1f} req/s  "
+            f"p50 {percentile(0.50):8.1f} ms  p95 {percentile(0.95):8.1f} ms  p99 {percentile(0.99):8.1f} ms  lỗi {error_count}"
+        )
+
+    for name in sorted(latencies):
+        line(name, latencies[name], errors[name])
+    line("tổng", [value for values in latencies.values() for value in values], sum(errors.values()))
+    print(f"Thời gian chạy {elapsed:.1f} s")
+
+
+def parse_mix(value: str):
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--start-server", action="store_true", help="Tự khởi động uvicorn trên cổng của --base-url")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="Tỉ trọng kịch bản, ví dụ diem_list=4,login=1")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--batch-students", type=int, default=200, help="Số sinh viên (8 học kỳ) mỗi lô learning_results")
+    parser.add_argument("--engine", default="vectorized", choices=["python", "vectorized", "parallel"])
+    parser.add_argument("--password", default="loadtest")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    plan = build_plan(args, max_ids(os.environ["DATABASE_URL"]))
+
+    server = None
+    if args.start_server:
+        port = str(httpx.URL(args.base_url).port or 8000)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", port,
+             "--workers", str(args.workers), "--log-level", "warning"],
+            stdout=subprocess.DEVNULL,
+        )
+    try:
+        asyncio.run(wait_until_ready(args.base_url))
+        # Warm up connections and caches before measuring.
+        asyncio.run(run_load(args.base_url, plan[:args.concurrency], args.concurrency))
+        report(*asyncio.run(run_load(args.base_url, plan, args.concurrency)))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
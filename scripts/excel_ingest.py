@@ -0,0 +1,53 @@
+"""
+Registrar Excel export to one CSV sorted by student and semester; see
+app/services/service_excel_ingest.py for how the sheets are read and merged.
+
+    python -m scripts.excel_ingest Data.xlsx --sheets Data1 Data2 Data3 Data4 --output raw_data.csv
+"""
+import argparse
+import json
+from typing import Optional, Sequence
+
+from app.services.service_excel_ingest import (
+    DEFAULT_COLUMNS,
+    DEFAULT_SORT_KEYS,
+    ColumnMapping,
+    ExcelIngestService,
+    reader_engine,
+)
+
+def parse_columns(args) -> ColumnMapping:
+    if args.column_map:
+        with open(args.column_map, encoding="utf-8") as f:
+            return json.load(f)
+    if args.columns:
+        return [name.strip() for name in args.columns.split(",")]
+    return DEFAULT_COLUMNS
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="File Excel đầu vào")
+    parser.add_argument("--sheets", nargs="+", help="Các sheet cần đọc (mặc định: tất cả)")
+    parser.add_argument("--output", default="raw_data.csv")
+    parser.add_argument("--columns", help="Tên cột theo thứ tự trong sheet, phân tách bằng dấu phẩy")
+    parser.add_argument("--column-map", help="File JSON {tên cột trong sheet: tên cột đầu ra}")
+    parser.add_argument("--sort-keys", nargs="+", default=DEFAULT_SORT_KEYS)
+    parser.add_argument("--workers", type=int, default=0, help="Số tiến trình (mặc định: số CPU)")
+    parser.add_argument("--engine", default=reader_engine(), help="Engine đọc Excel của pandas (calamine, openpyxl)")
+    args = parser.parse_args(argv)
+
+    result = ExcelIngestService.ingest(
+        args.path,
+        sheets=args.sheets,
+        output=args.output,
+        columns=parse_columns(args),
+        sort_keys=args.sort_keys,
+        workers=args.workers,
+        engine=args.engine,
+    )
+    print("Đã lưu file CSV:", result["output"])
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Deterministic synthetic data at production scale: institutes, courses, lecturers,
+classes, students, their enrollments and grades, semester progress and login
+accounts. The same --seed and sizes always produce the same rows.
+
+Inserts explicit ids with multi-row INSERTs in batches, so the tables must be empty
+(--reset drops and recreates every table first). Runs against DATABASE_URL or --url:
+
+    python -m scripts.seed_data --students 100000 --classes-per-student 20 --reset
+    python -m scripts.seed_data --url sqlite:////tmp/seed.db --students 2000
+
+The accounts created for load tests are loadtest_<n> with --password; admin also uses it.
+"""
+import argparse
+import datetime
+import os
+import random
+import time
+
+from sqlalchemy import create_engine, func, insert, select, text
+
+MAJORS = [
+    "Công nghệ thông tin", "Kỹ thuật phần mềm", "Khoa học máy tính", "Hệ thống thông tin",
+    "Ngân hàng", "Kế toán", "Quản trị kinh doanh", "Tài chính", "Kinh tế", "Marketing",
+]
+FAMILY_NAMES = ["Nguyễn", "Trần", "Lê", "Phạm", "Hoàng", "Huỳnh", "Phan", "Vũ", "Võ", "Đặng", "Bùi", "Đỗ"]
+MIDDLE_NAMES = ["Văn", "Thị", "Minh", "Ngọc", "Đức", "Thanh", "Quốc", "Hải", "Thu", "Gia"]
+GIVEN_NAMES = ["An", "Bình", "Châu", "Dũng", "Giang", "Hà", "Hùng", "Khánh", "Linh", "Mai", "Nam", "Phương", "Quân", "Trang", "Tuấn", "Vy"]
+DEGREES = ["ThS", "TS", "PGS.TS", "GS.TS"]
+WARNINGS = ["Cảnh báo mức 1", "Cảnh báo mức 2", "Cảnh báo mức 3"]
+FIRST_YEAR = 2018
+LAST_YEAR = 2025
+
+
+def full_name(rng: random.Random) -> str:
+    return f"{rng.choice(FAMILY_NAMES)} {rng.choice(MIDDLE_NAMES)} {rng.choice(GIVEN_NAMES)}"
+
+
+def nam_hoc(year: int) -> str:
+    return f"{year}-{year + 1}"
+
+
+def score(rng: random.Random, mean: float) -> float:
+    return round(min(10.0, max(0.0, rng.gauss(mean, 1.8))), 1)
+
+
+class Seeder:
+    def __init__(self, engine, args):
+        from app.models import models
+
+        self.engine = engine
+        self.models = models
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.intake_years = []
+
+    def insert(self, table, rows):
+        """Inserts rows from an iterable in batches of --batch and reports the rate."""
+        started = time.perf_counter()
+        count = 0
+        batch = []
+        with self.engine.begin() as connection:
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.args.batch:
+                    connection.execute(insert(table), batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                connection.execute(insert(table), batch)
+                count += len(batch)
+        elapsed = time.perf_counter() - started
+        print(f"{table.name:<16} {count:>10} dòng  {elapsed:7.1f} s  {count / max(elapsed, 1e-9):10.0f} dòng/s")
+
+    def viens(self):
+        for id in range(1, self.args.institutes + 1):
+            yield {"id": id, "ma_vien": f"V{id:03d}", "ten_vien": f"Viện {id}", "mo_ta": None, "nguoi_quan_ly": full_name(self.rng)}
+
+    def hoc_phans(self):
+        kinds = list(self.models.LoaiHocPhan)
+        for id in range(1, self.args.courses + 1):
+            yield {
+                "id": id,
+                "ma_hp": f"HP{id:05d}",
+                "ten_hp": f"Học phần {id}",
+                "so_tin_chi": self.rng.choice((2, 2, 3, 3, 3, 4)),
+                "mo_ta": None,
+                "vien_id": self.rng.randint(1, self.args.institutes),
+                "loai_hoc_phan": self.rng.choice(kinds).name,
+            }
+
+    def giang_viens(self):
+        for id in range(1, self.args.lecturers + 1):
+            yield {
+                "id": id,
+                "ma_gv": f"GV{id:05d}",
+                "ho_ten": full_name(self.rng),
+                "hoc_vi": self.rng.choice(DEGREES),
+                "chuyen_mon": self.rng.choice(MAJORS),
+                "so_dien_thoai": f"09{self.rng.randrange(10 ** 8):08d}",
+                "email": f"gv{id}@truong.edu.vn",
+                "nguoidung_id": None,
+                "vien_id": self.rng.randint(1, self.args.institutes),
+            }
+
+    def lop_hocs(self):
+        for id in range(1, self.classes + 1):
+            year = self.rng.randint(FIRST_YEAR, LAST_YEAR - 1)
+            yield {
+                "id": id,
+                "ma_lop": f"L{id:07d}",
+                "ten_lop": f"Lớp {id}",
+                "hocphan_id": self.rng.randint(1, self.args.courses),
+                "giangvien_id": self.rng.randint(1, self.args.lecturers),
+                "hoc_ky": str(self.rng.randint(1, 2)),
+                "nam_hoc": nam_hoc(year),
+                "phong_hoc": f"D{self.rng.randint(1, 9)}-{self.rng.randint(101, 510)}",
+            }
+
+    def sinh_viens(self):
+        for id in range(1, self.args.students + 1):
+            year = self.rng.randint(FIRST_YEAR, LAST_YEAR - 1)
+            self.intake_years.append(year)
+            yield {
+                "id": id,
+                "ma_sv": f"SV{id:08d}",
+                "ho_ten": full_name(self.rng),
+                "ngay_sinh": datetime.date(self.rng.randint(1998, 2006), self.rng.randint(1, 12), self.rng.randint(1, 28)),
+                "gioi_tinh": self.rng.choice(("Nam", "Nữ")),
+                "dia_chi": None,
+                "so_dien_thoai": f"03{self.rng.randrange(10 ** 8):08d}",
+                "email": f"sv{id}@truong.edu.vn",
+                "nam_nhap_truong": year,
+                "nganh": self.rng.choice(MAJORS),
+                "nguoidung_id": None,
+            }
+
+    def enrollments(self):
+        """(sinhvien_id, lophoc_id) pairs, --classes-per-student distinct classes per student."""
+        per_student = min(self.args.classes_per_student, self.classes)
+        rng = random.Random(self.args.seed + 1)
+        for sinhvien_id in range(1, self.args.students + 1):
+            for lophoc_id in sorted(rng.sample(range(1, self.classes + 1), per_student)):
+                yield sinhvien_id, lophoc_id
+
+    def lophoc_sinhviens(self):
+        for sinhvien_id, lophoc_id in self.enrollments():
+            yield {"lophoc_id": lophoc_id, "sinhvien_id": sinhvien_id}
+
+    def diems(self):
+        rng = random.Random(self.args.seed + 2)
+        for id, (sinhvien_id, lophoc_id) in enumerate(self.enrollments(), start=1):
+            mean = 4.5 + (sinhvien_id * 7919 % 100) / 25
+            chuyen_can, giua_ky, cuoi_ky = score(rng, mean + 1), score(rng, mean), score(rng, mean)
+            yield {
+                "id": id,
+                "sinhvien_id": sinhvien_id,
+                "lophoc_id": lophoc_id,
+                "diem_chuyen_can": chuyen_can,
+                "diem_giua_ky": giua_ky,
+                "diem_cuoi_ky": cuoi_ky,
+                "diem_tong_ket": round(0.1 * chuyen_can + 0.3 * giua_ky + 0.6 * cuoi_ky, 1),
+            }
+
+    def tien_do_hoc_taps(self):
+        """Semester progress up to LAST_YEAR; needs the intake years recorded by sinh_viens()."""
+        rng = random.Random(self.args.seed + 3)
+        id = 0
+        for sinhvien_id, intake_year in enumerate(self.intake_years, start=1):
+            semesters = min(self.args.semesters, (LAST_YEAR - intake_year) * 2)
+            credits = 0
+            registered_total = 0
+            points = 0.0
+            level = 0
+            ability = rng.uniform(1.2, 3.8)
+            for semester in range(semesters):
+                registered = rng.randint(12, 25)
+                average = round(min(4.0, max(0.0, rng.gauss(ability, 0.6))), 2)
+                passed = registered if average >= 1.0 else rng.randint(0, registered)
+                credits += passed
+                registered_total += registered
+                points += average * registered
+                cumulative = round(points / registered_total, 2)
+                level = min(level + 1, len(WARNINGS)) if average < 1.0 or cumulative < 1.2 else 0
+                id += 1
+                yield {
+                    "id": id,
+                    "sinhvien_id": sinhvien_id,
+                    "hoc_ky": str(semester % 2 + 1),
+                    "nam_hoc": nam_hoc(intake_year + semester // 2),
+                    "tin_chi_dang_ky": registered,
+                    "diem_trung_binh_hk": average,
+                    "tong_tin_chi_tich_luy": credits,
+                    "diem_trung_binh_tich_luy": cumulative,
+                    "xu_ly_hoc_tap": WARNINGS[level - 1] if level else "",
+                }
+
+    def nguoi_dungs(self):
+        from app.services.auth_service import get_password_hash
+
+        # One hash for every account: bcrypt at this scale would dominate the run.
+        password_hash = get_password_hash(self.args.password)
+        yield {
+            "id": 1, "ten_dang_nhap": "admin", "email": "admin@truong.edu.vn", "mat_khau_hash": password_hash,
+            "ho_ten": "Quản trị viên", "vai_tro": "admin", "trang_thai": True,
+        }
+        for index in range(1, self.args.users + 1):
+            yield {
+                "id": index + 1,
+                "ten_dang_nhap": f"loadtest_{index}",
+                "email": f"loadtest_{index}@truong.edu.vn",
+                "mat_khau_hash": password_hash,
+                "ho_ten": full_name(self.rng),
+                "vai_tro": "giangvien",
+                "trang_thai": True,
+            }
+
+    @property
+    def classes(self) -> int:
+        if self.args.classes:
+            return self.args.classes
+        enrollments = self.args.students * self.args.classes_per_student
+        return max(self.args.classes_per_student, -(-enrollments // self.args.class_size))
+
+    def run(self):
+        m = self.models
+        self.insert(m.NguoiDung.__table__, self.nguoi_dungs())
+        self.insert(m.Vien.__table__, self.viens())
+        self.insert(m.HocPhan.__table__, self.hoc_phans())
+        self.insert(m.GiangVien.__table__, self.giang_viens())
+        self.insert(m.LopHoc.__table__, self.lop_hocs())
+        self.insert(m.SinhVien.__table__, self.sinh_viens())
+        self.insert(m.lophoc_sinhvien, self.lophoc_sinhviens())
+        self.insert(m.Diem.__table__, self.diems())
+        self.insert(m.TienDoHocTap.__table__, self.tien_do_hoc_taps())
+
+
+def reset_sequences(engine, models):
+    """Moves the PostgreSQL id sequences past the explicit ids inserted by the seeder."""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as connection:
+        for model in (models.NguoiDung, models.Vien, models.HocPhan, models.GiangVien, models.LopHoc,
+                      models.SinhVien, models.Diem, models.TienDoHocTap):
+            table = model.__tablename__
+            connection.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+            ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=os.environ.get("DATABASE_URL"))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--institutes", type=int, default=12)
+    parser.add_argument("--courses", type=int, default=400)
+    parser.add_argument("--lecturers", type=int, default=600)
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--classes-per-student", type=int, default=20)
+    parser.add_argument("--class-size", type=int, default=50, help="Số sinh viên trung bình mỗi lớp khi không có --classes")
+    parser.add_argument("--classes", type=int, default=0)
+    parser.add_argument("--semesters", type=int, default=8, help="Số học kỳ tối đa có tiến độ học tập mỗi sinh viên")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--password", default="loadtest")
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--reset", action="store_true", help="Xóa và tạo lại toàn bộ bảng trước khi sinh dữ liệu")
+    parser.add_argument("--skip-summary", action="store_true", help="Không tính bảng tổng hợp tonghophoctap")
+    args = parser.parse_args()
+    if not args.url:
+        parser.error("Cần --url hoặc biến môi trường DATABASE_URL")
+
+    from app.database import Base
+    from app.migrations import m0002_tong_hop_hoc_tap
+    from app.models import models
+
+    engine = create_engine(args.url)
+    if args.reset:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.connect() as connection:
+        if connection.execute(select(func.count()).select_from(models.SinhVien.__table__)).scalar():
+            parser.error("Bảng sinhvien đã có dữ liệu; dùng --reset để sinh lại từ đầu")
+
+    started = time.perf_counter()
+    Seeder(engine, args).run()
+    reset_sequences(engine, models)
+    if not args.skip_summary:
+        summary_started = time.perf_counter()
+        m0002_tong_hop_hoc_tap.upgrade(engine)
+        print(f"{'tonghophoctap':<16} {'':>10}       {time.perf_counter() - summary_started:7.1f} s")
+    print(f"Tổng thời gian {time.perf_counter() - started:.1f} s")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
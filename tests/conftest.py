@@ -0,0 +1,29 @@
+import os
+import tempfile
+
+import pytest
+
+# Settings are read when app.config is first imported, so the test environment is set
+# before any test module imports the app. The database is a throwaway SQLite file.
+_db_dir = tempfile.mkdtemp(prefix="alert-system-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["DB_ASYNC"] = "false"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+# The minimum bcrypt cost, so tests that log in stay fast.
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+
+@pytest.fixture
+def db():
+    from app.database import Base, SessionLocal, engine
+    from app.models import models  # noqa: F401  registers the tables
+
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from passlib.hash import bcrypt
+
+from app.config import settings
+
+from app.main import app
+from app.models import models
+from app.schemas import schemas
+from app.services import auth_service
+from app.services.service import NguoiDungService
+
+
+@pytest.fixture
+def user(db):
+    name = f"user-{uuid.uuid4().hex[:8]}"
+    user = models.NguoiDung(
+        ten_dang_nhap=name, email=f"{name}@example.com", ho_ten="Người dùng", vai_tro="admin",
+        mat_khau_hash=auth_service.get_password_hash("mat-khau"), trang_thai=True
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def saturated_password_pool():
+    auth_service.get_password_executor()
+    slots = auth_service._password_slots
+    held = 0
+    while slots.acquire(blocking=False):
+        held += 1
+    try:
+        yield
+    finally:
+        for _ in range(held):
+            slots.release()
+
+
+def test_login_is_rejected_with_retry_after_when_hashing_is_saturated(user, saturated_password_pool):
+    response = TestClient(app).post("/xacthuc/login", json={"username": user.ten_dang_nhap, "password": "mat-khau"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_cancelled_caller_keeps_its_slot_until_the_job_ends():
+    auth_service.get_password_executor()
+    slots = auth_service._password_slots
+    started, finish = threading.Event(), threading.Event()
+
+    def job():
+        started.set()
+        finish.wait(5)
+
+    async def cancel_while_running():
+        task = asyncio.ensure_future(auth_service.run_password_task(job))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    capacity = slots._value
+    asyncio.run(cancel_while_running())
+    assert slots._value == capacity - 1
+    finish.set()
+    deadline = time.monotonic() + 5
+    while slots._value != capacity and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert slots._value == capacity
+
+
+def me(user):
+    token = auth_service.create_access_token({"sub": user.ten_dang_nhap, "user_id": user.id, "vai_tro": user.vai_tro})
+    return TestClient(app).get("/xacthuc/me", headers={"Authorization": f"Bearer {token}"})
+
+
+def test_update_revokes_the_cached_principal(db, user):
+    assert me(user).json()["ho_ten"] == "Người dùng"
+    assert auth_service.PRINCIPAL_CACHE.lookup_code(user.ten_dang_nhap) is not None
+
+    NguoiDungService.update(db, user.id, schemas.NguoiDungUpdate(ho_ten="Tên mới"))
+
+    assert me(user).json()["ho_ten"] == "Tên mới"
+
+
+def test_disabled_user_is_rejected_on_the_next_request(db, user):
+    assert me(user).status_code == 200
+
+    NguoiDungService.delete(db, user.id)
+
+    response = me(user)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Tài khoản đã bị vô hiệu hóa"
+
+
+def rounds_of(db, user):
+    db.expire_all()
+    return int(db.get(models.NguoiDung, user.id).mat_khau_hash.split("$")[2])
+
+
+@pytest.fixture
+def outdated_user(db, user):
+    user.mat_khau_hash = bcrypt.using(rounds=settings.BCRYPT_ROUNDS + 1).hash("mat-khau")
+    db.commit()
+    return user
+
+
+def test_login_replaces_a_hash_made_at_another_cost(db, outdated_user):
+    assert auth_service.authenticate_user(db, outdated_user.ten_dang_nhap, "sai-mat-khau") is False
+    assert rounds_of(db, outdated_user) == settings.BCRYPT_ROUNDS + 1
+
+    assert auth_service.authenticate_user(db, outdated_user.ten_dang_nhap, "mat-khau")
+    assert rounds_of(db, outdated_user) == settings.BCRYPT_ROUNDS
+    assert auth_service.verify_password("mat-khau", db.get(models.NguoiDung, outdated_user.id).mat_khau_hash)
+
+
+def test_async_login_replaces_a_hash_made_at_another_cost(db, outdated_user):
+    response = TestClient(app).post(
+        "/xacthuc/login", json={"username": outdated_user.ten_dang_nhap, "password": "mat-khau"}
+    )
+    assert response.status_code == 200
+    assert rounds_of(db, outdated_user) == settings.BCRYPT_ROUNDS
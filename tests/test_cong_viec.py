@@ -0,0 +1,49 @@
+import logging
+import uuid
+
+from sqlalchemy import inspect
+
+from app.models import models
+from app.services.service_cong_viec import HOAN_THANH, THAT_BAI, CongViecService
+from app.services.service_learning_result import LearningResultsService
+
+STUDENTS = [
+    {'id': 'SV1', 'major': 'Kế toán', 'semester': '1', 'registered_credits': '15',
+     'semester_average': '0.6', 'accumulated_credits': '15', 'cumulative_average': '0.6'},
+    {'id': 'SV1', 'major': 'Kế toán', 'semester': '2', 'registered_credits': '15',
+     'semester_average': '2.5', 'accumulated_credits': '30', 'cumulative_average': '1.6'},
+]
+
+
+def create_job(db, students=STUDENTS):
+    job = models.CongViecXuLy(id=uuid.uuid4().hex, trang_thai='cho_xu_ly',
+                              tong_so=len(students), da_xu_ly=0, du_lieu=students)
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+def test_status_lookup_does_not_load_submitted_batch(db):
+    job_id = create_job(db)
+    db.expunge_all()
+    job = CongViecService.get_by_id(db, job_id)
+    assert 'du_lieu' in inspect(job).unloaded
+
+    CongViecService.run(job_id)
+    db.expire_all()
+    assert CongViecService.get_by_id(db, job_id).trang_thai == HOAN_THANH
+    assert [row.du_lieu['semester'] for row in CongViecService.get_results(db, job_id)] == ['1', '2']
+
+
+def test_failed_job_is_logged(db, monkeypatch, caplog):
+    def fail(students):
+        raise RuntimeError('hỏng')
+
+    monkeypatch.setattr(LearningResultsService, 'process_academic_performance_vectorized', fail)
+    job_id = create_job(db, STUDENTS[:1])
+    with caplog.at_level(logging.ERROR, logger='app.services.service_cong_viec'):
+        CongViecService.run(job_id)
+    db.expire_all()
+    job = CongViecService.get_by_id(db, job_id)
+    assert (job.trang_thai, job.loi) == (THAT_BAI, 'hỏng')
+    assert any(job_id in record.getMessage() and record.exc_info for record in caplog.records)
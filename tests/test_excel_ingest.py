@@ -0,0 +1,60 @@
+import csv
+
+import pandas as pd
+
+from app.services.service_excel_ingest import ExcelIngestService, reader_engine
+
+COLUMNS = ["ID", "Hoc Ky", "TBHK"]
+
+
+def _workbook(path, sheets):
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for name, rows in sheets.items():
+            pd.DataFrame(rows, columns=["Ma", "HK", "Diem"]).to_excel(writer, sheet_name=name, index=False)
+
+
+def _ingest(tmp_path, sheets, **options):
+    path = str(tmp_path / "Data.xlsx")
+    output = str(tmp_path / "raw_data.csv")
+    _workbook(path, sheets)
+    result = ExcelIngestService.ingest(path, output=output, columns=COLUMNS, workers=2, engine=reader_engine(), **options)
+    with open(output, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    return result, rows
+
+
+def test_mixed_key_kinds_merge_in_one_order(tmp_path):
+    result, rows = _ingest(tmp_path, {
+        "Data1": [[10, 2, 7.0], [9, 1, 6.0], [10, 1, 5.0], [100, 1, 4.0]],
+        "Data2": [["SV2", 1, 8.0], ["11", 2, 3.0], ["SV10", 1, 9.0], [None, 1, 1.0]],
+    })
+
+    assert rows[0] == COLUMNS
+    keys = [(row[0], int(row[1])) for row in rows[1:]]
+    # ID is text in Data2, so it is compared as text everywhere; blanks go last.
+    assert keys == [
+        ("10", 1), ("10", 2), ("100", 1), ("11", 2), ("9", 1), ("SV10", 1), ("SV2", 1), ("", 1)
+    ]
+    assert result["rows"] == 8
+    assert result["sheets"] == {"Data1": 4, "Data2": 4}
+
+
+def test_numeric_keys_compare_as_numbers(tmp_path):
+    _, rows = _ingest(tmp_path, {
+        "Data1": [[10, 1, 1.0], [2, 2, 1.0]],
+        "Data2": [[9, 1, 1.0], [2, 1, 1.0]],
+    })
+    assert [(row[0], row[1]) for row in rows[1:]] == [("2", "1"), ("2", "2"), ("9", "1"), ("10", "1")]
+
+
+def test_column_map_reads_keys_by_sheet_header(tmp_path):
+    path = str(tmp_path / "Data.xlsx")
+    output = str(tmp_path / "raw_data.csv")
+    _workbook(path, {"Data1": [["b", 1, 1.0]], "Data2": [[1, 1, 2.0]]})
+    ExcelIngestService.ingest(
+        path, output=output, columns={"Diem": "TBHK", "HK": "Hoc Ky", "Ma": "ID"}, workers=1, engine=reader_engine()
+    )
+    with open(output, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["TBHK", "Hoc Ky", "ID"]
+    assert [row[2] for row in rows[1:]] == ["1", "b"]
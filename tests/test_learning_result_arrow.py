@@ -0,0 +1,56 @@
+import pyarrow as pa
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.service_learning_result import ARROW_MEDIA_TYPE, LearningResultsService
+
+URL = "/api/plr/process-learning-results"
+
+
+def typed_table(**overrides):
+    columns = {
+        'id': ['SV1', 'SV1', 'SV2'], 'major': ['Kế toán'] * 3, 'gender': ['Nữ'] * 3, 'target': ['0'] * 3,
+        'region': ['1'] * 3, 'admission_block': ['A00'] * 3, 'admission_score': ['20'] * 3,
+        'semester': [2, 1, 1], 'registered_credits': [20, 15, 0], 'semester_average': [0.5, 2.5, 3.1],
+        'accumulated_credits': [35, 15, 0], 'cumulative_average': [1.9, 2.5, 3.1], 'final_score': ['2.0'] * 3,
+    }
+    columns.update(overrides)
+    return pa.table(columns)
+
+
+def post(body, params=None, accept="application/json"):
+    return TestClient(app).post(
+        URL, content=body, params=params, headers={"content-type": ARROW_MEDIA_TYPE, "accept": accept}
+    )
+
+
+@pytest.mark.parametrize("engine", ["python", "vectorized", "parallel"])
+def test_arrow_round_trip(engine):
+    response = post(LearningResultsService.write_arrow(typed_table()), {"engine": engine}, accept=ARROW_MEDIA_TYPE)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == ARROW_MEDIA_TYPE
+    table = LearningResultsService.read_arrow(response.content)
+    assert table.column('id').to_pylist() == ['SV1', 'SV1', 'SV2']
+    assert table.column('academic_processing_rule').to_pylist() == ['', 'c', '']
+
+
+def test_arrow_body_answered_as_json_has_the_json_types():
+    response = post(LearningResultsService.write_arrow(typed_table()), {"engine": "python"})
+
+    assert response.status_code == 200
+    first = response.json()[0]
+    assert (first['semester'], first['registered_credits'], first['semester_average']) == ('1', '15', '2.5')
+
+
+def test_arrow_rows_are_validated_like_json():
+    body = LearningResultsService.write_arrow(typed_table(id=['SV1', None, 'SV2']))
+    assert post(body, {"engine": "python"}).status_code == 422
+
+
+@pytest.mark.parametrize("body", [b"not an arrow stream", LearningResultsService.write_arrow(typed_table())[:-40]])
+def test_malformed_stream_is_a_bad_request(body):
+    response = post(body)
+    assert response.status_code == 400
+    assert "Arrow" in response.json()["detail"]
@@ -0,0 +1,70 @@
+import uuid
+
+import pytest
+
+from app.models import models
+from app.services.service_learning_result import LearningResultsService
+
+
+def record(student_id, semester, semester_average, cumulative_average='3.0'):
+    return {
+        'id': student_id, 'major': 'Kế toán', 'gender': 'Nam', 'target': '0', 'region': '1',
+        'admission_block': 'A00', 'admission_score': '20', 'semester': str(semester),
+        'registered_credits': '15', 'semester_average': semester_average,
+        'accumulated_credits': str(15 * semester), 'cumulative_average': cumulative_average, 'final_score': '',
+    }
+
+
+@pytest.fixture
+def student():
+    return f"SV-{uuid.uuid4().hex[:8]}"
+
+
+def process(db, students):
+    return LearningResultsService.process_academic_performance_incremental(db, students)
+
+
+def state_of(db, student):
+    db.expire_all()
+    return db.get(models.TrangThaiXuLyHocTap, student)
+
+
+def test_first_run_processes_every_semester_and_stores_the_state(db, student):
+    batch = [record(student, 2, '0.5'), record(student, 1, '3.0')]
+
+    processed = process(db, batch)
+
+    assert [(row['semester'], row['academic_processing_rule']) for row in processed] == [('1', ''), ('2', 'c')]
+    state = state_of(db, student)
+    assert (state.hoc_ky_cuoi, state.so_lan_canh_bao, state.xu_ly_hoc_tap) == (2, 1, 'Cảnh báo')
+    assert state.ban_ghi_cuoi['semester_average'] == '0.5'
+
+
+def test_rerun_of_the_same_batch_processes_nothing(db, student):
+    batch = [record(student, 1, '0.5'), record(student, 2, '0.5')]
+    assert len(process(db, batch)) == 2
+
+    assert process(db, batch) == []
+    assert state_of(db, student).so_lan_canh_bao == 2
+
+
+def test_only_the_new_semester_is_processed(db, student):
+    process(db, [record(student, 1, '0.5')])
+
+    processed = process(db, [record(student, 1, '0.5'), record(student, 2, '0.9')])
+
+    assert [row['semester'] for row in processed] == ['2']
+    state = state_of(db, student)
+    assert (state.hoc_ky_cuoi, state.so_lan_canh_bao) == (2, 2)
+
+
+def test_corrected_last_semester_replaces_the_stored_result(db, student):
+    process(db, [record(student, 1, '3.0'), record(student, 2, '0.5')])
+
+    processed = process(db, [record(student, 1, '0.1'), record(student, 2, '3.0')])
+
+    # Semester 1 is history; the corrected semester 2 no longer carries a warning.
+    assert [(row['semester'], row['academic_processing']) for row in processed] == [('2', '')]
+    state = state_of(db, student)
+    assert (state.hoc_ky_cuoi, state.so_lan_canh_bao, state.xu_ly_hoc_tap) == (2, 0, '')
+    assert state.ban_ghi_cuoi['semester_average'] == '3.0'
@@ -0,0 +1,49 @@
+import random
+
+import pytest
+
+from app.config import settings
+from app.services import service_learning_result
+from app.services.service_learning_result import LearningResultsService
+
+FIELDS = ['registered_credits', 'semester_average', 'cumulative_average', 'accumulated_credits']
+
+
+@pytest.fixture
+def two_workers(monkeypatch):
+    monkeypatch.setattr(settings, "LEARNING_RESULTS_WORKERS", 2)
+    monkeypatch.setattr(settings, "LEARNING_RESULTS_PARALLEL_MIN_ROWS", 10)
+    service_learning_result.shutdown_process_pool()
+    yield
+    service_learning_result.shutdown_process_pool()
+
+
+def batch(size, seed=20240502):
+    rng = random.Random(seed)
+    values = ['0', '0.5', '0.9', '1.5', '2.5', '3.2', '15', '30', 'abc', '']
+    students = []
+    for _ in range(size):
+        student_id = f'SV{rng.randrange(size // 3)}'
+        students.append({
+            'id': student_id, 'major': rng.choice(['Kế toán', 'Ngân hàng']), 'semester': str(rng.randint(1, 8)),
+            **{field: rng.choice(values) for field in FIELDS},
+        })
+    return students
+
+
+def test_parallel_matches_vectorized_in_order(two_workers):
+    students = batch(600)
+    assert len(LearningResultsService.shard_by_student(students, 2 * service_learning_result.SHARDS_PER_WORKER)) > 1
+
+    expected = LearningResultsService.process_academic_performance_vectorized(students)
+    actual = LearningResultsService.process_academic_performance_parallel(students)
+
+    assert service_learning_result._process_pool is not None, "the batch was processed inline"
+    assert actual == expected
+
+
+def test_small_batches_stay_inline(two_workers):
+    students = batch(9)
+    assert LearningResultsService.process_academic_performance_parallel(students) == \
+        LearningResultsService.process_academic_performance_vectorized(students)
+    assert service_learning_result._process_pool is None
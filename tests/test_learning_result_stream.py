@@ -0,0 +1,52 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.service_learning_result import LearningResultsService
+
+
+def record(student_id, semester, average):
+    return {
+        'id': student_id, 'major': 'Kế toán', 'gender': 'Nữ', 'target': '0', 'region': '1',
+        'admission_block': 'A00', 'admission_score': '20', 'semester': str(semester),
+        'registered_credits': '15', 'semester_average': str(average), 'accumulated_credits': '15.0',
+        'cumulative_average': str(average), 'final_score': '2.0',
+    }
+
+
+RECORDS = [record('SV1', 1, 0.6), record('SV1', 2, 2.5), [record('SV2', 1, 3.1), record('SV2', 2, 0.9)]]
+BODY = b'\n'.join(json.dumps(line).encode() for line in RECORDS) + b'\n\n'
+
+
+def parse(chunks):
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        return [item async for item in LearningResultsService.iter_ndjson_records(source())]
+
+    return asyncio.run(collect())
+
+
+def test_ndjson_parser_ignores_chunk_boundaries():
+    expected = parse([BODY])
+    assert [line for line, _ in expected] == [1, 2, 3, 3]
+    for size in (1, 2, 7, 64):
+        assert parse([BODY[i:i + size] for i in range(0, len(BODY), size)]) == expected
+    # The last line may come without a trailing newline.
+    assert parse([BODY.rstrip(b'\n')]) == expected
+
+
+def test_stream_matches_batch_engine():
+    client = TestClient(app)
+    response = client.post('/api/plr/process-learning-results/stream', content=BODY)
+    assert response.status_code == 200
+    streamed = [json.loads(line) for line in response.text.splitlines()]
+
+    batch = client.post('/api/plr/process-learning-results', json=RECORDS[:2] + RECORDS[2])
+    assert [(r['id'], r['semester'], r['academic_processing']) for r in streamed] == [
+        (r['id'], r['semester'], r['academic_processing']) for r in batch.json()
+    ]
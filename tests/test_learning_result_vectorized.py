@@ -0,0 +1,65 @@
+import math
+import random
+
+import pytest
+
+from app.services.service_learning_result import LearningResultsService
+
+# Values float() accepts or rejects; the vectorized engine must agree with it on every one.
+NUMERIC_VALUES = [
+    '0', '1', '2.5', ' 3.25 ', '-1', '1e1', '15.0', '', '   ', 'abc', '1,5', '2.5.1',
+    'nan', 'NaN', '-nan', 'inf', '-inf', 'Infinity', '1_0', '١٢', '٣.٥',
+    float('nan'), float('inf'), 0.5, 12, 3.9,
+]
+FIELDS = ['registered_credits', 'semester_average', 'cumulative_average', 'accumulated_credits']
+
+
+def record(student_id, semester, values, major='Kế toán'):
+    return {'id': student_id, 'major': major, 'semester': str(semester), **dict(zip(FIELDS, values))}
+
+
+def assert_same_results(students):
+    expected = LearningResultsService.process_academic_performance(students)
+    actual = LearningResultsService.process_academic_performance_vectorized(students)
+    assert [(r['id'], r['semester']) for r in actual] == [(r['id'], r['semester']) for r in expected]
+    for got, want in zip(actual, expected):
+        assert got['academic_processing'] == want['academic_processing'], (got, want)
+        assert got['academic_processing_rule'] == want['academic_processing_rule'], (got, want)
+
+
+def test_parse_numeric_follows_float():
+    values, invalid = LearningResultsService._parse_numeric(NUMERIC_VALUES)
+    for value, parsed, rejected in zip(NUMERIC_VALUES, values.tolist(), invalid.tolist()):
+        try:
+            expected = float(value)
+        except ValueError:
+            assert rejected, value
+            continue
+        assert not rejected, value
+        assert parsed == expected or (math.isnan(parsed) and math.isnan(expected)), value
+
+
+@pytest.mark.parametrize('value', NUMERIC_VALUES)
+def test_engines_agree_on_each_value(value):
+    students = []
+    for index, field in enumerate(FIELDS):
+        values = ['1.0', '0.5', '10', '0.8']
+        values[index] = value
+        students.append(record(f'SV{index}', 1, values))
+        students.append(record(f'SV{index}', 4, values))
+    assert_same_results(students)
+
+
+def test_engines_agree_on_random_batches():
+    rng = random.Random(20240501)
+    pool = NUMERIC_VALUES + ['0.9', '1.5', '2.0', '3.5', '12', '30', '45', '60']
+    majors = ['Kế toán', 'Ngân hàng', 'Công nghệ thông tin', None]
+    for _ in range(200):
+        students = [
+            record(
+                f'SV{rng.randrange(20)}', rng.randint(1, 10),
+                [rng.choice(pool) for _ in FIELDS], rng.choice(majors),
+            )
+            for _ in range(rng.randint(1, 60))
+        ]
+        assert_same_results(students)
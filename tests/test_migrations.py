@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app.database import Base
+from app.migrations import m0000_diem_unique_sinhvien_lophoc, m0001_diem_tiendohoctap_indexes
+from app.models import models
+
+
+@pytest.fixture
+def old_database(tmp_path):
+    """A database created before diem had its unique (sinhvien_id, lophoc_id) index."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX uq_diem_sinhvien_lophoc"))
+        connection.execute(text(
+            "INSERT INTO diem (id, sinhvien_id, lophoc_id, diem_tong_ket) VALUES "
+            "(1, 1, 1, 5.0), (2, 1, 1, 7.0), (3, 1, 2, 6.0), (4, 2, 1, 8.0), (5, 1, 2, 9.0)"
+        ))
+    yield engine
+    engine.dispose()
+
+
+def upsert_grade(engine, sinhvien_id, lophoc_id, diem_tong_ket):
+    from sqlalchemy.dialects.sqlite import insert
+
+    stmt = insert(models.Diem).values(sinhvien_id=sinhvien_id, lophoc_id=lophoc_id, diem_tong_ket=diem_tong_ket)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['sinhvien_id', 'lophoc_id'], set_={'diem_tong_ket': stmt.excluded.diem_tong_ket}
+    )
+    with engine.begin() as connection:
+        connection.execute(stmt)
+
+
+@pytest.mark.parametrize('migration', [m0000_diem_unique_sinhvien_lophoc, m0001_diem_tiendohoctap_indexes])
+def test_unique_index_migration_keeps_newest_grade(old_database, migration):
+    migration.upgrade(old_database)
+    migration.upgrade(old_database)  # idempotent
+
+    with old_database.connect() as connection:
+        rows = connection.execute(text("SELECT id, sinhvien_id, lophoc_id, diem_tong_ket FROM diem ORDER BY id")).all()
+    assert rows == [(2, 1, 1, 7.0), (4, 2, 1, 8.0), (5, 1, 2, 9.0)]
+    indexes = {index['name']: index['unique'] for index in inspect(old_database).get_indexes('diem')}
+    assert indexes['uq_diem_sinhvien_lophoc']
+
+    upsert_grade(old_database, 1, 1, 9.5)
+    with old_database.connect() as connection:
+        assert connection.execute(text("SELECT diem_tong_ket FROM diem WHERE sinhvien_id = 1 AND lophoc_id = 1")).all() == [(9.5,)]
+
+
+def test_bulk_upsert_fails_without_migration(old_database):
+    with pytest.raises(Exception, match='ON CONFLICT'):
+        upsert_grade(old_database, 1, 1, 9.5)
@@ -0,0 +1,35 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.models import models
+from app.services.pagination import NEXT_CURSOR_HEADER
+
+
+@pytest.fixture
+def four_viens(db):
+    db.query(models.Vien).delete()
+    db.add_all(models.Vien(ma_vien=f'V{index}', ten_vien=f'Viện {index}') for index in range(4))
+    db.commit()
+
+
+def walk(client, limit):
+    pages, cursor = [], None
+    while True:
+        params = {'limit': limit, **({'cursor': cursor} if cursor else {})}
+        response = client.get('/api/vien/', params=params)
+        assert response.status_code == 200
+        pages.append([row['ma_vien'] for row in response.json()])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize('fast', [False, True])
+def test_full_last_page_has_no_cursor(four_viens, monkeypatch, fast):
+    monkeypatch.setattr(settings, 'FAST_LIST_RESPONSES', fast)
+    client = TestClient(app)
+    assert walk(client, 2) == [['V0', 'V1'], ['V2', 'V3']]
+    assert walk(client, 4) == [['V0', 'V1', 'V2', 'V3']]
+    assert walk(client, 3) == [['V0', 'V1', 'V2'], ['V3']]
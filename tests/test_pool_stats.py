@@ -0,0 +1,49 @@
+import sqlite3
+import threading
+
+from sqlalchemy import exc
+
+from app.database import InstrumentedQueuePool
+
+
+def test_concurrent_timeouts_are_all_counted(tmp_path):
+    path = str(tmp_path / "pool.db")
+    pool = InstrumentedQueuePool(
+        lambda: sqlite3.connect(path, check_same_thread=False),
+        pool_size=1,
+        max_overflow=0,
+        timeout=0.05,
+    )
+    held = pool.connect()
+    errors = []
+
+    def checkout():
+        try:
+            pool.connect()
+        except exc.TimeoutError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=checkout) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    held.close()
+
+    stats = pool.stats()
+    assert len(errors) == 16
+    assert stats["so_lan_cho"] == 16
+    assert stats["so_lan_het_thoi_gian"] == 16
+    assert stats["max_overflow"] == 0
+    assert stats["tong_thoi_gian_cho_giay"] > 0
+
+
+def test_free_checkout_does_not_count_as_wait(tmp_path):
+    path = str(tmp_path / "pool.db")
+    pool = InstrumentedQueuePool(lambda: sqlite3.connect(path), pool_size=1, max_overflow=1)
+    first = pool.connect()
+    second = pool.connect()
+    second.close()
+    first.close()
+    assert pool.stats()["so_lan_cho"] == 0
+    assert pool.recreate().stats()["max_overflow"] == 1
@@ -0,0 +1,70 @@
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import engine
+from app.main import app
+from app.models import models
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def school(db):
+    """One institute with several courses, lecturers, classes and grades, so N+1 loading would show."""
+    tag = uuid.uuid4().hex[:8]
+    vien = models.Vien(ma_vien=f"V-{tag}", ten_vien="Viện")
+    db.add(vien)
+    db.flush()
+    hoc_phans = [
+        models.HocPhan(ma_hp=f"HP{i}-{tag}", ten_hp="Học phần", so_tin_chi=3, vien_id=vien.id,
+                       loai_hoc_phan=models.LoaiHocPhan.DAICUONG)
+        for i in range(3)
+    ]
+    giang_viens = [
+        models.GiangVien(ma_gv=f"GV{i}-{tag}", hoc_vi="ThS", chuyen_mon="Toán", vien_id=vien.id)
+        for i in range(3)
+    ]
+    sinh_viens = [models.SinhVien(ma_sv=f"SV{i}-{tag}", nam_nhap_truong=2021) for i in range(3)]
+    db.add_all(hoc_phans + giang_viens + sinh_viens)
+    db.flush()
+    lop_hocs = [
+        models.LopHoc(ma_lop=f"L{i}-{tag}", ten_lop="Lớp", hocphan_id=hoc_phans[i].id,
+                      giangvien_id=giang_viens[i].id, hoc_ky="1", nam_hoc="2021-2022")
+        for i in range(3)
+    ]
+    db.add_all(lop_hocs)
+    db.flush()
+    diems = [models.Diem(sinhvien_id=sinh_vien.id, lophoc_id=lop_hocs[0].id, diem_tong_ket=7.0) for sinh_vien in sinh_viens]
+    db.add_all(diems)
+    db.commit()
+    return {"vien": vien.id, "lop_hoc": lop_hocs[0].id, "diem": diems[0].id}
+
+
+@pytest.mark.parametrize("path, key, expected", [
+    ("/api/diem/detail/{}", "diem", 1),
+    ("/api/lop-hoc/detail/{}", "lop_hoc", 1),
+    # The institute, then one SELECT ... IN for each of its two collections.
+    ("/api/vien/{}", "vien", 3),
+])
+def test_detail_endpoints_query_count(school, path, key, expected):
+    client = TestClient(app)
+    with count_statements() as statements:
+        response = client.get(path.format(school[key]))
+    assert response.status_code == 200
+    assert len(statements) == expected, "\n\n".join(statements)
@@ -0,0 +1,95 @@
+import time
+
+import fakeredis
+import pytest
+
+from app.services import cache
+from app.services.cache import MISSING, InvalidationBus, RedisCache
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def registered():
+    added = []
+
+    def register(backend):
+        with cache._caches_lock:
+            cache._caches[backend.name] = backend
+        added.append(backend.name)
+        return backend
+
+    yield register
+    with cache._caches_lock:
+        for name in added:
+            cache._caches.pop(name, None)
+
+
+def test_round_trip_delete_and_clear(server):
+    backend = RedisCache("sinhvien", fakeredis.FakeRedis(server=server), ttl_seconds=60)
+    other = RedisCache("lophoc", fakeredis.FakeRedis(server=server), ttl_seconds=60)
+    backend.set(("id", 1), {"ho_ten": "A"})
+    backend.set(("id", 2), {"ho_ten": "B"})
+    other.set(("id", 1), {"ten": "L"})
+
+    assert backend.get(("id", 1)) == {"ho_ten": "A"}
+    backend.delete(("id", 1))
+    assert backend.get(("id", 1)) is MISSING
+    backend.clear()
+    assert backend.get(("id", 2)) is MISSING
+    assert other.get(("id", 1)) == {"ten": "L"}
+    assert backend.stats()["hit"] == 1 and backend.stats()["miss"] == 2
+
+
+def test_entries_expire(server):
+    backend = RedisCache("sinhvien", fakeredis.FakeRedis(server=server), ttl_seconds=0.05)
+    backend.set(("id", 1), "x")
+    time.sleep(0.1)
+    assert backend.get(("id", 1)) is MISSING
+
+
+def test_outage_degrades_without_raising(server, caplog):
+    backend = RedisCache("sinhvien", fakeredis.FakeRedis(server=server), ttl_seconds=60)
+    server.connected = False
+
+    backend.set(("id", 1), "x")
+    assert backend.get(("id", 1)) is MISSING
+    backend.delete(("id", 1))
+    backend.clear()
+    assert len([record for record in caplog.records if record.levelname == "WARNING"]) == 4
+
+
+def test_bus_drops_entries_in_other_workers(server, registered):
+    local = registered(cache.TTLCache("bus_test", max_entries=10, ttl_seconds=60))
+    local.set(("id", 7), "stale")
+    local.set(("id", 8), "fresh")
+    listener = InvalidationBus(fakeredis.FakeRedis(server=server))
+    sender = InvalidationBus(fakeredis.FakeRedis(server=server))
+    listener.start()
+    try:
+        sender.publish("bus_test", [("id", 7)])
+        deadline = time.monotonic() + 5
+        while local.get(("id", 7)) is not MISSING and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        listener.stop()
+    assert local.get(("id", 7)) is MISSING
+    assert local.get(("id", 8)) == "fresh"
+
+
+def test_bus_ignores_its_own_messages(server, registered):
+    local = registered(cache.TTLCache("bus_test", max_entries=10, ttl_seconds=60))
+    local.set(("id", 7), "kept")
+    bus = InvalidationBus(fakeredis.FakeRedis(server=server))
+    bus._handle({"data": '{"origin": "%s", "cache": "bus_test", "keys": [["id", 7]]}' % bus.origin})
+    assert local.get(("id", 7)) == "kept"
+
+
+def test_publish_during_outage_is_logged(server, caplog):
+    bus = InvalidationBus(fakeredis.FakeRedis(server=server))
+    server.connected = False
+    bus.publish("sinhvien", [("id", 1)])
+    assert "sinhvien" in caplog.text
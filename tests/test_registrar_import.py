@@ -0,0 +1,89 @@
+import csv
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import models
+from app.routers import nhap_du_lieu
+from app.services.auth_service import get_current_user
+from app.services.service_excel_ingest import DEFAULT_COLUMNS
+from app.services.service_registrar_import import RegistrarImportService
+
+
+def _row(ma_sv, hoc_ky, tbhk):
+    values = dict.fromkeys(DEFAULT_COLUMNS, "")
+    values.update({"ID": ma_sv, "Nganh": "CNTT", "Hoc Ky": hoc_ky, "DKHK": "15", "TBHK": tbhk, "TCTL": "15", "TBTL": tbhk})
+    return [values[column] for column in DEFAULT_COLUMNS]
+
+
+def test_duplicates_differing_only_in_whitespace_collapse(db, tmp_path):
+    ma_sv = f"SV-{uuid.uuid4().hex[:8]}"
+    path = tmp_path / "raw_data.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(DEFAULT_COLUMNS)
+        writer.writerow(_row(ma_sv, "1", "5.0"))
+        writer.writerow(_row(f" {ma_sv} ", "1.0", "6.5"))
+        writer.writerow(_row(ma_sv, "2", "7.0"))
+
+    result = RegistrarImportService.import_csv(db, str(path), nam_nhap_truong=2021)
+
+    assert result["trung_lap"] == 1
+    sinhvien = db.query(models.SinhVien).filter_by(ma_sv=ma_sv).one()
+    rows = db.query(models.TienDoHocTap).filter_by(sinhvien_id=sinhvien.id).order_by(models.TienDoHocTap.hoc_ky).all()
+    assert [(row.hoc_ky, row.nam_hoc, row.diem_trung_binh_hk) for row in rows] == [
+        ("1", "2021-2022", 6.5), ("2", "2021-2022", 7.0)
+    ]
+
+
+@pytest.fixture
+def admin_client(db):
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(vai_tro="admin")
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+def _upload(client, name, content):
+    return client.post("/api/nhap-du-lieu/phong-dao-tao", files={"file": (name, content)})
+
+
+def test_unsupported_upload_is_rejected(admin_client):
+    assert _upload(admin_client, "data.txt", b"ID").status_code == 415
+
+
+def test_xls_without_a_reader_is_rejected(admin_client, monkeypatch):
+    monkeypatch.setattr(nhap_du_lieu, "reader_engine", lambda: None)
+    assert _upload(admin_client, "Data.xls", b"\xd0\xcf\x11\xe0").status_code == 415
+
+
+@pytest.mark.parametrize("name", ["Data.xlsx", "Data.xls"])
+def test_corrupt_excel_is_a_bad_request(admin_client, name):
+    response = _upload(admin_client, name, b"not a workbook")
+    assert response.status_code == 400
+    assert "Excel" in response.json()["detail"]
+
+
+def test_imported_students_are_served_without_loosening_the_profile_schema(db, tmp_path):
+    ma_sv = f"SV-{uuid.uuid4().hex[:8]}"
+    path = tmp_path / "raw_data.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(DEFAULT_COLUMNS)
+        writer.writerow(_row(ma_sv, "1", "3.0"))
+    RegistrarImportService.import_csv(db, str(path), nam_nhap_truong=2021)
+    client = TestClient(app)
+
+    student = client.get(f"/api/sinh-vien/ma-sv/{ma_sv}")
+    assert student.status_code == 200
+    assert (student.json()["nganh"], student.json()["ho_ten"]) == ("CNTT", None)
+    assert client.get(f"/api/sinh-vien/{student.json()['id']}").status_code == 200
+
+    schemas = client.get("/openapi.json").json()["components"]["schemas"]
+    assert {"ho_ten", "ngay_sinh", "gioi_tinh", "email", "nam_nhap_truong"} <= set(schemas["SinhVienInDB"]["required"])
+    nested = schemas["DiemDetail"]["properties"]["sinhvien"]["anyOf"]
+    assert [ref["$ref"].rsplit("/", 1)[1] for ref in nested] == ["SinhVienInDB", "SinhVienNhapInDB"]
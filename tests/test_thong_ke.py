@@ -0,0 +1,33 @@
+from app.models import models
+from app.services.service_thong_ke import ThongKeService
+
+NGANH = "Thống kê cảnh báo"
+
+
+def _student(db, ma_sv, nam_nhap_truong, *semesters):
+    sinhvien = models.SinhVien(ma_sv=ma_sv, nganh=NGANH, nam_nhap_truong=nam_nhap_truong)
+    db.add(sinhvien)
+    db.flush()
+    db.add_all(
+        models.TienDoHocTap(sinhvien_id=sinhvien.id, nam_hoc=nam_hoc, hoc_ky=hoc_ky, xu_ly_hoc_tap=xu_ly)
+        for nam_hoc, hoc_ky, xu_ly in semesters
+    )
+
+
+def test_canh_bao_uses_latest_semester_of_the_cohort(db):
+    _student(db, "TK001", 2022, ("2022-2023", "1", None), ("2023-2024", "2", "Cảnh báo mức 1"))
+    _student(db, "TK002", 2022, ("2022-2023", "1", "Cảnh báo mức 1"), ("2023-2024", "1", ""))
+    _student(db, "TK003", 2023, ("2023-2024", "1", "Cảnh báo mức 2"))
+    db.commit()
+
+    cohort = ThongKeService.get_canh_bao_hien_tai(db, nganh=NGANH, nam_nhap_truong=2022)
+    assert [row["ma_sv"] for row in cohort["sinh_vien"]] == ["TK001"]
+    assert cohort["sinh_vien"][0]["hoc_ky"] == "2"
+    assert cohort["sinh_vien"][0]["nam_nhap_truong"] == 2022
+
+    nganh = ThongKeService.get_canh_bao_hien_tai(db, nganh=NGANH)
+    assert [row["ma_sv"] for row in nganh["sinh_vien"]] == ["TK001", "TK003"]
+    assert set(nganh["sinh_vien"][0]) == {
+        "id", "ma_sv", "ho_ten", "nganh", "nam_nhap_truong", "hoc_ky", "nam_hoc",
+        "tong_tin_chi_tich_luy", "diem_trung_binh_tich_luy", "xu_ly_hoc_tap"
+    }
@@ -0,0 +1,128 @@
+import csv
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import models
+from app.schemas import schemas
+from app.services.service import DiemService, TiendohoctapService, TongHopHocTapService
+from app.services.service_excel_ingest import DEFAULT_COLUMNS
+from app.services.service_registrar_import import RegistrarImportService
+
+
+@pytest.fixture
+def student(db):
+    tag = uuid.uuid4().hex[:8]
+    sinhvien = models.SinhVien(ma_sv=f"TH-{tag}", nam_nhap_truong=2021)
+    lop_hocs = [models.LopHoc(ma_lop=f"TH{i}-{tag}") for i in range(3)]
+    db.add_all([sinhvien, *lop_hocs])
+    db.commit()
+    return sinhvien.id, [lop_hoc.id for lop_hoc in lop_hocs]
+
+
+def fresh_aggregate(db, sinhvien_id):
+    """The summary computed straight from diem and tiendohoctap, for comparison."""
+    grades = [row.diem_tong_ket for row in db.query(models.Diem).filter_by(sinhvien_id=sinhvien_id)
+              if row.diem_tong_ket is not None]
+    semesters = sorted(
+        db.query(models.TienDoHocTap).filter_by(sinhvien_id=sinhvien_id),
+        key=lambda row: (row.nam_hoc, row.hoc_ky)
+    )
+    latest = semesters[-1] if semesters else None
+    return {
+        "so_lop_co_diem": len(grades),
+        "diem_tong_ket_trung_binh": pytest.approx(sum(grades) / len(grades)) if grades else None,
+        "so_hoc_ky": len(semesters),
+        "hoc_ky_gan_nhat": latest and latest.hoc_ky,
+        "nam_hoc_gan_nhat": latest and latest.nam_hoc,
+        "tong_tin_chi_tich_luy": latest and latest.tong_tin_chi_tich_luy,
+        "xu_ly_hoc_tap": latest and latest.xu_ly_hoc_tap,
+    }
+
+
+def assert_in_sync(db, sinhvien_id):
+    db.expire_all()
+    summary = db.get(models.TongHopHocTap, sinhvien_id)
+    assert summary is not None
+    assert {field: getattr(summary, field) for field in fresh_aggregate(db, sinhvien_id)} == fresh_aggregate(db, sinhvien_id)
+    return summary
+
+
+def test_diem_writes_keep_the_summary_in_sync(db, student):
+    sinhvien_id, lop_hocs = student
+    first = DiemService.create(db, schemas.DiemCreate(sinhvien_id=sinhvien_id, lophoc_id=lop_hocs[0], diem_tong_ket=6.0))
+    DiemService.create(db, schemas.DiemCreate(sinhvien_id=sinhvien_id, lophoc_id=lop_hocs[1], diem_tong_ket=8.0))
+    assert assert_in_sync(db, sinhvien_id).so_lop_co_diem == 2
+
+    DiemService.update(db, first.id, schemas.DiemUpdate(diem_tong_ket=9.0))
+    assert assert_in_sync(db, sinhvien_id).diem_tong_ket_trung_binh == pytest.approx(8.5)
+
+    DiemService.update_by_sinhvien_lophoc(db, sinhvien_id, lop_hocs[1], schemas.DiemUpdate(diem_tong_ket=7.0))
+    assert_in_sync(db, sinhvien_id)
+
+    DiemService.delete(db, first.id)
+    assert assert_in_sync(db, sinhvien_id).so_lop_co_diem == 1
+
+    DiemService.delete_by_sinhvien_lophoc(db, sinhvien_id, lop_hocs[1])
+    assert assert_in_sync(db, sinhvien_id).diem_tong_ket_trung_binh is None
+
+
+def test_bulk_upsert_keeps_the_summary_in_sync(db, student):
+    sinhvien_id, lop_hocs = student
+    DiemService.create(db, schemas.DiemCreate(sinhvien_id=sinhvien_id, lophoc_id=lop_hocs[0], diem_tong_ket=4.0))
+
+    DiemService.bulk_upsert(db, [
+        schemas.DiemCreate(sinhvien_id=sinhvien_id, lophoc_id=lop_hoc, diem_tong_ket=score)
+        for lop_hoc, score in zip(lop_hocs, (5.0, 6.0, 7.0))
+    ])
+
+    summary = assert_in_sync(db, sinhvien_id)
+    assert (summary.so_lop_co_diem, summary.diem_tong_ket_trung_binh) == (3, pytest.approx(6.0))
+
+
+def test_tiendohoctap_writes_keep_the_summary_in_sync(db, student):
+    sinhvien_id, _ = student
+    progress = dict(sinhvien_id=sinhvien_id, tin_chi_dang_ky=15, tong_tin_chi_tich_luy=15, diem_trung_binh_tich_luy=2.5)
+    TiendohoctapService.create_tiendohoctap(db, schemas.TienDoHocTapCreate(hoc_ky="1", nam_hoc="2021-2022", **progress))
+    second = TiendohoctapService.create_tiendohoctap(
+        db, schemas.TienDoHocTapCreate(hoc_ky="2", nam_hoc="2021-2022", **{**progress, "tong_tin_chi_tich_luy": 30})
+    )
+    assert assert_in_sync(db, sinhvien_id).tong_tin_chi_tich_luy == 30
+
+    TiendohoctapService.update_tiendohoctap(db, second.id, schemas.TienDoHocTapUpdate(xu_ly_hoc_tap="Cảnh báo mức 1"))
+    summary = assert_in_sync(db, sinhvien_id)
+    assert [semester["hoc_ky"] for semester in summary.lich_su] == ["1", "2"]
+
+    TiendohoctapService.delete_tiendohoctap(db, second.id)
+    assert assert_in_sync(db, sinhvien_id).hoc_ky_gan_nhat == "1"
+
+
+def test_registrar_import_keeps_the_summary_in_sync(db, student, tmp_path):
+    sinhvien_id, _ = student
+    ma_sv = db.get(models.SinhVien, sinhvien_id).ma_sv
+    path = tmp_path / "raw_data.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(DEFAULT_COLUMNS)
+        for hoc_ky, tctl in (("1", "15"), ("2", "32"), ("3", "47")):
+            values = dict.fromkeys(DEFAULT_COLUMNS, "")
+            values.update({"ID": ma_sv, "Hoc Ky": hoc_ky, "DKHK": "16", "TBHK": "2.8", "TCTL": tctl, "TBTL": "2.8"})
+            writer.writerow([values[column] for column in DEFAULT_COLUMNS])
+
+    RegistrarImportService.import_csv(db, str(path))
+
+    summary = assert_in_sync(db, sinhvien_id)
+    assert (summary.so_hoc_ky, summary.nam_hoc_gan_nhat, summary.tong_tin_chi_tich_luy) == (3, "2022-2023", 47)
+
+
+def test_summary_is_created_on_first_read(db, student):
+    sinhvien_id, _ = student
+    assert db.get(models.TongHopHocTap, sinhvien_id) is None
+
+    response = TestClient(app).get(f"/api/sinh-vien/{sinhvien_id}/tong-hop")
+
+    assert response.status_code == 200
+    assert response.json()["so_hoc_ky"] == 0
+    assert_in_sync(db, sinhvien_id)
@@ -0,0 +1,93 @@
+import json
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services import warning_rules
+from app.services.warning_rules import CompiledRuleSet, WarningRuleEngine
+
+OVERLAPPING = {
+    "nhan": "Cảnh báo",
+    "quy_tac": [
+        {"ma": "a", "dieu_kien": []},
+        {"ma": "thap", "dieu_kien": [[["semester_average", "<", 1.0]]]},
+        {"ma": "rat_thap", "dieu_kien": [[["semester_average", "<", 0.5]]]},
+        {"ma": "nam", "dieu_kien": [[["cumulative_average", "<", {"theo_nam": {"1": 1.2}, "mac_dinh": 2.0}]]]},
+    ],
+}
+CONFIG = {
+    "mac_dinh": OVERLAPPING,
+    "theo_nganh": {"Y khoa": {"nhan": "Cảnh báo ngành", "quy_tac": [
+        {"ma": "y", "dieu_kien": [[["semester_average", "<", 2.0]]]},
+    ]}},
+}
+
+
+def evaluate(rule_set, semester=1, registered=15.0, semester_average=3.0, accumulated=15.0, cumulative=3.0):
+    return rule_set.evaluate(semester, registered, semester_average, accumulated, cumulative)
+
+
+def columns(*rows, majors=None):
+    fields = ['semester', 'registered_credits', 'semester_average', 'accumulated_credits', 'cumulative_average']
+    result = {field: np.array([row[index] for row in rows]) for index, field in enumerate(fields)}
+    if majors is not None:
+        result['major'] = np.array(majors, dtype=object)
+    return result
+
+
+def test_first_matching_rule_wins():
+    rule_set = CompiledRuleSet(OVERLAPPING)
+    # Both 'thap' and 'rat_thap' fire; the earlier rule is reported.
+    assert evaluate(rule_set, semester_average=0.2) == "thap"
+    # Year 1 has its own threshold (1.2), later years use the default (2.0).
+    assert evaluate(rule_set, semester=1, cumulative=1.5) is None
+    assert evaluate(rule_set, semester=3, cumulative=1.5) == "nam"
+    codes = rule_set.evaluate_columns(dict(columns((1, 15, 0.2, 15, 3.0), (1, 15, 3.0, 15, 1.0)), year=np.array([1, 1])))
+    assert codes.tolist() == ["thap", "nam"]
+
+
+def test_rule_without_conditions_never_fires():
+    rule_set = CompiledRuleSet({"quy_tac": [{"ma": "a", "dieu_kien": []}]})
+    assert evaluate(rule_set, semester_average=0.0, cumulative=0.0) is None
+    codes = rule_set.evaluate_columns(dict(columns((1, 0, 0.0, 0, 0.0)), year=np.array([1])))
+    assert codes.tolist() == [""]
+
+
+def test_major_rule_set_overrides_the_default():
+    engine = WarningRuleEngine(CONFIG)
+    assert engine.for_major("Y khoa").label == "Cảnh báo ngành"
+    assert engine.for_major("Kế toán") is engine.default
+    assert engine.for_major(None) is engine.default
+
+    labels, codes = engine.evaluate_columns(columns(
+        (1, 15, 1.5, 15, 3.0), (1, 15, 1.5, 15, 3.0), (1, 15, 0.2, 15, 3.0),
+        majors=["Y khoa", "Kế toán", "Y khoa"],
+    ))
+    # The major's rules replace the default ones: 'y' fires for Y khoa, nothing does for 1.5 elsewhere.
+    assert codes == ["y", "", "y"]
+    assert labels == ["Cảnh báo ngành", "", "Cảnh báo ngành"]
+
+
+@pytest.mark.parametrize("clause, message", [
+    (["diem_thi", "<", 1.0], "Trường không hợp lệ"),
+    (["semester_average", "=<", 1.0], "Toán tử không hợp lệ"),
+])
+def test_invalid_rule_is_rejected(clause, message):
+    with pytest.raises(ValueError, match=message):
+        CompiledRuleSet({"quy_tac": [{"ma": "x", "dieu_kien": [[clause]]}]})
+
+
+def test_invalid_rules_file_is_rejected(tmp_path, monkeypatch):
+    path = tmp_path / "warning_rules.json"
+    bad = {"mac_dinh": OVERLAPPING, "theo_nganh": {"Y khoa": {"quy_tac": [
+        {"ma": "y", "dieu_kien": [[["semester_average", "~", 1.0]]]},
+    ]}}}
+    path.write_text(json.dumps(bad), encoding="utf-8")
+    monkeypatch.setattr(settings, "WARNING_RULES_PATH", str(path))
+    warning_rules.get_rule_engine.cache_clear()
+    try:
+        with pytest.raises(ValueError, match="Toán tử không hợp lệ"):
+            warning_rules.get_rule_engine()
+    finally:
+        warning_rules.get_rule_engine.cache_clear()